@@ -53,10 +53,12 @@ class AgenticMemory:
         query: str, 
         agent_id: str, 
         limit: int = 10,
-        entities: Optional[List[str]] = None
+        entities: Optional[List[str]] = None,
+        diversify: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Retrieves relevant memories based on a query.
+        Set `diversify` to drop near-duplicate memories from the results.
         """
         async with httpx.AsyncClient() as client:
             payload = {
@@ -66,6 +68,8 @@ class AgenticMemory:
             }
             if entities:
                 payload["entities"] = entities
+            if diversify:
+                payload["diversify"] = True
                 
             response = await client.post(
                 f"{self.base_url}/api/query",
@@ -12,9 +12,14 @@ class MemoryRouter:
     memory ingestion after the LLM call.
     """
     
-    def __init__(self, internal_llm: bool = False):
-        self.recall_op = RecallOperation()
-        self.remember_op = RememberOperation()
+    def __init__(
+        self,
+        internal_llm: bool = False,
+        recall_op: Optional[RecallOperation] = None,
+        remember_op: Optional[RememberOperation] = None
+    ):
+        self.recall_op = recall_op or RecallOperation()
+        self.remember_op = remember_op or RememberOperation()
         # External LLM adapter if we want the router to handle the call
         self.llm_adapter = LLMAdapter() if internal_llm else None
 
@@ -24,7 +29,8 @@ class MemoryRouter:
         agent_id: str,
         session_id: str,
         external_llm_callback: Optional[Any] = None,
-        stream: bool = False
+        stream: bool = False,
+        diversify: bool = False
     ) -> str:
         """
         A 'Universal' wrapper for LLM calls with memory.
@@ -35,7 +41,9 @@ class MemoryRouter:
         logger.info(f"Router: Processing query with memory for agent {agent_id}")
 
         # 1. RETRIEVE MEMORIES
-        memories = await self.recall_op.execute(query=query, agent_id=agent_id, limit=5)
+        # Pass diversify to drop near-duplicate memories (e.g. repeated transcripts)
+        recall_response = await self.recall_op.execute(query=query, agent_id=agent_id, limit=5, diversify=diversify)
+        memories = recall_response.results
         context_str = "\n".join([f"- {m.content}" for m in memories])
         
         enriched_prompt = f"""
@@ -22,7 +22,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
 class ApiKeyMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        if request.url.path in ["/health", "/docs", "/openapi.json"]:
+        if request.url.path in ["/health", "/ready", "/docs", "/openapi.json"]:
             return await call_next(request)
             
         api_key = request.headers.get("X-API-Key")
@@ -41,7 +41,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.limit = limit
 
     async def dispatch(self, request: Request, call_next):
-        if request.url.path in ["/health", "/docs", "/openapi.json"]:
+        if request.url.path in ["/health", "/ready", "/docs", "/openapi.json"]:
             return await call_next(request)
 
         # Use client IP or API Key for identification
@@ -1,22 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.middleware import LoggingMiddleware, ApiKeyMiddleware, RateLimitMiddleware, error_handler_middleware
 from src.config.environment import settings
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
-from src.operations.remember_operation import RememberOperation
-from src.operations.recall_operation import RecallOperation
-from src.operations.contradict_operation import ContradictOperation
-from src.conflict_resolution.resolution_engine import ResolutionEngine
+from src.core.service_container import ServiceContainer
 from src.models.edges import RelationshipStatus
 
-app = FastAPI(title="Universal Cognitive Memory Engine")
+# Shared adapters and operations, one instance per worker process
+container = ServiceContainer()
 
-# Initialize operations
-remember_op = RememberOperation()
-recall_op = RecallOperation()
-contradict_op = ContradictOperation()
-resolution_engine = ResolutionEngine(remember_op.db_adapter)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Dependencies are warmed in the background so the worker binds immediately;
+    # /ready reports when they are usable
+    await container.start()
+    yield
+    await container.close()
+
+app = FastAPI(title="Universal Cognitive Memory Engine", lifespan=lifespan)
 
 # CORS Middleware
 app.add_middleware(
@@ -59,6 +63,7 @@ class QueryRequest(BaseModel):
     agent_id: str = Field(..., description="The agent whose memories to search", json_schema_extra={"example": "agent-001"})
     limit: int = Field(10, description="Maximum number of results to return", json_schema_extra={"example": 10})
     entities: Optional[List[str]] = Field(default=None, description="Pre-extracted entity names for graph search (optional)")
+    diversify: bool = Field(False, description="Re-rank for diversity to drop near-duplicate memories", json_schema_extra={"example": False})
 
 class ConflictResolveRequest(BaseModel):
     status: str = Field(..., description="The resolution status (e.g., active, superseded)", json_schema_extra={"example": "superseded"})
@@ -72,12 +77,35 @@ async def health_check():
     """
     return {"status": "ok"}
 
+@app.get("/ready", tags=["Infrastructure"])
+async def readiness_check():
+    """
+    Readiness endpoint. Returns 503 with the state of each dependency
+    until the graph database and provider clients are available.
+    """
+    readiness = container.readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+@app.get("/metrics", tags=["Infrastructure"])
+async def get_metrics():
+    """
+    Runtime metrics of this worker, such as embedding batch sizes and queue wait.
+    """
+    return container.metrics()
+
+def require_service(service):
+    """Fail fast with 503 when a service could not be built at startup."""
+    if service is None:
+        raise HTTPException(status_code=503, detail="Service unavailable: dependencies failed to initialize. See /ready.")
+    return service
+
 @app.post("/api/memories/add", tags=["Memories"], summary="Add a new memory")
 async def add_memory(request: MemoryAddRequest, background_tasks: BackgroundTasks):
     """
     Stores a new memory experience in the engine.
     The engine will process the content, extract features, and store it across relevant strata.
     """
+    remember_op = require_service(container.remember_op)
     try:
         experience = await remember_op.execute(
             content=request.content,
@@ -112,14 +140,20 @@ async def query_memories(request: QueryRequest):
     Performs a cognitive recall operation based on the provided query.
     Uses semantic, temporal, and contextual relevance to find the best matches.
     """
+    recall_op = require_service(container.recall_op)
     try:
-        results = await recall_op.execute(
+        response = await recall_op.execute(
             query=request.query,
             agent_id=request.agent_id,
             limit=request.limit,
-            entities=request.entities
+            entities=request.entities,
+            diversify=request.diversify
         )
-        return {"results": [res.model_dump() for res in results]}
+        return {
+            "results": [res.model_dump() for res in response.results],
+            "degraded": response.degraded,
+            "missing_paths": response.missing_paths
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -129,8 +163,9 @@ async def get_conflicts(agent_id: Optional[str] = None):
     Retrieves all pending memory conflicts that require resolution.
     Optionally filters by agent ID.
     """
+    resolution_engine = require_service(container.resolution_engine)
     try:
-        conflicts = resolution_engine.get_pending_conflicts(agent_id)
+        conflicts = await resolution_engine.get_pending_conflicts(agent_id)
         return {"conflicts": conflicts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -140,13 +175,14 @@ async def resolve_conflict(conflict_id: str, request: ConflictResolveRequest):
     """
     Resolves a specific memory conflict by updating its status.
     """
+    resolution_engine = require_service(container.resolution_engine)
     try:
         try:
             status = RelationshipStatus(request.status.lower())
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {request.status}. Must be one of: {[s.value for s in RelationshipStatus]}")
 
-        success = resolution_engine.resolve_conflict(
+        success = await resolution_engine.resolve_conflict(
             conflict_id=conflict_id,
             status=status,
             resolved_by=request.resolved_by,
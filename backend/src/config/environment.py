@@ -12,19 +12,69 @@ class Settings(BaseSettings):
     MEMGRAPH_PORT: int = 7687
     MEMGRAPH_USERNAME: Optional[str] = None
     MEMGRAPH_PASSWORD: Optional[str] = None
+    MEMGRAPH_MAX_POOL_SIZE: int = 50
+    MEMGRAPH_CONNECTION_ACQUISITION_TIMEOUT: float = 5.0
+    MEMGRAPH_WARM_CONNECTIONS: int = 4
 
     # Cognitive
     DEFAULT_RECALL_DEPTH: int = 3
     DEFAULT_RECALL_BREADTH: int = 50
+    VECTOR_INDEX_SHARDS: int = 1  # Experience vector index partitions (1 = one global index)
+    VECTOR_INDEX_DIMENSION: int = 1536
+    VECTOR_INDEX_MIN_CAPACITY: int = 1000
+    VECTOR_INDEX_HEADROOM: float = 2.0  # Capacity as a multiple of the current vector count
+    VECTOR_INDEX_MAINTENANCE_ENABLED: bool = False  # Grow full vector indexes with an online rebuild
+    VECTOR_INDEX_MAINTENANCE_INTERVAL_SECONDS: float = 300.0
+    VECTOR_INDEX_GROWTH_THRESHOLD: float = 0.8  # Rebuild once size reaches this share of capacity
+    VECTOR_INDEX_REBUILD_BATCH: int = 1000  # Experiences labelled per rebuild transaction
+    VECTOR_INDEX_RETIRE_GRACE_SECONDS: float = 900.0  # Keep a replaced index this long before dropping it
+    GRAPH_NODE_BUDGET: int = 500  # Nodes a graph traversal may reach before it stops
+    GRAPH_ADJACENCY_TOP_N: int = 32  # Strongest neighbors cached per node (caps the usable fan-out)
+    GRAPH_ADJACENCY_CACHE_MAX_ITEMS: int = 50000
+    GRAPH_ADJACENCY_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    GRAPH_ADJACENCY_CACHE_TTL_SECONDS: float = 300.0  # Bounds staleness from other workers' writes
+    PPR_ENABLED: bool = False  # Add a personalized PageRank path to entity-based recall
+    PPR_ALPHA: float = 0.15  # Restart probability of the random walk
+    PPR_MAX_DEPTH: int = 3  # Hops of neighborhood the walk runs over
+    PPR_NODE_BUDGET: int = 2000
+    PPR_MAX_ITERATIONS: int = 50
+    PPR_TOLERANCE: float = 1e-6
+    SEMANTIC_OVERFETCH_FACTOR: int = 4  # Growth of the vector search k while filters leave too few matches
+    SEMANTIC_OVERFETCH_MAX_K: int = 1000  # Upper bound on the vector search k
+    BM25_INDEX_TTL_SECONDS: float = 600.0  # Reload an agent's keyword index from the graph after this long
+    BM25_INDEX_MAX_AGENTS: int = 500  # Agents kept in the in-process keyword index
+    BM25_INDEX_MAX_DOCUMENTS: int = 50000  # Larger agents stay on full-text search
+    BM25_INDEX_PAGE_SIZE: int = 2000  # Rows read per query while building a partition
+    BM25_SCORE_SATURATION: float = 5.0  # BM25 score mapped to 0.5 by score / (score + saturation)
+    MMR_LAMBDA: float = 0.7  # Relevance vs. diversity trade-off for diversified recall
+    MMR_CANDIDATE_MULTIPLIER: int = 3  # Candidates considered per returned result
 
     # Ingestion & Infrastructure
     USE_OPENAI_EMBEDDING: bool = True
     EMBEDDING_MODEL_NAME: str = "text-embedding-3-small"
+    EMBEDDING_BATCH_WINDOW_MS: float = 5.0  # Coalescing window for concurrent embedding requests
+    EMBEDDING_MAX_BATCH: int = 64  # Flush a batch early once this many texts are queued
     OPENAI_API_KEY: Optional[str] = None
     LLM_PROVIDER: str = "openai"
     LLM_MODEL: str = "gpt-5-mini"
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
+    EMBEDDING_CACHE_ENCODING: str = "float32"  # float32, float16 or int8 (quantized)
+    LOCAL_EMBEDDING_CACHE_MAX_ITEMS: int = 10000  # In-process embedding tier in front of Redis
+    LOCAL_EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    QUERY_CACHE_TTL: int = 3600  # Recall results; invalidated early by per-agent generations
+    QUERY_CACHE_STALE_TTL: int = 300  # Serve expired results this long while refreshing (0 disables)
+    SEMANTIC_CACHE_ENABLED: bool = True  # Serve paraphrased queries from recent recalls
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # Minimum cosine similarity for a semantic cache hit
+    SEMANTIC_CACHE_MAX_ENTRIES_PER_AGENT: int = 256
+    SEMANTIC_CACHE_MAX_AGENTS: int = 1000
+    QUERY_EMBEDDING_CACHE_TTL: int = 3600 * 24  # Query text -> embedding, shared across agents
+    QUERY_EMBEDDING_CACHE_MAX_ITEMS: int = 5000
     
+    # Startup
+    STARTUP_TIMEOUT_SECONDS: float = 10.0  # Upper bound for each dependency warm-up attempt
+    STARTUP_RETRY_INTERVAL_SECONDS: float = 5.0  # Delay before re-warming a failed dependency
+
     # Lite Mode
     LITE_MODE: bool = False  # If True, minimizes internal LLM usage
     
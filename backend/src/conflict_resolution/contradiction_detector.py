@@ -1,16 +1,23 @@
 from typing import List, Dict, Any, Optional
 from loguru import logger
 from src.models.nodes import Experience
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 from src.storage.adapters.llm_adapter import LLMAdapter
+from src.performance.vector_partitions import VectorIndexRouter
 
 class ContradictionDetector:
     """
     Detects potential contradictions between a new experience and existing memories.
     """
-    def __init__(self, db_adapter: GraphDBAdapter, llm_adapter: LLMAdapter):
+    def __init__(
+        self,
+        db_adapter: AsyncGraphDBAdapter,
+        llm_adapter: LLMAdapter,
+        vector_router: Optional[VectorIndexRouter] = None
+    ):
         self.db = db_adapter
         self.llm = llm_adapter
+        self.vector_router = vector_router or VectorIndexRouter()
 
     async def find_candidate_conflicts(self, experience: Experience, limit: int = 5, threshold: float = 0.7) -> List[Dict[str, Any]]:
         """
@@ -23,22 +30,25 @@ class ContradictionDetector:
         logger.info(f"Searching for conflict candidates for experience {experience.id}")
         
         # Use Memgraph vector search to find similar experiences
-        # Using the correct Memgraph v3.7 procedure
-        query = """
-        CALL vector_search.search('idx_Experience_embedding', $limit, $embedding) YIELD node, similarity
+        # Using the correct Memgraph v3.7 procedure, against the agent's partition if it has one
+        index_name, partitioned = self.vector_router.index_for(experience.agent_id)
+        agent_filter = "AND node.agent_id = $agent_id " if partitioned else ""
+        query = f"""
+        CALL vector_search.search('{index_name}', $limit, $embedding) YIELD node, similarity
         WITH node, similarity
-        WHERE node.id <> $experience_id AND similarity >= $threshold
+        WHERE node.id <> $experience_id AND similarity >= $threshold {agent_filter}
         RETURN node, similarity
         """
         params = {
             "embedding": experience.embedding,
             "limit": limit,
             "threshold": threshold,
-            "experience_id": experience.id
+            "experience_id": experience.id,
+            "agent_id": experience.agent_id
         }
         
         try:
-            results = self.db.run_query(query, params)
+            results = await self.db.run_query(query, params)
             return results
         except Exception as e:
             logger.error(f"Error searching for conflict candidates: {e}")
@@ -3,16 +3,16 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 from loguru import logger
 from src.models.edges import Edge, RelationshipType, RelationshipStatus
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 
 class ResolutionEngine:
     """
     Manages the lifecycle of CONFLICTS_WITH relationships in the graph.
     """
-    def __init__(self, db_adapter: GraphDBAdapter):
+    def __init__(self, db_adapter: AsyncGraphDBAdapter):
         self.db = db_adapter
 
-    def create_conflict(
+    async def create_conflict(
         self, 
         source_id: str, 
         target_id: str, 
@@ -35,7 +35,7 @@ class ResolutionEngine:
         )
         
         # Use existing create_edge method from adapter
-        self.db.create_edge(
+        await self.db.create_edge(
             source_id=source_id,
             target_id=target_id,
             edge_type=RelationshipType.CONFLICTS_WITH,
@@ -46,7 +46,7 @@ class ResolutionEngine:
         
         return edge
 
-    def resolve_conflict(
+    async def resolve_conflict(
         self, 
         conflict_id: str, 
         status: RelationshipStatus, 
@@ -78,13 +78,13 @@ class ResolutionEngine:
         }
         
         try:
-            results = self.db.run_query(query, params)
+            results = await self.db.run_query(query, params)
             return len(results) > 0
         except Exception as e:
             logger.error(f"Error resolving conflict: {e}")
             return False
 
-    def get_pending_conflicts(self, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_pending_conflicts(self, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Retrieves all pending conflicts, optionally filtered by agent.
         """
@@ -99,7 +99,7 @@ class ResolutionEngine:
         params = {"agent_id": agent_id} if agent_id else {}
         
         try:
-            return self.db.run_query(query, params)
+            return await self.db.run_query(query, params)
         except Exception as e:
             logger.error(f"Error fetching pending conflicts: {e}")
             return []
@@ -1,6 +1,10 @@
+import numpy as np
 from loguru import logger
-from typing import List, Dict, Any, Optional, Set
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
+from src.config.environment import settings
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.performance.adjacency_cache import Adjacency, AdjacencyCache
+from src.retrieval.projections import projection
 
 class GraphEngine:
     """
@@ -8,100 +12,315 @@ class GraphEngine:
     Implements advanced traversal algorithms like AKHLT.
     """
     
-    def __init__(self, adapter: GraphDBAdapter):
+    def __init__(self, adapter: AsyncGraphDBAdapter, adjacency_cache: Optional[AdjacencyCache] = None):
         self.adapter = adapter
+        self.adjacency_cache = adjacency_cache or AdjacencyCache()
 
-    def adaptive_k_hop_traversal(
+    # Topology of every frontier node not in the adjacency cache, in one
+    # query: its top `top_n` neighbors by relationship weight, without
+    # neighbor properties (those are hydrated once, after the traversal).
+    # Nodes without relationships still return a row, so their `id` is
+    # known and a later edge can invalidate the cached empty adjacency.
+    # Relationships without a weight are left out, as the Cypher traversal
+    # this replaced (`r.weight >= $min_weight`) never followed them.
+    ADJACENCY_QUERY = """
+    UNWIND $nids AS source_nid
+    MATCH (source)
+    WHERE id(source) = source_nid
+    OPTIONAL MATCH (source)-[r]-(n)
+    WHERE r.weight IS NOT NULL
+    WITH source_nid, source, n, r
+    ORDER BY r.weight DESC
+    WITH source_nid, source.id AS source_id,
+         collect(CASE WHEN r IS NULL THEN null ELSE
+                 {nid: id(n), labels: labels(n), agent_id: n.agent_id,
+                  weight: r.weight, rel_type: type(r)} END)[..$top_n] AS neighbors
+    RETURN source_nid, source_id, neighbors
+    """
+
+    # Label and agent filters run in the database, so nodes retrieval would
+    # drop never cross the wire. {projection} is `n` or a map projection.
+    HYDRATE_QUERY = """
+    UNWIND $nids AS nid
+    MATCH (n)
+    WHERE id(n) = nid
+      AND ($label IS NULL OR $label IN labels(n))
+      AND ($agent_id IS NULL OR n.agent_id = $agent_id)
+    RETURN nid, {projection} AS node
+    """
+
+    async def _resolve_start_nodes(self, start_node_ids: List[str]) -> List[int]:
+        """Internal ids of the nodes with the given `id` properties."""
+        results = await self.adapter.run_query(
+            "UNWIND $ids AS node_id MATCH (n {id: node_id}) RETURN id(n) AS nid",
+            {"ids": start_node_ids}
+        )
+        return [res["nid"] for res in results]
+
+    async def _adjacency(self, nids: List[int]) -> Dict[int, Adjacency]:
+        """Neighbors of each node, from the adjacency cache or one batched query for the misses."""
+        adjacency = {}
+        misses = []
+        for nid in nids:
+            cached = self.adjacency_cache.get(nid)
+            if cached is None:
+                misses.append(nid)
+            else:
+                adjacency[nid] = cached
+        if misses:
+            rows = await self.adapter.run_query(
+                self.ADJACENCY_QUERY, {"nids": misses, "top_n": self.adjacency_cache.top_n}
+            )
+            for row in rows:
+                adjacency[row["source_nid"]] = self.adjacency_cache.put(
+                    row["source_nid"], row["source_id"], row["neighbors"]
+                )
+            # Only nodes deleted since they were reached return no row
+            for nid in misses:
+                if nid not in adjacency:
+                    adjacency[nid] = self.adjacency_cache.put(nid, None, [])
+        return adjacency
+
+    async def adaptive_k_hop_traversal(
         self, 
         start_node_ids: List[str], 
         k: int = 2, 
         fan_out_limit: int = 10,
-        min_weight: float = 0.2
+        min_weight: float = 0.2,
+        node_budget: Optional[int] = None,
+        target_label: str = "Experience",
+        target_count: Optional[int] = None,
+        target_properties: Optional[Dict[str, Any]] = None,
+        start_internal_ids: Optional[List[int]] = None,
+        targets_only: bool = False,
+        properties: Optional[Sequence[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         AKHLT (Adaptive K-Hop Limited Traversal) algorithm.
         Traverses the graph starting from multiple nodes, limiting fan-out 
         at each hop and filtering by relationship weight.
         
-        This implementation uses a recursive Cypher pattern with subqueries
-        to enforce the fan-out limit at each expansion step.
+        Expansion is frontier based: each hop expands the whole frontier at
+        once, the visited set is kept here, and a node's path strength is its
+        parent's strength times the connecting weight. Hops only need
+        topology, which comes from the AdjacencyCache and falls back to one
+        batched query for uncached nodes; reached nodes are hydrated in a
+        single query at the end. The traversal stops after `k` hops, once
+        `node_budget` nodes have been reached, or once `target_count` nodes
+        labelled `target_label` (and matching `target_properties`, limited to
+        agent_id) have been found, so its cost is bounded by the budget
+        rather than by the graph's degree.
+        
+        With `targets_only`, only target nodes are hydrated, filtered by label
+        and agent inside the database. `properties` limits hydration to those
+        properties instead of the whole node.
+        
+        Returns one entry per reached (or target) node, strongest first:
+        {"neighbor": properties, "labels": [...], "r": [{"rel_type", "weight"}],
+         "path_strength": float, "hops": int}
         """
-        if not start_node_ids:
+        if not start_node_ids and not start_internal_ids:
             return []
+        node_budget = node_budget or settings.GRAPH_NODE_BUDGET
+        target_agent = (target_properties or {}).get("agent_id")
 
-        # Improved Cypher query for AKHLT with per-hop fan-out limiting
-        # Note: This pattern simulates per-hop limiting by expanding one hop at a time
-        # within the subquery logic or by using list comprehensions for neighbors.
-        
-        # We'll use a more robust query that handles multiple hops with per-hop limiting:
-        query = """
-        UNWIND $start_ids AS start_id
-        MATCH (start {id: start_id})
-        
-        // Hop 1
-        CALL {
-            WITH start
-            MATCH (start)-[r1]-(n1)
-            WHERE r1.weight >= $min_weight
-            WITH n1, r1
-            ORDER BY r1.weight DESC
-            LIMIT $fan_out_limit
-            RETURN n1, [r1] as path1, r1.weight as strength1
-        }
-        
-        // Optional Hop 2 (if k >= 2)
-        OPTIONAL MATCH (n1) WHERE $k >= 2
-        CALL {
-            WITH n1, path1, strength1
-            MATCH (n1)-[r2]-(n2)
-            WHERE r2.weight >= $min_weight AND NOT n2.id IN [node IN path1 | node.id]
-            WITH n2, r2, path1, strength1
-            ORDER BY r2.weight DESC
-            LIMIT $fan_out_limit
-            RETURN n2, path1 + [r2] as path2, strength1 * r2.weight as strength2
+        try:
+            frontier = list(start_internal_ids or await self._resolve_start_nodes(start_node_ids))
+        except Exception as e:
+            logger.error(f"Error resolving AKHLT start nodes: {e}")
+            return []
+
+        # Per reached node: labels, relationship path, strength and hop count
+        reached: Dict[int, Dict[str, Any]] = {}
+        visited: Set[int] = set(frontier)
+        strengths: Dict[int, float] = {nid: 1.0 for nid in frontier}
+        paths: Dict[int, List[Dict[str, Any]]] = {nid: [] for nid in frontier}
+        targets = 0
+        rel_type_names = self.adjacency_cache.rel_type_names
+
+        for hop in range(1, k + 1):
+            if not frontier:
+                break
+            try:
+                adjacency = await self._adjacency(frontier)
+            except Exception as e:
+                logger.error(f"Error in AKHLT traversal at hop {hop}: {e}")
+                break
+
+            # A node reached from several frontier nodes keeps its strongest path
+            discovered: Dict[int, Dict[str, Any]] = {}
+            for source in frontier:
+                neighbors = adjacency.get(source)
+                if neighbors is None:
+                    continue
+                taken = 0
+                for i, nid in enumerate(neighbors.neighbors.tolist()):
+                    weight = float(neighbors.weights[i])
+                    # Neighbors are sorted by weight, so nothing further qualifies
+                    if weight < min_weight or taken >= fan_out_limit:
+                        break
+                    if nid in visited:
+                        continue
+                    taken += 1
+                    strength = strengths[source] * weight
+                    best = discovered.get(nid)
+                    if best is None or strength > best["path_strength"]:
+                        discovered[nid] = {
+                            "labels": neighbors.labels[i],
+                            "agent_id": neighbors.agent_ids[i],
+                            "r": paths[source] + [{
+                                "rel_type": rel_type_names[neighbors.rel_types[i]],
+                                "weight": weight
+                            }],
+                            "path_strength": strength,
+                            "hops": hop
+                        }
+
+            # Spend the remaining budget on the strongest discoveries first
+            ranked = sorted(discovered.items(), key=lambda item: item[1]["path_strength"], reverse=True)
+            ranked = ranked[:max(0, node_budget - len(reached))]
+            frontier = []
+            for nid, entry in ranked:
+                visited.add(nid)
+                reached[nid] = entry
+                strengths[nid] = entry["path_strength"]
+                paths[nid] = entry["r"]
+                frontier.append(nid)
+                if target_label in entry["labels"] and (target_agent is None or entry["agent_id"] == target_agent):
+                    targets += 1
+
+            if len(reached) >= node_budget or (target_count and targets >= target_count):
+                logger.debug(f"AKHLT stopped after hop {hop}: {len(reached)} nodes, {targets} targets")
+                break
+
+        if not targets_only:
+            return await self._hydrate(reached, properties=properties)
+        # The cached labels pick the candidates; the database has the final say
+        candidates = {
+            nid: entry for nid, entry in reached.items()
+            if target_label in entry["labels"] and (target_agent is None or entry["agent_id"] == target_agent)
         }
-        
-        // Final selection based on k
-        WITH 
-            CASE 
-                WHEN $k = 1 THEN n1 
-                WHEN $k >= 2 AND n2 IS NOT NULL THEN n2 
-                ELSE n1 
-            END AS neighbor,
-            CASE 
-                WHEN $k = 1 THEN path1 
-                WHEN $k >= 2 AND path2 IS NOT NULL THEN path2 
-                ELSE path1 
-            END AS r,
-            CASE 
-                WHEN $k = 1 THEN strength1 
-                WHEN $k >= 2 AND strength2 IS NOT NULL THEN strength2 
-                ELSE strength1 
-            END AS path_strength
-            
-        RETURN DISTINCT neighbor, r, path_strength
-        ORDER BY path_strength DESC
+        return await self._hydrate(candidates, label=target_label, agent_id=target_agent, properties=properties)
+
+    async def hydrate_nodes(
+        self,
+        nids: List[int],
+        label: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        properties: Optional[Sequence[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
         """
-        
-        params = {
-            "start_ids": start_node_ids,
-            "k": k,
-            "min_weight": min_weight,
-            "fan_out_limit": fan_out_limit
-        }
-        
+        Properties of nodes by internal id, in one query. Nodes without
+        `label` or owned by another agent than `agent_id` are left out;
+        `properties` restricts what is returned for each node.
+        """
+        if not nids:
+            return {}
+        rows = await self.adapter.run_query(
+            self.HYDRATE_QUERY.format(projection=projection("n", properties) if properties else "n"),
+            {"nids": list(nids), "label": label, "agent_id": agent_id}
+        )
+        return {row["nid"]: row["node"] for row in rows}
+
+    async def _hydrate(
+        self,
+        reached: Dict[int, Dict[str, Any]],
+        label: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        properties: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Attach node properties to the reached nodes, strongest first."""
         try:
-            results = self.adapter.run_query(query, params)
-            return results
+            nodes = await self.hydrate_nodes(list(reached), label=label, agent_id=agent_id, properties=properties)
         except Exception as e:
-            logger.error(f"Error in AKHLT traversal: {e}")
+            logger.error(f"Error hydrating AKHLT results: {e}")
             return []
 
-    def get_related_entities(self, entity_name: str, k: int = 1) -> List[Dict[str, Any]]:
+        results = []
+        for nid, node in nodes.items():
+            entry = reached[nid]
+            results.append({
+                "neighbor": node,
+                "labels": list(entry["labels"]),
+                "r": entry["r"],
+                "path_strength": entry["path_strength"],
+                "hops": entry["hops"]
+            })
+        results.sort(key=lambda entry: entry["path_strength"], reverse=True)
+        return results
+
+    async def extract_subgraph(
+        self,
+        start_internal_ids: List[int],
+        depth: int,
+        node_budget: int,
+        min_weight: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Breadth-first extraction of the weighted neighborhood of the start
+        nodes, up to `depth` hops and `node_budget` nodes, using the same
+        cached topology as the traversal.
+
+        Returns {"nids": [...], "labels": [...], "agent_ids": [...]} indexed by
+        local position, plus the undirected edge list (each edge once) as
+        "sources", "targets" and "weights" arrays of local positions.
+        """
+        position: Dict[int, int] = {}
+        labels: List[Any] = []
+        agent_ids: List[Optional[str]] = []
+        for nid in start_internal_ids:
+            if nid not in position:
+                position[nid] = len(position)
+                labels.append(())
+                agent_ids.append(None)
+
+        sources, targets, weights = [], [], []
+        seen_edges: Set[Tuple[int, int]] = set()
+        frontier = list(position)
+        for _ in range(depth):
+            if not frontier:
+                break
+            adjacency = await self._adjacency(frontier)
+            next_frontier = []
+            for source in frontier:
+                neighbors = adjacency.get(source)
+                if neighbors is None:
+                    continue
+                for i, nid in enumerate(neighbors.neighbors.tolist()):
+                    weight = float(neighbors.weights[i])
+                    if weight < min_weight:
+                        break
+                    if nid not in position:
+                        if len(position) >= node_budget:
+                            continue
+                        position[nid] = len(position)
+                        labels.append(neighbors.labels[i])
+                        agent_ids.append(neighbors.agent_ids[i])
+                        next_frontier.append(nid)
+                    # Both endpoints list an edge between expanded nodes; keep it once
+                    edge = (min(source, nid), max(source, nid))
+                    if edge in seen_edges:
+                        continue
+                    seen_edges.add(edge)
+                    sources.append(position[source])
+                    targets.append(position[nid])
+                    weights.append(weight)
+            frontier = next_frontier
+
+        return {
+            "nids": list(position),
+            "labels": labels,
+            "agent_ids": agent_ids,
+            "sources": np.asarray(sources, dtype=np.int64),
+            "targets": np.asarray(targets, dtype=np.int64),
+            "weights": np.asarray(weights, dtype=np.float64)
+        }
+
+    async def get_related_entities(self, entity_name: str, k: int = 1) -> List[Dict[str, Any]]:
         """Find entities related to a specific entity name."""
         query = """
         MATCH (e:Entity {name: $name})-[r*1..$k]-(related:Entity)
         RETURN related.name as name, related.type as type, r
         """
-        return self.adapter.run_query(query, {"name": entity_name, "k": k})
+        return await self.adapter.run_query(query, {"name": entity_name, "k": k})
 
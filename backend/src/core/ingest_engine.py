@@ -1,13 +1,18 @@
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List
 from loguru import logger
 
-from src.models.nodes import Experience, MemoryType
+from src.models.nodes import Experience, Entity, MemoryType
 from src.storage.adapters.embedding_adapter import EmbeddingAdapter
 from src.storage.adapters.llm_adapter import LLMAdapter
 from src.storage.adapters.cache_adapter import CacheAdapter
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.unit_of_work import GraphUnitOfWork
+from src.performance.query_cache import QueryCache
+from src.retrieval.bm25_index import BM25Index
+from src.performance.vector_partitions import VectorIndexRouter
+from src.performance.adjacency_cache import AdjacencyCache
 
 from src.config.environment import settings
 from src.strata.experiential_stratum import ExperientialStratum
@@ -18,23 +23,30 @@ from src.operations.contradict_operation import ContradictOperation
 class IngestEngine:
     def __init__(
         self, 
-        db_adapter: GraphDBAdapter,
+        db_adapter: AsyncGraphDBAdapter,
         embedding_adapter: EmbeddingAdapter,
         llm_adapter: LLMAdapter,
-        cache_adapter: Optional[CacheAdapter] = None
+        cache_adapter: Optional[CacheAdapter] = None,
+        keyword_index: Optional[BM25Index] = None,
+        vector_router: Optional[VectorIndexRouter] = None,
+        adjacency_cache: Optional[AdjacencyCache] = None
     ):
         self.db = db_adapter
         self.embedding_adapter = embedding_adapter
         self.llm_adapter = llm_adapter
         self.cache_adapter = cache_adapter
+        self.query_cache = QueryCache(cache_adapter) if cache_adapter else None
+        self.keyword_index = keyword_index
+        self.vector_router = vector_router or VectorIndexRouter()
+        self.adjacency_cache = adjacency_cache
         
         # Initialize strata
         self.experiential = ExperientialStratum(self.db, self.llm_adapter)
-        self.contextual = ContextualStratum(self.db, self.embedding_adapter)
+        self.contextual = ContextualStratum(self.db, self.embedding_adapter, vector_router=self.vector_router)
         self.abstract = AbstractStratum(self.db, self.llm_adapter)
         
         # Initialize conflict detection
-        self.contradict_op = ContradictOperation(self.db, self.llm_adapter)
+        self.contradict_op = ContradictOperation(self.db, self.llm_adapter, vector_router=self.vector_router)
 
     async def ingest(
         self, 
@@ -44,7 +56,8 @@ class IngestEngine:
         memory_type: MemoryType = MemoryType.EPISODIC,
         metadata: Dict[str, Any] = None,
         entities: Optional[List[Dict[str, Any]]] = None,
-        principles: Optional[List[Dict[str, Any]]] = None
+        principles: Optional[List[Dict[str, Any]]] = None,
+        uow: Optional[GraphUnitOfWork] = None
     ) -> Experience:
         """
         Orchestrate the ingestion flow:
@@ -53,17 +66,22 @@ class IngestEngine:
         3. Create Experience node
         4. Run Strata (Experiential, Contextual, Abstract)
         5. Return the created Experience
+        
+        If `uow` is given the Experience write is staged on it, so it commits
+        together with its derived nodes; otherwise it is written immediately.
         """
         logger.info(f"Starting ingestion for agent {agent_id}, session {session_id}")
         
         # 1. Cache/Deduplication check
         embedding = None
         if self.cache_adapter:
-            embedding = self.cache_adapter.get_embedding(content)
+            cached = self.cache_adapter.get_embedding(content)
+            if cached is not None:
+                embedding = cached.tolist()
             
         # 2. Generate Embedding if not cached
-        if not embedding:
-            embedding = self.embedding_adapter.embed_text(content)
+        if embedding is None:
+            embedding = await self.embedding_adapter.aembed_text(content)
             if self.cache_adapter:
                 self.cache_adapter.set_embedding(content, embedding)
         
@@ -79,9 +97,15 @@ class IngestEngine:
             metadata=metadata or {}
         )
         
-        # Write Experience to Graph DB
-        self.db.create_node("Experience", experience.model_dump())
-        logger.debug(f"Created Experience node: {experience.id}")
+        # Write Experience to Graph DB, labelled with its vector index partition
+        labels = self.vector_router.labels_for(agent_id)
+        if uow is not None:
+            uow.create_node(labels, experience.model_dump())
+            logger.debug(f"Staged Experience node: {experience.id}")
+        else:
+            await self.db.create_node(labels, experience.model_dump())
+            logger.debug(f"Created Experience node: {experience.id}")
+            self.after_commit(experience)
         
         return experience
 
@@ -97,37 +121,84 @@ class IngestEngine:
         2. Contextual Stratum (Clustering)
         3. Abstract Stratum (Principles)
         4. Conflict Detection
+        
+        All nodes and edges derived by the strata are committed in a single
+        transaction, so a failure never leaves a partially linked experience.
         """
         logger.info(f"Background enrichment starting for experience {experience.id}")
         try:
-            # Skip heavy processing if LITE_MODE is active and no pre-extracted data is provided
-            if settings.LITE_MODE and not entities and not principles:
-                logger.info(f"LITE_MODE active for {experience.id}: skipping enrichment.")
-                
-                # We still run contextual stratum as it only uses embeddings (not LLM)
-                context = await self.contextual.process(experience)
-                logger.debug(f"Contextual stratum processed: {context.id if context else 'None'}")
-                return
-
-            # Experiential: Entity extraction (or injection)
-            processed_entities = await self.experiential.process(experience, provided_entities=entities)
-            logger.debug(f"Experiential stratum processed for {experience.id}: {len(processed_entities)} entities")
-            
-            # Contextual: Clustering (Embedding based)
-            context = await self.contextual.process(experience)
-            logger.debug(f"Contextual stratum processed for {experience.id}: {context.id if context else 'None'}")
-            
-            # Abstract: Principle derivation (or injection)
-            processed_principles = await self.abstract.process(experience, provided_principles=principles)
-            logger.debug(f"Abstract stratum processed for {experience.id}: {len(processed_principles)} principles")
-            
-            # 5. Conflict Detection
-            if not settings.LITE_MODE:
-                conflicts = await self.contradict_op.execute(experience)
-                if conflicts:
-                    logger.info(f"Detected {len(conflicts)} conflicts for experience {experience.id}")
-            
+            uow = GraphUnitOfWork(self.db)
+            processed_entities = await self.stage_enrichment(experience, uow, entities=entities, principles=principles)
+            linked_node_ids = uow.edge_endpoints()
+            await uow.flush()
+            self.after_commit(experience, processed_entities, index_experience=False, linked_node_ids=linked_node_ids)
+            await self.detect_conflicts(experience)
         except Exception as e:
             logger.error(f"Error during background enrichment for {experience.id}: {e}")
 
+    def after_commit(
+        self,
+        experience: Experience,
+        entities: Optional[List[Entity]] = None,
+        index_experience: bool = True,
+        linked_node_ids: Iterable[str] = ()
+    ):
+        """
+        Bring read-side state up to date once an experience's writes are committed:
+        invalidate the agent's cached recalls and the adjacency of newly linked
+        nodes, and add the new content to the keyword index.
+        """
+        if self.adjacency_cache:
+            self.adjacency_cache.invalidate(linked_node_ids)
+        if self.query_cache:
+            self.query_cache.bump_generation(experience.agent_id)
+        if self.keyword_index:
+            if index_experience:
+                self.keyword_index.add_experience(experience, entities or [])
+            elif entities:
+                self.keyword_index.add_entities(experience.agent_id, entities)
+
+    async def stage_enrichment(
+        self,
+        experience: Experience,
+        uow: GraphUnitOfWork,
+        entities: Optional[List[Dict[str, Any]]] = None,
+        principles: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Entity]:
+        """
+        Run the strata for an experience, staging their writes on `uow`.
+        The caller owns the unit of work and is responsible for flushing it.
+        Returns the entities linked to the experience.
+        """
+        # Skip heavy processing if LITE_MODE is active and no pre-extracted data is provided
+        if settings.LITE_MODE and not entities and not principles:
+            logger.info(f"LITE_MODE active for {experience.id}: skipping enrichment.")
+            
+            # We still run contextual stratum as it only uses embeddings (not LLM)
+            context = await self.contextual.process(experience, uow=uow)
+            logger.debug(f"Contextual stratum processed: {context.id if context else 'None'}")
+            return []
+
+        # Experiential: Entity extraction (or injection)
+        processed_entities = await self.experiential.process(experience, provided_entities=entities, uow=uow)
+        logger.debug(f"Experiential stratum processed for {experience.id}: {len(processed_entities)} entities")
+        
+        # Contextual: Clustering (Embedding based)
+        context = await self.contextual.process(experience, uow=uow)
+        logger.debug(f"Contextual stratum processed for {experience.id}: {context.id if context else 'None'}")
+        
+        # Abstract: Principle derivation (or injection)
+        processed_principles = await self.abstract.process(experience, provided_principles=principles, uow=uow)
+        logger.debug(f"Abstract stratum processed for {experience.id}: {len(processed_principles)} principles")
+        return processed_entities
 
+    async def detect_conflicts(self, experience: Experience):
+        """
+        Run conflict detection for a committed experience.
+        Skipped in LITE_MODE since it requires LLM verification.
+        """
+        if settings.LITE_MODE:
+            return
+        conflicts = await self.contradict_op.execute(experience)
+        if conflicts:
+            logger.info(f"Detected {len(conflicts)} conflicts for experience {experience.id}")
@@ -1,17 +1,19 @@
 import asyncio
-from typing import List, Optional
+from typing import Dict, List, Optional
 from loguru import logger
 
-from src.models.memory_result import MemoryResult
+from src.models.memory_result import MemoryResult, RecallResponse
 from src.retrieval.semantic_retriever import SemanticRetriever
 from src.retrieval.context_retriever import ContextRetriever
 from src.retrieval.temporal_retriever import TemporalRetriever
 from src.retrieval.graph_retriever import GraphRetriever
+from src.retrieval.ppr_retriever import PPRRetriever
 
 class RecallEngine:
     """
     Orchestrates the retrieval of memories from multiple paths concurrently.
-    Launched retrieval paths include semantic, context (FTS), temporal, and graph.
+    Launched retrieval paths include semantic, context (FTS), temporal, and graph,
+    plus personalized PageRank (ppr) when a PPRRetriever is configured.
     """
     
     def __init__(
@@ -19,12 +21,21 @@ class RecallEngine:
         semantic_retriever: SemanticRetriever,
         context_retriever: ContextRetriever,
         temporal_retriever: TemporalRetriever,
-        graph_retriever: GraphRetriever
+        graph_retriever: GraphRetriever,
+        ppr_retriever: Optional[PPRRetriever] = None
     ):
         self.semantic = semantic_retriever
         self.context = context_retriever
         self.temporal = temporal_retriever
         self.graph = graph_retriever
+        self.ppr = ppr_retriever
+
+    def path_names(self) -> List[str]:
+        """Every retrieval path this engine can launch."""
+        names = ["semantic", "context", "temporal", "graph"]
+        if self.ppr:
+            names.append("ppr")
+        return names
 
     async def recall(
         self,
@@ -33,8 +44,9 @@ class RecallEngine:
         agent_id: str,
         entity_names: Optional[List[str]] = None,
         limit: int = 10,
-        timeout: float = 2.0
-    ) -> List[MemoryResult]:
+        timeout: float = 2.0,
+        path_timeouts: Optional[Dict[str, float]] = None
+    ) -> RecallResponse:
         """
         Execute concurrent retrieval paths and merge results.
         
@@ -44,65 +56,104 @@ class RecallEngine:
             agent_id: The ID of the agent performing the recall.
             entity_names: Optional list of entities extracted from the query for graph traversal.
             limit: Maximum results to retrieve per path.
-            timeout: Global timeout for all retrieval paths in seconds.
+            timeout: Overall budget for all retrieval paths in seconds.
+            path_timeouts: Optional per-path deadlines keyed by path name
+                (semantic, context, temporal, graph, ppr). Paths without an entry
+                use the overall budget.
             
         Returns:
-            A list of unique MemoryResult objects.
+            A RecallResponse with the unique results of every path that finished
+            in time. Paths that timed out or failed are listed in missing_paths.
         """
         logger.info(f"Recall Engine: Starting retrieval for agent {agent_id} with query: '{query[:50]}...'")
+        path_timeouts = path_timeouts or {}
         
-        # Define tasks for concurrent execution
-        tasks = [
-            self._safe_retrieve("semantic", self.semantic.search, query_embedding, limit, agent_id),
-            self._safe_retrieve("context", self.context.search, query, limit, agent_id),
-            self._safe_retrieve("temporal", self.temporal.get_recent_memories, agent_id, limit)
-        ]
+        # Define tasks for concurrent execution, keyed by path name
+        paths = {
+            "semantic": (self.semantic.search, (query_embedding, limit, agent_id), {}),
+            "context": (self.context.search, (query, limit, agent_id), {}),
+            "temporal": (self.temporal.get_recent_memories, (agent_id, limit), {})
+        }
         
         # Add graph retrieval task if entities are provided
         if entity_names:
             logger.debug(f"Recall Engine: Adding graph retrieval task for entities: {entity_names}")
-            tasks.append(
-                self._safe_retrieve("graph", self.graph.retrieve_by_entities, entity_names, agent_id=agent_id)
+            paths["graph"] = (self.graph.retrieve_by_entities, (entity_names,), {"agent_id": agent_id})
+            if self.ppr:
+                paths["ppr"] = (self.ppr.retrieve_by_entities, (entity_names, limit), {"agent_id": agent_id})
+        
+        tasks = {
+            name: asyncio.create_task(
+                self._safe_retrieve(name, func, *args, timeout=path_timeouts.get(name, timeout), **kwargs)
             )
+            for name, (func, args, kwargs) in paths.items()
+        }
         
-        try:
-            # Run all retrieval paths concurrently
-            # We use wait_for to enforce a hard global timeout
-            results_nested = await asyncio.wait_for(asyncio.gather(*tasks), timeout=timeout)
-            
-            # Flatten results and deduplicate by ID
-            merged_results = {}
-            for sub_results in results_nested:
-                if not sub_results:
-                    continue
-                for res in sub_results:
-                    if res.id not in merged_results:
+        # Wait for the overall budget instead of gather-ing under a single
+        # wait_for, so that one slow path cannot discard the others' results.
+        done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        
+        completed = {}
+        missing_paths = []
+        for name, task in tasks.items():
+            if task in done and task.result() is not None:
+                completed[name] = task.result()
+            else:
+                missing_paths.append(name)
+        
+        if missing_paths:
+            logger.warning(
+                f"Recall Engine: Degraded recall, missing paths {missing_paths} "
+                f"(budget {timeout}s). Returning partial results."
+            )
+        
+        final_results = self._merge(completed.values())
+        logger.info(f"Recall Engine: Retrieval complete. Found {len(final_results)} unique memories.")
+        return RecallResponse(
+            results=final_results,
+            degraded=bool(missing_paths),
+            missing_paths=missing_paths
+        )
+
+    @staticmethod
+    def _merge(results_nested) -> List[MemoryResult]:
+        """
+        Flatten per-path results and deduplicate by ID, keeping the
+        result with the highest relevance score.
+        """
+        merged_results = {}
+        for sub_results in results_nested:
+            if not sub_results:
+                continue
+            for res in sub_results:
+                if res.id not in merged_results:
+                    merged_results[res.id] = res
+                else:
+                    # If already exists, keep the one with higher relevance score
+                    if res.score > merged_results[res.id].score:
                         merged_results[res.id] = res
-                    else:
-                        # If already exists, keep the one with higher relevance score
-                        if res.score > merged_results[res.id].score:
-                            merged_results[res.id] = res
-            
-            final_results = list(merged_results.values())
-            logger.info(f"Recall Engine: Retrieval complete. Found {len(final_results)} unique memories.")
-            return final_results
-            
-        except asyncio.TimeoutError:
-            logger.warning(f"Recall Engine: Global timeout of {timeout}s reached. Returning partial results.")
-            return []
-        except Exception as e:
-            logger.error(f"Recall Engine: Unexpected error during parallel retrieval: {e}")
-            return []
+        return list(merged_results.values())
 
-    async def _safe_retrieve(self, name: str, func, *args, **kwargs) -> List[MemoryResult]:
+    async def _safe_retrieve(
+        self, name: str, func, *args, timeout: Optional[float] = None, **kwargs
+    ) -> Optional[List[MemoryResult]]:
         """
         Execute a single retrieval path and handle errors to prevent one path from 
         failing the entire recall operation.
+        
+        Returns None when the path failed or missed its deadline, so the caller
+        can tell a missing path apart from one that legitimately found nothing.
         """
         try:
             logger.debug(f"Recall Engine: Launching {name} retrieval path...")
-            # Use to_thread for synchronous retriever methods to avoid blocking the event loop
-            return await asyncio.to_thread(func, *args, **kwargs)
+            # Retrievers are native coroutines on the async graph adapter, so a
+            # missed deadline cancels the query instead of leaving a thread behind
+            return await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Recall Engine: {name} retrieval path exceeded its {timeout}s deadline")
+            return None
         except Exception as e:
             logger.error(f"Recall Engine: Error in {name} retrieval path: {e}")
-            return []
+            return None
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from loguru import logger
+
+from src.config.environment import settings
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.adapters.embedding_adapter import EmbeddingAdapter
+from src.storage.adapters.llm_adapter import LLMAdapter
+from src.storage.adapters.cache_adapter import CacheAdapter
+from src.operations.remember_operation import RememberOperation
+from src.operations.recall_operation import RecallOperation
+from src.operations.contradict_operation import ContradictOperation
+from src.conflict_resolution.resolution_engine import ResolutionEngine
+from src.retrieval.bm25_index import BM25Index
+from src.performance.vector_partitions import VectorIndexRouter
+from src.performance.vector_index_maintenance import VectorIndexMaintainer
+from src.performance.adjacency_cache import AdjacencyCache
+
+# Dependencies that must be available before the worker reports ready.
+# Redis is optional: without it caching is simply disabled.
+REQUIRED_DEPENDENCIES = ("graph_db", "embedding", "llm")
+
+class ServiceContainer:
+    """
+    Owns one pooled instance of each adapter per process and injects them
+    into every operation, so a worker holds a single Bolt driver, one set of
+    provider clients and one Redis pool.
+
+    Construction does no network I/O. Connections are warmed concurrently in
+    the background with bounded timeouts, and a failing dependency is retried
+    instead of preventing the process from booting; its state is exposed
+    through readiness().
+    """
+
+    def __init__(self):
+        self.db_adapter: Optional[AsyncGraphDBAdapter] = None
+        self.embedding_adapter: Optional[EmbeddingAdapter] = None
+        self.llm_adapter: Optional[LLMAdapter] = None
+        self.cache_adapter: Optional[CacheAdapter] = None
+        self.keyword_index: Optional[BM25Index] = None
+        self.vector_router: Optional[VectorIndexRouter] = None
+        self.adjacency_cache: Optional[AdjacencyCache] = None
+        self.index_maintainer: Optional[VectorIndexMaintainer] = None
+
+        self.remember_op: Optional[RememberOperation] = None
+        self.recall_op: Optional[RecallOperation] = None
+        self.contradict_op: Optional[ContradictOperation] = None
+        self.resolution_engine: Optional[ResolutionEngine] = None
+
+        self.dependency_state: Dict[str, Dict[str, Any]] = {}
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    def _set_state(self, name: str, status: str, error: Optional[str] = None):
+        previous = self.dependency_state.get(name, {})
+        self.dependency_state[name] = {
+            "status": status,
+            "error": error,
+            "attempts": previous.get("attempts", 0) + (1 if status != "pending" else 0),
+            "updated_at": time.time()
+        }
+
+    def _build_client(self, name: str, factory: Callable[[], Any]) -> Optional[Any]:
+        """Construct a provider client, recording a failure instead of raising."""
+        try:
+            client = factory()
+            self._set_state(name, "ready")
+            return client
+        except Exception as e:
+            logger.error(f"Failed to initialize {name} adapter: {e}")
+            self._set_state(name, "failed", error=str(e))
+            return None
+
+    def build(self):
+        """Construct the shared adapters and wire them into the operations (no network I/O)."""
+        self.db_adapter = AsyncGraphDBAdapter(
+            uri=f"bolt://{settings.MEMGRAPH_HOST}:{settings.MEMGRAPH_PORT}",
+            user=settings.MEMGRAPH_USERNAME,
+            password=settings.MEMGRAPH_PASSWORD,
+            max_connection_pool_size=settings.MEMGRAPH_MAX_POOL_SIZE,
+            connection_acquisition_timeout=settings.MEMGRAPH_CONNECTION_ACQUISITION_TIMEOUT
+        )
+        self._set_state("graph_db", "pending")
+        self.cache_adapter = CacheAdapter(max_connections=settings.REDIS_MAX_CONNECTIONS, connect=False)
+        self._set_state("cache", "pending")
+        self.embedding_adapter = self._build_client("embedding", EmbeddingAdapter)
+        self.llm_adapter = self._build_client(
+            "llm", lambda: LLMAdapter(provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL)
+        )
+
+        self.keyword_index = BM25Index(self.db_adapter)
+        self.adjacency_cache = AdjacencyCache()
+        self.vector_router = VectorIndexRouter()
+        self.index_maintainer = VectorIndexMaintainer(self.db_adapter, self.vector_router, self.cache_adapter)
+        self.resolution_engine = ResolutionEngine(self.db_adapter)
+        if not (self.embedding_adapter and self.llm_adapter):
+            logger.error("Memory operations unavailable: provider clients failed to initialize.")
+            return
+
+        adapters = dict(
+            db_adapter=self.db_adapter,
+            embedding_adapter=self.embedding_adapter,
+            llm_adapter=self.llm_adapter,
+            cache_adapter=self.cache_adapter
+        )
+        shared = dict(
+            keyword_index=self.keyword_index,
+            vector_router=self.vector_router,
+            adjacency_cache=self.adjacency_cache
+        )
+        self.remember_op = RememberOperation(**adapters, **shared)
+        self.recall_op = RecallOperation(**adapters, **shared)
+        self.contradict_op = ContradictOperation(self.db_adapter, self.llm_adapter, vector_router=self.vector_router)
+
+    async def start(self):
+        """Build the services and warm their connections in the background."""
+        self.build()
+        self._warm_up_task = asyncio.create_task(self.warm_up())
+        logger.info("Service container started; warming dependencies in the background")
+
+    async def warm_up(self):
+        """Warm every network dependency concurrently."""
+        await asyncio.gather(
+            self._warm_graph(),
+            self._warm("cache", self._connect_cache)
+        )
+
+    async def _warm_graph(self):
+        await self._warm("graph_db", lambda: self.db_adapter.warm_up(settings.MEMGRAPH_WARM_CONNECTIONS))
+        try:
+            await self.vector_router.refresh(self.db_adapter)
+        except Exception as e:
+            # Searches keep using the global vector index
+            logger.warning(f"Could not load vector index partitions: {e}")
+        if settings.VECTOR_INDEX_MAINTENANCE_ENABLED:
+            self._maintenance_task = asyncio.create_task(self.index_maintainer.run())
+
+    async def _connect_cache(self):
+        # redis-py is synchronous; keep the ping off the event loop
+        if not await asyncio.to_thread(self.cache_adapter.connect):
+            raise ConnectionError(f"Redis unreachable at {self.cache_adapter.redis_url}")
+
+    async def _warm(self, name: str, warm_func: Callable[[], Awaitable[Any]]):
+        """
+        Warm a single dependency, bounding each attempt by STARTUP_TIMEOUT_SECONDS
+        and retrying failed attempts until it becomes available.
+        """
+        timeout = settings.STARTUP_TIMEOUT_SECONDS
+        while True:
+            try:
+                await asyncio.wait_for(warm_func(), timeout=timeout)
+                self._set_state(name, "ready")
+                logger.info(f"Dependency {name} is ready")
+                return
+            except asyncio.TimeoutError:
+                self._set_state(name, "failed", error=f"Timed out after {timeout}s")
+            except Exception as e:
+                self._set_state(name, "failed", error=str(e))
+            logger.warning(
+                f"Dependency {name} not ready ({self.dependency_state[name]['error']}). "
+                f"Retrying in {settings.STARTUP_RETRY_INTERVAL_SECONDS}s"
+            )
+            await asyncio.sleep(settings.STARTUP_RETRY_INTERVAL_SECONDS)
+
+    def readiness(self) -> Dict[str, Any]:
+        """Per-dependency warm-up state and overall readiness."""
+        ready = all(
+            self.dependency_state.get(name, {}).get("status") == "ready"
+            for name in REQUIRED_DEPENDENCIES
+        )
+        return {"ready": ready, "dependencies": self.dependency_state}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Runtime metrics of the shared adapters."""
+        return {
+            "embedding": self.embedding_adapter.coalescer.get_metrics() if self.embedding_adapter else {},
+            "cache": self.cache_adapter.get_metrics() if self.cache_adapter else {},
+            "query_embeddings": self.recall_op.query_embedding_cache.stats() if self.recall_op else {},
+            "semantic_search": self.recall_op.semantic.stats() if self.recall_op else {},
+            "vector_indexes": self.index_maintainer.status() if self.index_maintainer else {},
+            "adjacency_cache": self.adjacency_cache.stats() if self.adjacency_cache else {},
+            "keyword_index": self.keyword_index.stats() if self.keyword_index else {},
+            "semantic_cache": self.recall_op.semantic_cache.stats() if self.recall_op and self.recall_op.semantic_cache else {}
+        }
+
+    async def close(self):
+        """Stop warm-up and release pooled connections."""
+        for task in (self._warm_up_task, self._maintenance_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        if self.keyword_index:
+            await self.keyword_index.close()
+        if self.db_adapter:
+            await self.db_adapter.disconnect()
+        if self.cache_adapter:
+            self.cache_adapter.close()
+        logger.info("Service container closed")
@@ -12,3 +12,8 @@ class MemoryResult(BaseModel):
     provenance: str = Field(..., description="The origin or source of this memory (e.g., session ID, file name)")
     created_at: Optional[datetime] = Field(None, description="The timestamp when the memory was created")
 
+
+class RecallResponse(BaseModel):
+    results: List[MemoryResult] = Field(default_factory=list, description="Ranked memories returned by the recall")
+    degraded: bool = Field(False, description="True when one or more retrieval paths did not complete in time")
+    missing_paths: List[str] = Field(default_factory=list, description="Retrieval paths that timed out or failed")
@@ -1,27 +1,33 @@
 from typing import List, Dict, Any, Optional
 from loguru import logger
 from src.models.nodes import Experience
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 from src.storage.adapters.llm_adapter import LLMAdapter
 from src.conflict_resolution.contradiction_detector import ContradictionDetector
 from src.conflict_resolution.conflict_analyzer import ConflictAnalyzer
 from src.conflict_resolution.resolution_engine import ResolutionEngine
 from src.config.environment import settings
+from src.performance.vector_partitions import VectorIndexRouter
 
 class ContradictOperation:
     """
     Unified operation for detecting and recording contradictions.
     """
-    def __init__(self, db_adapter: Optional[GraphDBAdapter] = None, llm_adapter: Optional[LLMAdapter] = None):
+    def __init__(
+        self,
+        db_adapter: Optional[AsyncGraphDBAdapter] = None,
+        llm_adapter: Optional[LLMAdapter] = None,
+        vector_router: Optional[VectorIndexRouter] = None
+    ):
         # Allow dependency injection or initialize defaults
-        self.db = db_adapter or GraphDBAdapter(
+        self.db = db_adapter or AsyncGraphDBAdapter(
             uri=f"bolt://{settings.MEMGRAPH_HOST}:{settings.MEMGRAPH_PORT}",
             user=settings.MEMGRAPH_USERNAME,
             password=settings.MEMGRAPH_PASSWORD
         )
         self.llm = llm_adapter or LLMAdapter(provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL)
         
-        self.detector = ContradictionDetector(self.db, self.llm)
+        self.detector = ContradictionDetector(self.db, self.llm, vector_router=vector_router)
         self.analyzer = ConflictAnalyzer()
         self.engine = ResolutionEngine(self.db)
 
@@ -51,7 +57,7 @@ class ContradictOperation:
             
             # 4. If confirmed contradiction, record it
             if analysis.get("is_contradiction"):
-                conflict_edge = self.engine.create_conflict(
+                conflict_edge = await self.engine.create_conflict(
                     source_id=experience.id,
                     target_id=node_data.get("id"),
                     analysis=analysis
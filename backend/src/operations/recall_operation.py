@@ -1,19 +1,28 @@
 import asyncio
+import json
 from typing import List, Optional, Dict, Any
 from loguru import logger
 
 from src.core.recall_engine import RecallEngine
 from src.ranking.fusion_ranker import FusionRanker
+from src.ranking.mmr_ranker import MMRRanker
 from src.storage.adapters.embedding_adapter import EmbeddingAdapter
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 from src.storage.adapters.llm_adapter import LLMAdapter
+from src.storage.adapters.cache_adapter import CacheAdapter
 from src.retrieval.semantic_retriever import SemanticRetriever
 from src.retrieval.context_retriever import ContextRetriever
 from src.retrieval.temporal_retriever import TemporalRetriever
 from src.retrieval.graph_retriever import GraphRetriever
+from src.retrieval.ppr_retriever import PPRRetriever
+from src.retrieval.bm25_index import BM25Index
+from src.performance.vector_partitions import VectorIndexRouter
+from src.performance.adjacency_cache import AdjacencyCache
 from src.config.environment import settings
-from src.models.memory_result import MemoryResult
+from src.models.memory_result import MemoryResult, RecallResponse
 from src.performance.query_cache import QueryCache
+from src.performance.query_embedding_cache import QueryEmbeddingCache
+from src.performance.semantic_query_cache import SemanticQueryCache
 from src.performance.latency_tracker import LatencyTracker
 
 class RecallOperation:
@@ -24,33 +33,63 @@ class RecallOperation:
     3. Result fusion and ranking
     """
     
-    def __init__(self):
-        # Initialize storage and embedding adapters
-        self.db_adapter = GraphDBAdapter(
+    def __init__(
+        self,
+        db_adapter: Optional[AsyncGraphDBAdapter] = None,
+        embedding_adapter: Optional[EmbeddingAdapter] = None,
+        llm_adapter: Optional[LLMAdapter] = None,
+        cache_adapter: Optional[CacheAdapter] = None,
+        keyword_index: Optional[BM25Index] = None,
+        vector_router: Optional[VectorIndexRouter] = None,
+        adjacency_cache: Optional[AdjacencyCache] = None
+    ):
+        # Shared adapters are injected by the ServiceContainer; standalone
+        # usage (scripts, tests) falls back to private instances.
+        self.db_adapter = db_adapter or AsyncGraphDBAdapter(
             uri=f"bolt://{settings.MEMGRAPH_HOST}:{settings.MEMGRAPH_PORT}",
             user=settings.MEMGRAPH_USERNAME,
             password=settings.MEMGRAPH_PASSWORD
         )
-        self.embedding_adapter = EmbeddingAdapter()
-        self.llm_adapter = LLMAdapter(provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL)
+        self.embedding_adapter = embedding_adapter or EmbeddingAdapter()
+        self.llm_adapter = llm_adapter or LLMAdapter(provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL)
+        self.cache_adapter = cache_adapter or CacheAdapter()
         
         # Initialize specialized retrievers
-        self.semantic = SemanticRetriever(self.db_adapter)
-        self.context = ContextRetriever(self.db_adapter)
+        self.semantic = SemanticRetriever(self.db_adapter, vector_router=vector_router)
+        # Shared with the ingest path, which keeps it current
+        self.keyword_index = keyword_index or BM25Index(self.db_adapter)
+        self.context = ContextRetriever(self.db_adapter, keyword_index=self.keyword_index)
         self.temporal = TemporalRetriever(self.db_adapter)
-        self.graph = GraphRetriever(self.db_adapter)
+        self.graph = GraphRetriever(self.db_adapter, adjacency_cache=adjacency_cache)
+        self.ppr = PPRRetriever(self.db_adapter, graph_engine=self.graph.graph_engine) if settings.PPR_ENABLED else None
         
         # Initialize the engine and ranker
         self.engine = RecallEngine(
             semantic_retriever=self.semantic,
             context_retriever=self.context,
             temporal_retriever=self.temporal,
-            graph_retriever=self.graph
+            graph_retriever=self.graph,
+            ppr_retriever=self.ppr
         )
         self.ranker = FusionRanker()
+        self.mmr_ranker = MMRRanker(lambda_mult=settings.MMR_LAMBDA)
         
-        # Initialize query cache
-        self.query_cache = QueryCache()
+        # Initialize query cache on the shared Redis pool
+        self.query_cache = QueryCache(self.cache_adapter)
+        # Query text -> embedding, shared across agents and limits
+        self.query_embedding_cache = QueryEmbeddingCache(self.cache_adapter)
+        # Paraphrase-tolerant results cache, consulted once the query is embedded
+        self.semantic_cache = SemanticQueryCache() if settings.SEMANTIC_CACHE_ENABLED else None
+        # Recalls currently being computed, keyed by their arguments (single-flight)
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+
+    async def _embed_query(self, query: str) -> List[float]:
+        """Embed the query, reusing a cached embedding when one exists."""
+        cached = self.query_embedding_cache.get(query)
+        if cached is not None:
+            return cached
+        embedding = await self.embedding_adapter.aembed_text(query)
+        return self.query_embedding_cache.set(query, embedding)
 
     async def execute(
         self,
@@ -58,37 +97,111 @@ class RecallOperation:
         agent_id: str,
         limit: int = 10,
         metadata_filter: Optional[Dict[str, Any]] = None,
-        entities: Optional[List[str]] = None
-    ) -> List[MemoryResult]:
+        entities: Optional[List[str]] = None,
+        diversify: bool = False
+    ) -> RecallResponse:
         """
         Execute the recall operation.
         
+        Identical concurrent recalls share a single computation, and a cached
+        entry past its fresh TTL is served while one background recall
+        refreshes it (stale-while-revalidate).
+        
         Args:
             query: The user's search query.
             agent_id: The ID of the agent performing the search.
             limit: Total number of results to return.
             metadata_filter: Optional filters for memory metadata.
             entities: Pre-extracted entity names (optional).
+            diversify: Re-rank with Maximal Marginal Relevance to drop near-duplicates.
             
         Returns:
-            A list of ranked MemoryResult objects.
+            A RecallResponse with the ranked MemoryResult objects. The response is
+            flagged as degraded when some retrieval paths did not finish in time.
         """
         logger.info(f"Recall Operation: Starting for query: '{query[:50]}...'")
+        
+        try:
+            # Pinned for the whole recall so a concurrent write invalidates our result
+            generation = self.query_cache.get_generation(agent_id)
+            args = (query, agent_id, limit, metadata_filter, entities, generation, diversify)
+
+            # 0. Check Query Cache
+            entry = self.query_cache.get_entry(
+                query, agent_id, limit, metadata_filter, generation=generation, diversify=diversify
+            )
+            if entry is not None:
+                cached_results, stale = entry
+                if stale:
+                    logger.debug("Recall Operation: Serving stale cache entry, refreshing in background")
+                    self._start_flight(*args)
+                return RecallResponse(results=cached_results)
+
+            # Shielded so a cancelled caller doesn't cancel the recall other callers await
+            return await asyncio.shield(self._start_flight(*args))
+            
+        except Exception as e:
+            logger.error(f"Recall Operation: Failed to execute recall: {e}")
+            return self._failed_response()
+
+    def _failed_response(self) -> RecallResponse:
+        """
+        An empty response for a recall that failed, flagged as degraded with
+        every path missing so clients don't take it for a complete answer.
+        """
+        return RecallResponse(degraded=True, missing_paths=self.engine.path_names())
+
+    def _start_flight(
+        self,
+        query: str,
+        agent_id: str,
+        limit: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        entities: Optional[List[str]],
+        generation: int,
+        diversify: bool
+    ) -> asyncio.Task:
+        """Return the in-flight recall for these arguments, starting one if none is running."""
+        key = (
+            query,
+            agent_id,
+            limit,
+            json.dumps(metadata_filter or {}, sort_keys=True),
+            tuple(entities) if entities else None,
+            generation,
+            diversify
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._recall(query, agent_id, limit, metadata_filter, entities, generation, diversify)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug("Recall Operation: Joining in-flight recall for identical query")
+        return task
+
+    async def _recall(
+        self,
+        query: str,
+        agent_id: str,
+        limit: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        entities: Optional[List[str]],
+        generation: int,
+        diversify: bool
+    ) -> RecallResponse:
+        """Run the recall pipeline and cache its results."""
         tracker = LatencyTracker()
         
         try:
             with tracker.track("total_recall"):
-                # 0. Check Query Cache
-                with tracker.track("cache_lookup"):
-                    cached_results = self.query_cache.get_results(query, agent_id, limit, metadata_filter)
-                    if cached_results is not None:
-                        return cached_results
-
                 # 1. Query Preprocessing (Embedding & Entities)
                 # Run concurrently to save time
                 with tracker.track("preprocessing"):
                     logger.debug("Recall Operation: Generating query embedding")
-                    embedding_task = asyncio.to_thread(self.embedding_adapter.embed_text, query)
+                    embedding_task = self._embed_query(query)
                     
                     if entities:
                         logger.debug(f"Recall Operation: Using {len(entities)} provided entities")
@@ -106,10 +219,20 @@ class RecallOperation:
                     
                     logger.debug(f"Recall Operation: Preprocessing complete. Entities: {len(entity_names)}")
                 
+                # 1b. Semantic cache: a close paraphrase skips retrieval entirely
+                if self.semantic_cache:
+                    with tracker.track("semantic_cache_lookup"):
+                        semantic_results = self.semantic_cache.lookup(
+                            agent_id, query_embedding, limit, metadata_filter,
+                            generation=generation, diversify=diversify
+                        )
+                        if semantic_results is not None:
+                            return RecallResponse(results=semantic_results)
+                
                 # 2. Parallel retrieval from multiple paths
                 with tracker.track("multi_path_retrieval"):
                     logger.debug("Recall Operation: Launching recall engine")
-                    raw_results = await self.engine.recall(
+                    recall_response = await self.engine.recall(
                         query=query,
                         query_embedding=query_embedding,
                         agent_id=agent_id,
@@ -117,28 +240,48 @@ class RecallOperation:
                         limit=limit * 2 # Retrieve more for better ranking pool
                     )
                 
+                raw_results = recall_response.results
                 if not raw_results:
                     logger.warning("Recall Operation: No memories found for the given query.")
-                    return []
+                    return recall_response
                 
-                # 3. Fusion and Ranking
+                # 3. Fusion and Ranking (only the final `limit` are materialized)
                 with tracker.track("fusion_and_ranking"):
                     logger.debug(f"Recall Operation: Ranking {len(raw_results)} results")
-                    ranked_results = self.ranker.rank(raw_results, query=query)
+                    if diversify:
+                        # Keep a wider pool for MMR to choose from
+                        pool = self.ranker.rank_top_k(raw_results, limit * settings.MMR_CANDIDATE_MULTIPLIER, query=query)
+                    else:
+                        final_results = self.ranker.rank_top_k(raw_results, limit, query=query)
                 
-                # 4. Final limit
-                final_results = ranked_results[:limit]
+                # 3b. Diversity re-ranking over the candidates' stored embeddings
+                if diversify:
+                    with tracker.track("diversity_reranking"):
+                        embeddings = await self.semantic.fetch_embeddings([memory.id for memory in pool])
+                        final_results = self.mmr_ranker.rerank(pool, embeddings, limit)
                 
-                # 5. Cache Results
-                with tracker.track("cache_update"):
-                    self.query_cache.set_results(query, agent_id, limit, final_results, metadata_filter)
+                # 4. Cache Results (partial results from a degraded recall are not cached)
+                if not recall_response.degraded:
+                    with tracker.track("cache_update"):
+                        self.query_cache.set_results(
+                            query, agent_id, limit, final_results, metadata_filter,
+                            generation=generation, diversify=diversify
+                        )
+                        if self.semantic_cache:
+                            self.semantic_cache.store(
+                                agent_id, query_embedding, limit, final_results, metadata_filter,
+                                generation=generation, diversify=diversify
+                            )
             
             report = tracker.get_formatted_report()
             logger.info(f"Recall Operation: Completed in {tracker.total_latency()*1000:.2f}ms. Stages: {report}")
             
-            return final_results
+            return RecallResponse(
+                results=final_results,
+                degraded=recall_response.degraded,
+                missing_paths=recall_response.missing_paths
+            )
             
         except Exception as e:
             logger.error(f"Recall Operation: Failed to execute recall: {e}")
-            # In case of failure, return empty results instead of crashing
-            return []
+            return self._failed_response()
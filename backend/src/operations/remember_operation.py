@@ -6,27 +6,43 @@ from src.models.nodes import MemoryType, Experience
 from src.storage.adapters.embedding_adapter import EmbeddingAdapter
 from src.storage.adapters.llm_adapter import LLMAdapter
 from src.storage.adapters.cache_adapter import CacheAdapter
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.unit_of_work import GraphUnitOfWork
+from src.retrieval.bm25_index import BM25Index
+from src.performance.vector_partitions import VectorIndexRouter
+from src.performance.adjacency_cache import AdjacencyCache
 from src.config.environment import settings
 
 class RememberOperation:
-    def __init__(self):
-        # In a real app, these would likely be managed by a dependency injection system
-        # or a singleton registry. For now, we'll initialize them here.
-        self.db_adapter = GraphDBAdapter(
+    def __init__(
+        self,
+        db_adapter: Optional[AsyncGraphDBAdapter] = None,
+        embedding_adapter: Optional[EmbeddingAdapter] = None,
+        llm_adapter: Optional[LLMAdapter] = None,
+        cache_adapter: Optional[CacheAdapter] = None,
+        keyword_index: Optional[BM25Index] = None,
+        vector_router: Optional[VectorIndexRouter] = None,
+        adjacency_cache: Optional[AdjacencyCache] = None
+    ):
+        # Shared adapters are injected by the ServiceContainer; standalone
+        # usage (scripts, tests) falls back to private instances.
+        self.db_adapter = db_adapter or AsyncGraphDBAdapter(
             uri=f"bolt://{settings.MEMGRAPH_HOST}:{settings.MEMGRAPH_PORT}",
             user=settings.MEMGRAPH_USERNAME,
             password=settings.MEMGRAPH_PASSWORD
         )
-        self.embedding_adapter = EmbeddingAdapter()
-        self.llm_adapter = LLMAdapter(provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL)
-        self.cache_adapter = CacheAdapter()
+        self.embedding_adapter = embedding_adapter or EmbeddingAdapter()
+        self.llm_adapter = llm_adapter or LLMAdapter(provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL)
+        self.cache_adapter = cache_adapter or CacheAdapter()
         
         self.engine = IngestEngine(
             db_adapter=self.db_adapter,
             embedding_adapter=self.embedding_adapter,
             llm_adapter=self.llm_adapter,
-            cache_adapter=self.cache_adapter
+            cache_adapter=self.cache_adapter,
+            keyword_index=keyword_index,
+            vector_router=vector_router,
+            adjacency_cache=adjacency_cache
         )
 
     async def execute(
@@ -52,7 +68,31 @@ class RememberOperation:
             logger.warning(f"Invalid memory type: {memory_type}, defaulting to EPISODIC")
             m_type = MemoryType.EPISODIC
 
-        # 1. Immediate Ingestion
+        if background_tasks:
+            # 1. Immediate Ingestion: the Experience is committed right away so
+            # it can be recalled before enrichment finishes.
+            experience = await self.engine.ingest(
+                content=content,
+                agent_id=agent_id,
+                session_id=session_id,
+                memory_type=m_type,
+                metadata=metadata,
+                entities=entities,
+                principles=principles
+            )
+            
+            # 2. Deferred Enrichment (derived nodes commit in their own transaction)
+            background_tasks.add_task(
+                self.engine.enrich, 
+                experience, 
+                entities=entities, 
+                principles=principles
+            )
+            return experience
+        
+        # Inline fallback: the Experience and everything derived from it
+        # commit together in a single write transaction.
+        uow = GraphUnitOfWork(self.db_adapter)
         experience = await self.engine.ingest(
             content=content,
             agent_id=agent_id,
@@ -60,20 +100,17 @@ class RememberOperation:
             memory_type=m_type,
             metadata=metadata,
             entities=entities,
-            principles=principles
+            principles=principles,
+            uow=uow
         )
+        processed_entities = await self.engine.stage_enrichment(experience, uow, entities=entities, principles=principles)
+        linked_node_ids = uow.edge_endpoints()
+        await uow.flush()
+        self.engine.after_commit(experience, processed_entities, linked_node_ids=linked_node_ids)
         
-        # 2. Deferred Enrichment
-        if background_tasks:
-            background_tasks.add_task(
-                self.engine.enrich, 
-                experience, 
-                entities=entities, 
-                principles=principles
-            )
-        else:
-            # Fallback to inline if no background tasks provided
-            await self.engine.enrich(experience, entities=entities, principles=principles)
+        try:
+            await self.engine.detect_conflicts(experience)
+        except Exception as e:
+            logger.error(f"Error during conflict detection for {experience.id}: {e}")
         
         return experience
-
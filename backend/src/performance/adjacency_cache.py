@@ -0,0 +1,112 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from src.config.environment import settings
+from src.storage.adapters.local_cache import LocalLRUCache
+
+class Adjacency:
+    """
+    The strongest neighbors of one node, as parallel arrays sorted by weight.
+    Per-neighbor labels and agent ids are kept so a traversal can recognise
+    its targets without loading node properties.
+    """
+
+    __slots__ = ("node_id", "neighbors", "weights", "rel_types", "labels", "agent_ids")
+
+    def __init__(self, node_id: Optional[str], rows: List[Dict[str, Any]], rel_type_codes: List[int]):
+        self.node_id = node_id
+        self.neighbors = np.fromiter((row["nid"] for row in rows), dtype=np.int64, count=len(rows))
+        self.weights = np.fromiter((row["weight"] for row in rows), dtype=np.float32, count=len(rows))
+        self.rel_types = np.asarray(rel_type_codes, dtype=np.uint8)
+        # Label tuples repeat heavily (Experience, Entity, ...), so share them
+        self.labels: List[Tuple[str, ...]] = [_intern_labels(row["labels"]) for row in rows]
+        self.agent_ids: List[Optional[str]] = [row.get("agent_id") for row in rows]
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.neighbors.nbytes + self.weights.nbytes + self.rel_types.nbytes
+            + 16 * len(self.labels) + sum(sys.getsizeof(a) for a in self.agent_ids if a) + 200
+        )
+
+_LABEL_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def _intern_labels(labels: Iterable[str]) -> Tuple[str, ...]:
+    key = tuple(labels or ())
+    return _LABEL_TUPLES.setdefault(key, key)
+
+class AdjacencyCache:
+    """
+    In-process cache of each node's top-N weighted neighbors, keyed by the
+    node's internal id, so repeated traversals through hot entities (the
+    user, their company, their main project) never leave the process.
+
+    Bounded by GRAPH_ADJACENCY_CACHE_MAX_ITEMS / _MAX_BYTES and expired after
+    GRAPH_ADJACENCY_CACHE_TTL_SECONDS, which also bounds staleness from other
+    workers' writes. Local writes invalidate the endpoints of new edges
+    through `invalidate`.
+    """
+
+    def __init__(
+        self,
+        top_n: Optional[int] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        self.top_n = top_n or settings.GRAPH_ADJACENCY_TOP_N
+        max_items = max_items or settings.GRAPH_ADJACENCY_CACHE_MAX_ITEMS
+        self._entries = LocalLRUCache(
+            max_items=max_items,
+            max_bytes=max_bytes or settings.GRAPH_ADJACENCY_CACHE_MAX_BYTES,
+            sizeof=lambda adjacency: adjacency.nbytes,
+            ttl=ttl or settings.GRAPH_ADJACENCY_CACHE_TTL_SECONDS
+        )
+        # Application id -> internal id, so writes (which know only the former) can invalidate
+        self._internal_ids: "OrderedDict[str, int]" = OrderedDict()
+        self._max_ids = max_items * 2
+        self._lock = threading.Lock()
+        # Relationship types are stored as indexes into this list
+        self.rel_type_names: List[str] = []
+        self._rel_type_codes: Dict[str, int] = {}
+        self.invalidations = 0
+
+    def get(self, nid: int) -> Optional[Adjacency]:
+        return self._entries.get(nid)
+
+    def put(self, nid: int, node_id: Optional[str], rows: List[Dict[str, Any]]) -> Adjacency:
+        """Cache the neighbor rows of `nid` (already sorted by weight, at most top_n)."""
+        adjacency = Adjacency(node_id, rows, [self._rel_type_code(row["rel_type"]) for row in rows])
+        self._entries.set(nid, adjacency)
+        if node_id is not None:
+            with self._lock:
+                self._internal_ids[node_id] = nid
+                self._internal_ids.move_to_end(node_id)
+                while len(self._internal_ids) > self._max_ids:
+                    self._internal_ids.popitem(last=False)
+        return adjacency
+
+    def _rel_type_code(self, rel_type: Optional[str]) -> int:
+        rel_type = rel_type or "RELATED"
+        code = self._rel_type_codes.get(rel_type)
+        if code is None:
+            with self._lock:
+                code = self._rel_type_codes.setdefault(rel_type, len(self.rel_type_names))
+                if code == len(self.rel_type_names):
+                    self.rel_type_names.append(rel_type)
+        return code
+
+    def invalidate(self, node_ids: Iterable[str]):
+        """Drop the cached neighbors of nodes whose edges changed."""
+        for node_id in node_ids:
+            with self._lock:
+                nid = self._internal_ids.pop(node_id, None)
+            if nid is not None:
+                self._entries.delete(nid)
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._entries.stats(), "invalidations": self.invalidations}
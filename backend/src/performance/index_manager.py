@@ -1,6 +1,16 @@
+from collections import defaultdict
 from loguru import logger
 from typing import List, Dict, Any, Optional
+from src.config.environment import settings
 from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.performance.vector_partitions import (
+    BASE_LABEL,
+    STATE_LABEL,
+    partition_label,
+    partition_labels,
+    size_capacity,
+    versioned_index_name,
+)
 
 class PerformanceIndexManager:
     """
@@ -16,15 +26,20 @@ class PerformanceIndexManager:
         label: str = "Experience", 
         property_name: str = "embedding",
         m: int = 16, 
-        ef_construction: int = 200
+        ef_construction: int = 200,
+        capacity: Optional[int] = None,
+        index_name: Optional[str] = None
     ):
         """
         Tuning HNSW index parameters for better vector search performance.
         M: Max number of outgoing connections in the graph.
         ef_construction: Size of the dynamic candidate list during index building.
+        capacity: Maximum number of vectors; sized from the current node count when omitted.
         """
-        index_name = f"idx_{label}_{property_name}"
-        logger.info(f"Tuning HNSW index {index_name} for {label}({property_name})...")
+        index_name = index_name or f"idx_{label}_{property_name}"
+        if capacity is None:
+            capacity = size_capacity(self.count_nodes(label, property_name))
+        logger.info(f"Tuning HNSW index {index_name} for {label}({property_name}) with capacity {capacity}...")
         
         # 1. Drop existing if any
         try:
@@ -33,18 +48,19 @@ class PerformanceIndexManager:
             pass
             
         # 2. Create using Native Cypher command (Memgraph v3.7+)
-        # We assume 1536 dimensions for text-embedding-3-small
+        # VECTOR_INDEX_DIMENSION defaults to the 1536 dimensions of text-embedding-3-small
         # Memgraph v3.7 might require at least one node to exist or be created for some vector index configurations
+        dimension = settings.VECTOR_INDEX_DIMENSION
         create_query = (
             f"CREATE VECTOR INDEX {index_name} "
             f"ON :{label}({property_name}) "
-            f'WITH CONFIG {{"dimension": 1536, "metric": "cos", "capacity": 1000, "scalar_kind": "f32"}};'
+            f'WITH CONFIG {{"dimension": {dimension}, "metric": "cos", "capacity": {capacity}, "scalar_kind": "f32"}};'
         )
         
         try:
             # Optional: Create a temporary node to ensure the label/property exists if graph is empty
             # Generating a list of zeros for the embedding
-            dummy_embedding = [0.0] * 1536
+            dummy_embedding = [0.0] * dimension
             self.adapter.run_query(
                 f"CREATE (:{label} {{ {property_name}: $emb }});", 
                 {"emb": dummy_embedding}
@@ -56,6 +72,75 @@ class PerformanceIndexManager:
         except Exception as e:
             logger.error(f"Failed to create HNSW index: {e}")
 
+    def count_nodes(self, label: str, property_name: str = "embedding") -> int:
+        """Number of `label` nodes that have `property_name` set."""
+        try:
+            result = self.adapter.run_query(
+                f"MATCH (n:{label}) WHERE n.{property_name} IS NOT NULL RETURN count(n) AS count;"
+            )
+            return result[0]["count"] if result else 0
+        except Exception as e:
+            logger.error(f"Failed to count {label} nodes: {e}")
+            return 0
+
+    def assign_partition_labels(self, shards: Optional[int] = None) -> Dict[str, int]:
+        """
+        Add the partition sublabel to every existing Experience according to
+        its agent_id. Returns the number of agents assigned to each partition.
+        """
+        agents = self.adapter.run_query(
+            f"MATCH (e:{BASE_LABEL}) WHERE e.agent_id IS NOT NULL RETURN DISTINCT e.agent_id AS agent_id;"
+        )
+        by_label = defaultdict(list)
+        for row in agents:
+            label = partition_label(row["agent_id"], shards)
+            if label:
+                by_label[label].append(row["agent_id"])
+
+        for label, agent_ids in by_label.items():
+            self.adapter.run_query(
+                f"MATCH (e:{BASE_LABEL}) WHERE e.agent_id IN $agent_ids SET e:{label};",
+                {"agent_ids": agent_ids}
+            )
+            logger.info(f"Assigned {len(agent_ids)} agents to partition {label}")
+        return {label: len(agent_ids) for label, agent_ids in by_label.items()}
+
+    def create_vector_partitions(self, property_name: str = "embedding", shards: Optional[int] = None):
+        """
+        Create one HNSW index per Experience partition (VECTOR_INDEX_SHARDS),
+        each sized from the partition's current vector count with headroom.
+        Existing experiences are labelled first; new ones are labelled at ingest.
+        """
+        labels = partition_labels(shards)
+        if not labels:
+            logger.info("Vector index partitioning is disabled (VECTOR_INDEX_SHARDS <= 1)")
+            return
+        self.assign_partition_labels(shards)
+        for label in labels:
+            if self.serves_later_version(label):
+                continue
+            self.tune_hnsw_index(label=label, property_name=property_name)
+
+    def serves_later_version(self, partition: str) -> bool:
+        """
+        True when the partition's VectorIndexState records a rebuilt index as
+        serving. Setup skips such partitions: recreating version 0 would
+        build a second index over the same vectors that no worker searches.
+        """
+        try:
+            result = self.adapter.run_query(
+                f"MATCH (s:{STATE_LABEL} {{partition: $partition}}) RETURN s.serving AS serving;",
+                {"partition": partition}
+            )
+        except Exception as e:
+            logger.error(f"Failed to read vector index state for {partition}: {e}")
+            return False
+        serving = result[0]["serving"] if result else None
+        if serving and serving != versioned_index_name(partition, 0):
+            logger.info(f"Skipping vector index setup for {partition}: already served by {serving}")
+            return True
+        return False
+
     def optimize_fts_index(self, label: str = "Experience", properties: List[str] = ["content"]):
         """
         Optimizes Full-Text Search index using Native Cypher command.
@@ -80,15 +165,35 @@ class PerformanceIndexManager:
                 logger.error(f"FTS index creation failed: {e}")
 
     def get_index_health(self) -> List[Dict[str, Any]]:
-        """Checks the status and health of all database indexes."""
+        """
+        Checks the status and health of all database indexes, including the
+        progress of any online vector index rebuild.
+        """
         # Memgraph query for index status
         query = "SHOW INDEX INFO;"
         try:
-            return self.adapter.run_query(query)
+            return self.adapter.run_query(query) + self.get_vector_rebuild_status()
         except Exception as e:
             logger.error(f"Failed to get index info: {e}")
             return []
 
+    def get_vector_rebuild_status(self) -> List[Dict[str, Any]]:
+        """Serving vector index and rebuild progress of each Experience partition."""
+        rows = self.adapter.run_query(f"MATCH (s:{STATE_LABEL}) RETURN s;")
+        status = []
+        for row in rows:
+            state = row["s"]
+            total = state.get("total") or 0
+            status.append({
+                "index type": "vector (maintenance)",
+                "label": state.get("partition"),
+                "serving": state.get("serving"),
+                "building": state.get("building"),
+                "progress": (state.get("labelled") or 0) / total if state.get("building") and total else None,
+                "switched_at": state.get("switched_at")
+            })
+        return status
+
     def verify_hnsw_ready(self, label: str = "Experience") -> bool:
         """Verifies if the HNSW index is fully built and ready for search."""
         index_info = self.get_index_health()
@@ -1,65 +1,123 @@
 import hashlib
 import json
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from loguru import logger
 
+from src.config.environment import settings
 from src.storage.adapters.cache_adapter import CacheAdapter
 from src.models.memory_result import MemoryResult
+from src.performance.result_codec import encode_results, decode_results
 
 class QueryCache:
     """
     Caches query results in Redis to hit the <300ms p95 target for frequent queries.
+
+    Each agent has a generation counter that is folded into the cache key.
+    Bumping it after a write makes every cached recall for that agent
+    unreachable in O(1), without scanning keys; the orphaned entries simply
+    expire with their TTL.
+
+    Entries are fresh for `ttl` seconds and are then kept for another
+    `stale_ttl` seconds, during which they can be served while a single
+    background recall refreshes them (stale-while-revalidate).
     """
     
-    def __init__(self, cache_adapter: Optional[CacheAdapter] = None):
+    def __init__(self, cache_adapter: Optional[CacheAdapter] = None, stale_ttl: Optional[int] = None):
         # Use provided adapter or create a new one with default settings
         self.cache = cache_adapter or CacheAdapter()
+        self.stale_ttl = stale_ttl if stale_ttl is not None else settings.QUERY_CACHE_STALE_TTL
+
+    @staticmethod
+    def _generation_key(agent_id: str) -> str:
+        return f"recall_gen:{agent_id}"
+
+    def get_generation(self, agent_id: str) -> int:
+        """Current recall cache generation for an agent (0 if never bumped)."""
+        return self.cache.get_counter(self._generation_key(agent_id))
+
+    def bump_generation(self, agent_id: str) -> int:
+        """Invalidate every cached recall for an agent. Call after committing its memories."""
+        generation = self.cache.incr(self._generation_key(agent_id))
+        logger.debug(f"Query Cache: agent {agent_id} advanced to generation {generation}")
+        return generation
 
     def _generate_query_key(
         self, 
         query: str, 
         agent_id: str, 
         limit: int, 
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        generation: int = 0,
+        diversify: bool = False
     ) -> str:
         """
-        Generates a deterministic cache key based on query parameters.
+        Generates a deterministic cache key based on query parameters
+        and the agent's current generation.
         """
         context = {
             "query": query,
             "agent_id": agent_id,
             "limit": limit,
-            "metadata_filter": metadata_filter or {}
+            "metadata_filter": metadata_filter or {},
+            "generation": generation,
+            "diversify": diversify
         }
         # sort_keys=True ensures the same dictionary produces the same JSON string
         context_json = json.dumps(context, sort_keys=True)
         hash_val = hashlib.sha256(context_json.encode()).hexdigest()
         return f"recall_cache:{hash_val}"
 
-    def get_results(
+    def get_entry(
         self, 
         query: str, 
         agent_id: str, 
         limit: int, 
-        metadata_filter: Optional[Dict[str, Any]] = None
-    ) -> Optional[List[MemoryResult]]:
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        generation: Optional[int] = None,
+        diversify: bool = False
+    ) -> Optional[Tuple[List[MemoryResult], bool]]:
         """
         Try to retrieve results from the Redis cache.
+        Returns (results, stale), where `stale` means the entry is past its
+        fresh TTL but still inside the stale window and should be refreshed.
+        `generation` defaults to the agent's current generation.
         """
-        key = self._generate_query_key(query, agent_id, limit, metadata_filter)
-        cached_data = self.cache.get(key)
+        if generation is None:
+            generation = self.get_generation(agent_id)
+        key = self._generate_query_key(query, agent_id, limit, metadata_filter, generation, diversify)
+        cached_data = self.cache.get_bytes(key)
         
-        if cached_data and isinstance(cached_data, list):
-            logger.info(f"Query Cache: HIT for query: '{query[:30]}...'")
+        if cached_data:
             try:
-                return [MemoryResult(**res) for res in cached_data]
+                decoded = decode_results(cached_data)
             except Exception as e:
                 logger.error(f"Query Cache: Error deserializing cached results: {e}")
                 return None
+            if decoded is not None:
+                results, fresh_until = decoded
+                stale = time.time() >= fresh_until
+                logger.info(f"Query Cache: {'STALE' if stale else 'HIT'} for query: '{query[:30]}...'")
+                return results, stale
                 
         logger.debug(f"Query Cache: MISS for query: '{query[:30]}...'")
         return None
 
+    def get_results(
+        self, 
+        query: str, 
+        agent_id: str, 
+        limit: int, 
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        generation: Optional[int] = None,
+        diversify: bool = False
+    ) -> Optional[List[MemoryResult]]:
+        """Try to retrieve fresh results from the Redis cache (stale entries count as a miss)."""
+        entry = self.get_entry(query, agent_id, limit, metadata_filter, generation, diversify)
+        if entry is None or entry[1]:
+            return None
+        return entry[0]
+
     def set_results(
         self, 
         query: str, 
@@ -67,17 +125,24 @@ class QueryCache:
         limit: int, 
         results: List[MemoryResult], 
         metadata_filter: Optional[Dict[str, Any]] = None,
-        ttl: int = 300 # Default 5 minutes
+        ttl: Optional[int] = None,
+        generation: Optional[int] = None,
+        diversify: bool = False
     ):
         """
         Store query results in the Redis cache.
+        Pass the `generation` read before the recall ran, so results computed
+        while a write landed are stored under the now-outdated generation.
         """
-        key = self._generate_query_key(query, agent_id, limit, metadata_filter)
+        ttl = ttl or settings.QUERY_CACHE_TTL
+        if generation is None:
+            generation = self.get_generation(agent_id)
+        key = self._generate_query_key(query, agent_id, limit, metadata_filter, generation, diversify)
         try:
-            # Convert MemoryResult objects to dicts for storage
-            results_dict = [res.model_dump() for res in results]
-            self.cache.set(key, results_dict, ttl=ttl)
-            logger.debug(f"Query Cache: SET results for query: '{query[:30]}...' (TTL: {ttl}s)")
+            payload = encode_results(results, fresh_until=time.time() + ttl)
+            # Redis keeps the entry through the stale window as well
+            self.cache.set_bytes(key, payload, ttl=ttl + self.stale_ttl)
+            logger.debug(f"Query Cache: SET results for query: '{query[:30]}...' (TTL: {ttl}s, stale: {self.stale_ttl}s)")
         except Exception as e:
             logger.error(f"Query Cache: Failed to cache results: {e}")
 
@@ -0,0 +1,69 @@
+from typing import List, Optional
+import numpy as np
+from loguru import logger
+
+from src.config.environment import settings
+from src.storage.adapters.cache_adapter import CacheAdapter, encode_embedding, decode_embedding
+from src.storage.adapters.local_cache import LocalLRUCache
+
+class QueryEmbeddingCache:
+    """
+    Caches query text -> embedding so repeated queries skip the embedding provider.
+    Unlike QueryCache the key is the query text alone, so it is shared across
+    agents and independent of `limit` and filters.
+
+    Entries live in a size-bounded in-process LRU and in Redis (shared across
+    workers), both expiring after `ttl` seconds.
+    """
+
+    KEY_PREFIX = "qemb"
+
+    def __init__(
+        self,
+        cache_adapter: Optional[CacheAdapter] = None,
+        ttl: Optional[int] = None,
+        max_items: Optional[int] = None
+    ):
+        self.cache = cache_adapter or CacheAdapter()
+        self.ttl = ttl or settings.QUERY_EMBEDDING_CACHE_TTL
+        self.local = LocalLRUCache(
+            max_items=max_items or settings.QUERY_EMBEDDING_CACHE_MAX_ITEMS,
+            max_bytes=settings.LOCAL_EMBEDDING_CACHE_MAX_BYTES,
+            ttl=self.ttl
+        )
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Collapse whitespace so trivially different spellings share an entry."""
+        return " ".join(query.split())
+
+    def get(self, query: str) -> Optional[List[float]]:
+        """Return the cached embedding for `query`, or None."""
+        key = self.normalize(query)
+        embedding = self.local.get(key)
+        if embedding is None:
+            embedding = self.cache.get_embedding(key, prefix=self.KEY_PREFIX, local=False)
+            if embedding is None:
+                logger.debug(f"Query Embedding Cache: MISS for query: '{query[:30]}...'")
+                return None
+            self.local.set(key, embedding)
+        logger.debug(f"Query Embedding Cache: HIT for query: '{query[:30]}...'")
+        return embedding.tolist()
+
+    def set(self, query: str, embedding: List[float]) -> List[float]:
+        """
+        Store the embedding for `query` in both tiers and return it as stored.
+
+        With a lossy encoding (e.g. float16) the stored vector differs from the
+        provider's, so callers should use the returned one: the first recall of
+        a query then searches with the same vector as every later cache hit.
+        """
+        key = self.normalize(query)
+        vector = decode_embedding(encode_embedding(embedding, self.cache.embedding_encoding))
+        vector.flags.writeable = False
+        self.local.set(key, vector)
+        self.cache.set_embedding(key, embedding, ttl=self.ttl, prefix=self.KEY_PREFIX, local=False)
+        return vector.tolist()
+
+    def stats(self) -> dict:
+        return self.local.stats()
@@ -0,0 +1,105 @@
+import math
+import struct
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+import numpy as np
+
+from src.models.memory_result import MemoryResult
+
+# Cached recall results are stored column by column:
+#
+#   header   MAGIC | fresh_until (f64) | count (u32)
+#   numeric  score[n] (f64) | confidence[n] (f64) | created_at[n] (f64, epoch seconds)
+#            | created_at_kind[n] (u8: 0 none, 1 naive, 2 utc) | path_count[n] (u32)
+#   strings  lengths[5n] (u32, in characters) for the id, content, layer,
+#            provenance and paths_found columns, then one UTF-8 block holding
+#            every string back to back
+#
+# paths_found is stored as one string per result joined with PATH_SEPARATOR;
+# path_count tells an empty list apart from a list holding one empty path.
+# Lengths are counted in characters so the block is decoded once and sliced.
+MAGIC = b"MRC2"
+_HEADER = struct.Struct("<4sdI")
+PATH_SEPARATOR = "\x1f"
+_STRING_FIELDS = ("id", "content", "layer", "provenance")
+
+_NO_TIMESTAMP, _NAIVE, _UTC = 0, 1, 2
+
+def encode_results(results: List[MemoryResult], fresh_until: float = 0.0) -> bytes:
+    """Pack a list of MemoryResult objects into the columnar cache format."""
+    count = len(results)
+    created_at = np.full(count, math.nan, dtype="<f8")
+    created_kind = np.zeros(count, dtype=np.uint8)
+    for i, result in enumerate(results):
+        if result.created_at is not None:
+            created_at[i] = result.created_at.timestamp()
+            created_kind[i] = _NAIVE if result.created_at.tzinfo is None else _UTC
+
+    parts = [
+        _HEADER.pack(MAGIC, fresh_until, count),
+        np.fromiter((r.score for r in results), dtype="<f8", count=count).tobytes(),
+        np.fromiter((r.confidence for r in results), dtype="<f8", count=count).tobytes(),
+        created_at.tobytes(),
+        created_kind.tobytes(),
+        np.fromiter((len(r.paths_found) for r in results), dtype="<u4", count=count).tobytes()
+    ]
+    strings = [getattr(r, field) for field in _STRING_FIELDS for r in results]
+    strings += [PATH_SEPARATOR.join(r.paths_found) for r in results]
+    parts.append(np.fromiter((len(value) for value in strings), dtype="<u4", count=len(strings)).tobytes())
+    parts.append("".join(strings).encode("utf-8"))
+    return b"".join(parts)
+
+def decode_results(data: bytes) -> Optional[Tuple[List[MemoryResult], float]]:
+    """
+    Unpack cached results into (results, fresh_until), or None if `data` is not
+    in this format. The data was validated when it was cached, so models are
+    built with model_construct and skip re-validation.
+    """
+    if not data.startswith(MAGIC):
+        return None
+
+    view = memoryview(data)
+    _, fresh_until, count = _HEADER.unpack_from(view)
+    offset = _HEADER.size
+
+    scores = np.frombuffer(view, dtype="<f8", count=count, offset=offset)
+    offset += scores.nbytes
+    confidences = np.frombuffer(view, dtype="<f8", count=count, offset=offset)
+    offset += confidences.nbytes
+    created_at = np.frombuffer(view, dtype="<f8", count=count, offset=offset)
+    offset += created_at.nbytes
+    created_kind = np.frombuffer(view, dtype=np.uint8, count=count, offset=offset)
+    offset += created_kind.nbytes
+    path_counts = np.frombuffer(view, dtype="<u4", count=count, offset=offset)
+    offset += path_counts.nbytes
+
+    lengths = np.frombuffer(view, dtype="<u4", count=count * (len(_STRING_FIELDS) + 1), offset=offset)
+    offset += lengths.nbytes
+    block = str(view[offset:], "utf-8")
+    bounds = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))).tolist()
+    strings = [block[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+    ids, contents, layers, provenances, paths = (strings[i * count:(i + 1) * count] for i in range(5))
+
+    results = []
+    score_list, confidence_list = scores.tolist(), confidences.tolist()
+    created_list, kind_list = created_at.tolist(), created_kind.tolist()
+    path_count_list = path_counts.tolist()
+    for i in range(count):
+        kind = kind_list[i]
+        if kind == _NO_TIMESTAMP:
+            timestamp = None
+        elif kind == _NAIVE:
+            timestamp = datetime.fromtimestamp(created_list[i])
+        else:
+            timestamp = datetime.fromtimestamp(created_list[i], tz=timezone.utc)
+        results.append(MemoryResult.model_construct(
+            id=ids[i],
+            content=contents[i],
+            score=score_list[i],
+            layer=layers[i],
+            paths_found=paths[i].split(PATH_SEPARATOR) if path_count_list[i] else [],
+            confidence=confidence_list[i],
+            provenance=provenances[i],
+            created_at=timestamp
+        ))
+    return results, fresh_until
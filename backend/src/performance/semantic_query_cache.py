@@ -0,0 +1,167 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import numpy as np
+from loguru import logger
+
+from src.config.environment import settings
+from src.models.memory_result import MemoryResult
+
+class _AgentTable:
+    """
+    Ring buffer of recent normalized query embeddings and their results for one agent.
+    The matrix starts small and doubles up to `capacity`, so agents with a
+    handful of queries don't each hold a full capacity x dim allocation.
+    """
+
+    INITIAL_ROWS = 8
+
+    def __init__(self, capacity: int, dim: int, generation: int):
+        self.generation = generation
+        self.capacity = capacity
+        self.matrix = np.zeros((min(capacity, self.INITIAL_ROWS), dim), dtype=np.float32)
+        self.entries: List[Optional[Dict[str, Any]]] = [None] * len(self.matrix)
+        self.count = 0
+        self.next = 0
+
+    def add(self, vector: np.ndarray, entry: Dict[str, Any]):
+        rows = len(self.matrix)
+        if self.count == rows and rows < self.capacity:
+            # Full but below capacity: nothing has wrapped yet, so grow in place
+            grown = np.zeros((min(self.capacity, rows * 2), self.matrix.shape[1]), dtype=np.float32)
+            grown[:rows] = self.matrix
+            self.matrix = grown
+            self.entries.extend([None] * (len(grown) - rows))
+        self.matrix[self.next] = vector
+        self.entries[self.next] = entry
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+class SemanticQueryCache:
+    """
+    Approximate recall cache keyed by query embedding proximity.
+
+    Keeps the embeddings of recent queries per agent in a small in-memory
+    matrix and returns the cached results of the most similar one when its
+    cosine similarity reaches `threshold`, so paraphrased queries skip
+    retrieval entirely. Tables are tied to the agent's QueryCache generation
+    and are dropped as soon as a write advances it.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_entries_per_agent: Optional[int] = None,
+        max_agents: Optional[int] = None,
+        ttl: Optional[int] = None
+    ):
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.max_entries_per_agent = max_entries_per_agent or settings.SEMANTIC_CACHE_MAX_ENTRIES_PER_AGENT
+        self.max_agents = max_agents or settings.SEMANTIC_CACHE_MAX_AGENTS
+        self.ttl = ttl or settings.QUERY_CACHE_TTL
+        self._tables: "OrderedDict[str, _AgentTable]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    @staticmethod
+    def _filter_key(metadata_filter: Optional[Dict[str, Any]], diversify: bool) -> str:
+        return json.dumps({"filter": metadata_filter or {}, "diversify": diversify}, sort_keys=True)
+
+    def _table(self, agent_id: str, generation: int) -> Optional[_AgentTable]:
+        table = self._tables.get(agent_id)
+        if table is None:
+            return None
+        if table.generation < generation:
+            # The agent wrote new memories since these results were cached
+            del self._tables[agent_id]
+            return None
+        if table.generation > generation:
+            # The caller read an older generation (e.g. a recall that started
+            # before a write); the table is already newer, so leave it alone
+            return None
+        self._tables.move_to_end(agent_id)
+        return table
+
+    def lookup(
+        self,
+        agent_id: str,
+        query_embedding: List[float],
+        limit: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        generation: int = 0,
+        diversify: bool = False
+    ) -> Optional[List[MemoryResult]]:
+        """Return cached results of a sufficiently similar earlier query, or None."""
+        table = self._table(agent_id, generation)
+        query = self._normalize(query_embedding)
+        if table is None or query is None or table.matrix.shape[1] != query.shape[0]:
+            self.misses += 1
+            return None
+
+        similarities = table.matrix[:table.count] @ query
+        now = time.time()
+        filter_key = self._filter_key(metadata_filter, diversify)
+        for i, entry in enumerate(table.entries[:table.count]):
+            # Entries cached with a smaller limit cannot answer this request
+            if entry["expires_at"] <= now or entry["limit"] < limit or entry["filter"] != filter_key:
+                similarities[i] = -np.inf
+
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info(f"Semantic Cache: HIT for agent {agent_id} (similarity {similarities[best]:.3f})")
+        return table.entries[best]["results"][:limit]
+
+    def store(
+        self,
+        agent_id: str,
+        query_embedding: List[float],
+        limit: int,
+        results: List[MemoryResult],
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        generation: int = 0,
+        diversify: bool = False
+    ):
+        """Remember the results of a completed recall under its query embedding."""
+        vector = self._normalize(query_embedding)
+        if vector is None:
+            return
+
+        table = self._table(agent_id, generation)
+        if table is None and agent_id in self._tables:
+            # Results of an older generation must not replace the newer table
+            return
+        if table is None or table.matrix.shape[1] != vector.shape[0]:
+            table = _AgentTable(self.max_entries_per_agent, vector.shape[0], generation)
+            self._tables[agent_id] = table
+            while len(self._tables) > self.max_agents:
+                self._tables.popitem(last=False)
+
+        table.add(vector, {
+            "limit": limit,
+            "filter": self._filter_key(metadata_filter, diversify),
+            "results": list(results),
+            "expires_at": time.time() + self.ttl
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "agents": len(self._tables),
+            "entries": sum(table.count for table in self._tables.values()),
+            "bytes": sum(table.matrix.nbytes for table in self._tables.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
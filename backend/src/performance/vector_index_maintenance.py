@@ -0,0 +1,229 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from src.config.environment import settings
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.adapters.cache_adapter import CacheAdapter
+from src.performance.vector_partitions import (
+    EMBEDDING_PROPERTY,
+    STATE_LABEL,
+    VectorIndexInfo,
+    VectorIndexRouter,
+    size_capacity,
+    versioned_index_name,
+    versioned_label,
+)
+
+LOCK_KEY = "vector_index_maintenance"
+# Renewed after every batch, so it only has to outlive one batch
+LOCK_TTL_SECONDS = 600
+
+class MaintenanceLockLost(Exception):
+    """The maintenance lock expired and may now be held by another worker."""
+
+class VectorIndexMaintainer:
+    """
+    Background task that grows vector indexes before they fill up, without
+    taking semantic search offline.
+
+    Every VECTOR_INDEX_MAINTENANCE_INTERVAL_SECONDS it refreshes the router
+    and checks each serving index's size against its capacity. An index past
+    VECTOR_INDEX_GROWTH_THRESHOLD is rebuilt online:
+
+    1. a replacement with doubled capacity is created on a versioned sublabel,
+    2. existing experiences are labelled for it in batches (new ones are
+       labelled at ingest), with progress recorded on the VectorIndexState node,
+    3. the state node is switched to the replacement in one write, and
+    4. the old index is dropped once every worker has had time to follow.
+
+    Only one worker maintains at a time, guarded by a Redis lock that is
+    renewed after every batch; without Redis maintenance is skipped.
+    """
+
+    def __init__(
+        self,
+        adapter: AsyncGraphDBAdapter,
+        router: VectorIndexRouter,
+        cache_adapter: Optional[CacheAdapter] = None,
+        interval: Optional[float] = None,
+        threshold: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        retire_grace: Optional[float] = None
+    ):
+        self.adapter = adapter
+        self.router = router
+        self.cache_adapter = cache_adapter
+        self.interval = interval or settings.VECTOR_INDEX_MAINTENANCE_INTERVAL_SECONDS
+        self.threshold = threshold or settings.VECTOR_INDEX_GROWTH_THRESHOLD
+        self.batch_size = batch_size or settings.VECTOR_INDEX_REBUILD_BATCH
+        self.retire_grace = retire_grace or settings.VECTOR_INDEX_RETIRE_GRACE_SECONDS
+        self.rebuilds = 0
+        self.last_run: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock_token: Optional[str] = None
+
+    async def run(self):
+        """Maintain indexes until cancelled."""
+        while True:
+            try:
+                await self.tick()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Vector index maintenance failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def tick(self):
+        """One maintenance pass over every partition."""
+        found = await self.router.refresh(self.adapter)
+        self.last_run = time.time()
+
+        if self.cache_adapter is None or not self.cache_adapter.client:
+            logger.warning("Vector index maintenance skipped: no Redis to coordinate workers")
+            return
+        token = self.cache_adapter.acquire_lock(LOCK_KEY, LOCK_TTL_SECONDS)
+        if token is None:
+            return
+        self._lock_token = token
+        try:
+            states = await self._states()
+            for info in self.router.indexes():
+                self._renew_lock()
+                await self._catch_up(info)
+                if self.router.building(info.partition):
+                    # A previous rebuild was interrupted; finish it
+                    await self.rebuild(info, resume=True)
+                elif info.capacity and info.size >= info.capacity * self.threshold:
+                    await self.rebuild(info)
+            await self._retire(found, states)
+        finally:
+            self._lock_token = None
+            self.cache_adapter.release_lock(LOCK_KEY, token)
+
+    def _renew_lock(self):
+        """
+        Extend the maintenance lock, aborting the pass if another worker may
+        have taken it. A no-op outside `tick` (direct `rebuild` calls).
+        """
+        if self._lock_token is None:
+            return
+        if not self.cache_adapter.extend_lock(LOCK_KEY, self._lock_token, LOCK_TTL_SECONDS):
+            raise MaintenanceLockLost("Vector index maintenance lock expired")
+
+    async def _states(self) -> Dict[str, Dict[str, Any]]:
+        rows = await self.adapter.run_query(f"MATCH (s:{STATE_LABEL}) RETURN s;")
+        return {row["s"]["partition"]: row["s"] for row in rows}
+
+    async def _write_state(self, partition: str, **fields):
+        await self.adapter.run_query(
+            f"MERGE (s:{STATE_LABEL} {{partition: $partition}}) SET s += $fields;",
+            {"partition": partition, "fields": fields}
+        )
+
+    async def _label_batch(self, partition: str, label: str) -> int:
+        """Add `label` to up to batch_size experiences of `partition` that lack it."""
+        result = await self.adapter.run_query(
+            f"MATCH (e:{partition}) WHERE e.{EMBEDDING_PROPERTY} IS NOT NULL AND NOT e:{label} "
+            f"WITH e LIMIT $batch SET e:{label} RETURN count(e) AS labelled;",
+            {"batch": self.batch_size}
+        )
+        return result[0]["labelled"] if result else 0
+
+    async def _catch_up(self, info: VectorIndexInfo):
+        """Label experiences written by workers that had not yet seen a switch."""
+        if info.version == 0:
+            return
+        labelled = await self._label_batch(info.partition, info.label)
+        if labelled:
+            logger.info(f"Labelled {labelled} late experiences for {info.name}")
+
+    async def rebuild(self, info: VectorIndexInfo, resume: bool = False) -> VectorIndexInfo:
+        """
+        Build a replacement for `info` with doubled capacity and switch searches to it.
+        With `resume`, continue the replacement already registered as building.
+        """
+        result = await self.adapter.run_query(
+            f"MATCH (e:{info.partition}) WHERE e.{EMBEDDING_PROPERTY} IS NOT NULL RETURN count(e) AS total;"
+        )
+        total = result[0]["total"] if result else 0
+
+        replacement = self.router.building(info.partition) if resume else None
+        if replacement is None:
+            version = info.version + 1
+            replacement = VectorIndexInfo(
+                name=versioned_index_name(info.partition, version),
+                label=versioned_label(info.partition, version),
+                partition=info.partition,
+                version=version,
+                capacity=max(info.capacity * 2, size_capacity(total))
+            )
+            logger.info(
+                f"Rebuilding vector index {info.name} ({info.size}/{info.capacity}) "
+                f"as {replacement.name} with capacity {replacement.capacity}"
+            )
+            await self.adapter.run_query(
+                f"CREATE VECTOR INDEX {replacement.name} ON :{replacement.label}({EMBEDDING_PROPERTY}) "
+                f'WITH CONFIG {{"dimension": {settings.VECTOR_INDEX_DIMENSION}, "metric": "cos", '
+                f'"capacity": {replacement.capacity}, "scalar_kind": "f32"}};'
+            )
+            await self._write_state(
+                info.partition, serving=info.name, building=replacement.name,
+                labelled=0, total=total, started_at=time.time()
+            )
+            self.router.mark_building(replacement)
+            labelled = 0
+        else:
+            state = (await self._states()).get(info.partition, {})
+            labelled = int(state.get("labelled") or 0)
+            logger.info(f"Resuming rebuild of vector index {info.name} as {replacement.name} from {labelled} vectors")
+
+        while True:
+            batch = await self._label_batch(info.partition, replacement.label)
+            if not batch:
+                break
+            labelled += batch
+            await self._write_state(info.partition, labelled=labelled, total=max(total, labelled))
+            self._renew_lock()
+
+        # Atomic switch: one write for other workers, one dict assignment here
+        await self._write_state(
+            info.partition, serving=replacement.name, building=None,
+            retired=info.name, switched_at=time.time()
+        )
+        self.router.register(replacement)
+        self.rebuilds += 1
+        logger.info(f"Vector index {info.partition} now served by {replacement.name} ({labelled} vectors)")
+        return replacement
+
+    async def _retire(self, found: List[VectorIndexInfo], states: Dict[str, Dict[str, Any]]):
+        """Drop superseded indexes once workers have had the grace period to switch."""
+        for info in found:
+            state = states.get(info.partition)
+            serving = self.router.indexes()
+            if not state or any(s.name == info.name for s in serving) or info.name == state.get("building"):
+                continue
+            if time.time() - (state.get("switched_at") or 0) < self.retire_grace:
+                continue
+            await self.adapter.run_query(f"DROP VECTOR INDEX {info.name};")
+            if info.version > 0:
+                while True:
+                    result = await self.adapter.run_query(
+                        f"MATCH (e:{info.label}) WITH e LIMIT $batch REMOVE e:{info.label} RETURN count(e) AS removed;",
+                        {"batch": self.batch_size}
+                    )
+                    if not result or not result[0]["removed"]:
+                        break
+                    self._renew_lock()
+            logger.info(f"Dropped retired vector index {info.name}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "indexes": [info.model_dump() for info in self.router.indexes()],
+            "rebuilds": self.rebuilds,
+            "last_run": self.last_run,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,161 @@
+import math
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from loguru import logger
+
+from src.config.environment import settings
+
+BASE_LABEL = "Experience"
+EMBEDDING_PROPERTY = "embedding"
+GLOBAL_INDEX = f"idx_{BASE_LABEL}_{EMBEDDING_PROPERTY}"
+# Node recording which index version serves a partition and any rebuild in progress
+STATE_LABEL = "VectorIndexState"
+
+# Version 0 of a partition is indexed on the partition label itself; rebuilt
+# versions are indexed on a versioned sublabel, e.g. ExperienceShard3V2.
+_PHYSICAL_LABEL = re.compile(rf"^({BASE_LABEL}(?:Shard\d+)?)(?:V(\d+))?$")
+
+class VectorIndexInfo(BaseModel):
+    """A vector index serving one version of a partition."""
+    name: str
+    label: str
+    partition: str
+    version: int = 0
+    capacity: int = 0
+    size: int = 0
+
+def partition_label(agent_id: Optional[str], shards: Optional[int] = None) -> Optional[str]:
+    """
+    The sublabel of the partition holding `agent_id`'s experiences, or None
+    when partitioning is disabled. Agents map to shards by a stable hash.
+    """
+    shards = shards or settings.VECTOR_INDEX_SHARDS
+    if shards <= 1 or not agent_id:
+        return None
+    return f"{BASE_LABEL}Shard{zlib.crc32(agent_id.encode('utf-8')) % shards}"
+
+def partition_labels(shards: Optional[int] = None) -> List[str]:
+    """Every partition sublabel for the configured shard count."""
+    shards = shards or settings.VECTOR_INDEX_SHARDS
+    return [f"{BASE_LABEL}Shard{shard}" for shard in range(shards)] if shards > 1 else []
+
+def versioned_label(partition: str, version: int) -> str:
+    return partition if version == 0 else f"{partition}V{version}"
+
+def versioned_index_name(partition: str, version: int) -> str:
+    name = f"idx_{partition}_{EMBEDDING_PROPERTY}"
+    return name if version == 0 else f"{name}_v{version}"
+
+def size_capacity(count: int, headroom: Optional[float] = None, minimum: Optional[int] = None) -> int:
+    """Index capacity for `count` vectors plus headroom, rounded up to a power of two."""
+    headroom = headroom or settings.VECTOR_INDEX_HEADROOM
+    minimum = minimum or settings.VECTOR_INDEX_MIN_CAPACITY
+    target = max(minimum, math.ceil(count * headroom))
+    return 1 << (target - 1).bit_length()
+
+def parse_vector_index_rows(rows: List[Dict[str, Any]]) -> List[VectorIndexInfo]:
+    """Turn `SHOW VECTOR INDEX INFO` rows for Experience partitions into VectorIndexInfo objects."""
+    indexes = []
+    for row in rows:
+        name = row.get("index_name") or row.get("index name")
+        match = _PHYSICAL_LABEL.match(row.get("label") or "")
+        if not name or not match:
+            continue
+        indexes.append(VectorIndexInfo(
+            name=name,
+            label=match.group(0),
+            partition=match.group(1),
+            version=int(match.group(2) or 0),
+            capacity=int(row.get("capacity") or 0),
+            size=int(row.get("size") or 0)
+        ))
+    return indexes
+
+class VectorIndexRouter:
+    """
+    Routes vector searches to the index covering an agent's partition.
+
+    With VECTOR_INDEX_SHARDS > 1 every Experience also carries a shard
+    sublabel (see `labels_for`) and each shard can have its own, much smaller
+    HNSW index. Searches for an agent use its shard's index once it is
+    registered and fall back to the global index otherwise, so partitions can
+    be created while the service is running.
+
+    A partition may have two index versions while it is rebuilt; the serving
+    one is recorded on its VectorIndexState node, and new experiences are
+    labelled for both so the replacement misses nothing.
+    """
+
+    def __init__(self, shards: Optional[int] = None):
+        self.shards = shards or settings.VECTOR_INDEX_SHARDS
+        self._indexes: Dict[str, VectorIndexInfo] = {}
+        self._building: Dict[str, VectorIndexInfo] = {}
+
+    def labels_for(self, agent_id: Optional[str]) -> str:
+        """Label expression for a new Experience node, e.g. `Experience:ExperienceShard3`."""
+        partitions = [BASE_LABEL]
+        label = partition_label(agent_id, self.shards)
+        if label:
+            partitions.append(label)
+
+        labels = list(partitions)
+        for partition in partitions:
+            for info in (self._indexes.get(partition), self._building.get(partition)):
+                if info is not None and info.label not in labels:
+                    labels.append(info.label)
+        return ":".join(labels)
+
+    def index_for(self, agent_id: Optional[str]) -> Tuple[str, bool]:
+        """(index name, whether it is a per-partition index) for searches scoped to `agent_id`."""
+        label = partition_label(agent_id, self.shards)
+        info = self._indexes.get(label) if label else None
+        if info is not None:
+            return info.name, True
+        info = self._indexes.get(BASE_LABEL)
+        return (info.name if info else GLOBAL_INDEX), False
+
+    def register(self, info: VectorIndexInfo):
+        """Serve `info.partition` from `info`, replacing any previous index for it."""
+        self._indexes[info.partition] = info
+        if self._building.get(info.partition, info).name == info.name:
+            self._building.pop(info.partition, None)
+
+    def mark_building(self, info: VectorIndexInfo):
+        """Label new experiences for `info` while it is being built."""
+        self._building[info.partition] = info
+
+    def indexes(self) -> List[VectorIndexInfo]:
+        return list(self._indexes.values())
+
+    def building(self, partition: str) -> Optional[VectorIndexInfo]:
+        return self._building.get(partition)
+
+    async def refresh(self, adapter: Any) -> List[VectorIndexInfo]:
+        """
+        Load the vector indexes that exist in the database and pick the serving
+        and building version of each partition. Returns every index found.
+        """
+        found = parse_vector_index_rows(await adapter.run_query("SHOW VECTOR INDEX INFO;"))
+        states = {
+            row["s"]["partition"]: row["s"]
+            for row in await adapter.run_query(f"MATCH (s:{STATE_LABEL}) RETURN s;")
+        }
+
+        by_partition: Dict[str, Dict[str, VectorIndexInfo]] = {}
+        for info in found:
+            by_partition.setdefault(info.partition, {})[info.name] = info
+
+        indexes, building = {}, {}
+        for partition, versions in by_partition.items():
+            state = states.get(partition, {})
+            serving = versions.get(state.get("serving")) or min(versions.values(), key=lambda i: i.version)
+            indexes[partition] = serving
+            if state.get("building") in versions and state["building"] != serving.name:
+                building[partition] = versions[state["building"]]
+
+        # Swap whole dicts so concurrent readers never see a partial update
+        self._indexes, self._building = indexes, building
+        logger.debug(f"Vector index router serving {sorted(i.name for i in indexes.values())}")
+        return found
@@ -1,4 +1,6 @@
+from datetime import datetime, timezone
 from typing import List, Optional, Dict
+import numpy as np
 from src.models.memory_result import MemoryResult
 from src.models.memory_request import ReasoningType
 from src.ranking.relevance_ranker import RelevanceRanker
@@ -137,3 +139,75 @@ class FusionRanker:
         scored_memories.sort(key=lambda x: x.score, reverse=True)
         
         return scored_memories
+
+    def rank_top_k(
+        self,
+        memories: List[MemoryResult],
+        k: int,
+        query: Optional[str] = None,
+        reasoning_type: ReasoningType = ReasoningType.FAST,
+        weights: Optional[Dict[str, float]] = None,
+        rrf_k: int = 60
+    ) -> List[MemoryResult]:
+        """
+        Vectorized equivalent of `rank(...)[:k]`.
+        
+        Score, confidence, timestamp and path boost columns are gathered once,
+        the fused score is computed in NumPy, the top `k` are selected with a
+        partition, and only those survivors are copied with their new score.
+        Ties keep their input order, as in `rank`.
+        
+        Args:
+            memories: List of MemoryResult objects from all paths.
+            k: Number of results to return.
+            query: The original text query (optional, for future query-specific logic).
+            reasoning_type: The type of reasoning to apply for weighting.
+            weights: Optional manual weighting overrides.
+            rrf_k: RRF constant for the path boost.
+            
+        Returns:
+            The `k` best MemoryResult objects, sorted by their fused score.
+        """
+        if not memories or k <= 0:
+            return []
+        
+        profile = weights if weights else self.profiles.get(reasoning_type, self.profiles[ReasoningType.FAST])
+        
+        count = len(memories)
+        relevance = np.empty(count)
+        confidence = np.empty(count)
+        created_at = np.full(count, np.nan)
+        # Keyed by id like rank(), so duplicate ids share the last one's boost
+        boosts = self._apply_rrf_logic(memories, rrf_k)
+        path_boost = np.empty(count)
+        for i, memory in enumerate(memories):
+            relevance[i] = memory.score
+            confidence[i] = memory.confidence
+            path_boost[i] = boosts[memory.id]
+            if memory.created_at:
+                timestamp = memory.created_at
+                if timestamp.tzinfo is None:
+                    timestamp = timestamp.replace(tzinfo=timezone.utc)
+                created_at[i] = timestamp.timestamp()
+        
+        # Same weighted sum and clamping as rank()
+        fused = np.clip(
+            profile.get("relevance", 0.0) * relevance
+            + profile.get("recency", 0.0) * self.recency_ranker.score_array(created_at)
+            + profile.get("confidence", 0.0) * confidence
+            + profile.get("path_boost", 0.0) * path_boost,
+            0.0, 1.0
+        )
+        
+        if k < count:
+            # Everything above the k-th best score, then ties at it in input
+            # order, so ties resolve exactly as rank()'s stable sort does
+            kth = np.partition(fused, count - k)[count - k]
+            above = np.flatnonzero(fused > kth)
+            tied = np.flatnonzero(fused == kth)[:k - len(above)]
+            top = np.sort(np.concatenate((above, tied)))
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-fused[top], kind="stable")]
+        
+        return [memories[i].model_copy(update={"score": float(fused[i])}) for i in top.tolist()]
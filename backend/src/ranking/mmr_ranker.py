@@ -0,0 +1,72 @@
+from typing import Dict, List, Optional
+import numpy as np
+from src.models.memory_result import MemoryResult
+
+class MMRRanker:
+    """
+    Re-ranks memories with Maximal Marginal Relevance so near-duplicates
+    (e.g. repeated transcripts of the same exchange) don't crowd out the top-k.
+    """
+
+    def __init__(self, lambda_mult: float = 0.7):
+        """
+        Initializes the MMRRanker.
+
+        Args:
+            lambda_mult: Trade-off between relevance (1.0) and diversity (0.0).
+        """
+        self.lambda_mult = lambda_mult
+
+    def rerank(
+        self,
+        memories: List[MemoryResult],
+        embeddings: Dict[str, List[float]],
+        k: int,
+        lambda_mult: Optional[float] = None
+    ) -> List[MemoryResult]:
+        """
+        Greedily selects `k` memories maximizing
+        lambda * score - (1 - lambda) * max cosine similarity to those already selected.
+
+        Args:
+            memories: Candidates, typically the output of FusionRanker.
+            embeddings: Memory ID to embedding. Memories without one are never
+                        penalized as redundant.
+            k: Number of memories to return.
+            lambda_mult: Optional override of the relevance/diversity trade-off.
+
+        Returns:
+            The selected memories in selection order.
+        """
+        if not memories or k <= 0:
+            return []
+        lam = self.lambda_mult if lambda_mult is None else lambda_mult
+
+        dim = next((len(vector) for vector in embeddings.values() if vector is not None), 0)
+        if dim == 0:
+            return memories[:k]
+
+        # Candidate matrix of unit vectors; missing embeddings stay zero
+        matrix = np.zeros((len(memories), dim), dtype=np.float32)
+        for i, memory in enumerate(memories):
+            vector = embeddings.get(memory.id)
+            if vector is not None and len(vector) == dim:
+                matrix[i] = vector
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+        relevance = np.array([memory.score for memory in memories], dtype=np.float32)
+        max_similarity = np.zeros(len(memories), dtype=np.float32)
+        available = np.ones(len(memories), dtype=bool)
+        selected = []
+
+        for _ in range(min(k, len(memories))):
+            mmr = lam * relevance - (1.0 - lam) * max_similarity
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            available[best] = False
+            # Update each candidate's redundancy against the new selection
+            np.maximum(max_similarity, matrix @ matrix[best], out=max_similarity)
+
+        return [memories[i] for i in selected]
@@ -1,6 +1,7 @@
 import math
 from datetime import datetime, timezone
 from typing import List, Optional
+import numpy as np
 from src.models.memory_result import MemoryResult
 
 class RecencyRanker:
@@ -57,3 +58,12 @@ class RecencyRanker:
             
         return scores
 
+    def score_array(self, created_at: np.ndarray, reference_time: Optional[datetime] = None) -> np.ndarray:
+        """
+        Vectorized form of `score` over UTC epoch seconds.
+        NaN entries (no timestamp) get the same neutral 0.5 score.
+        """
+        if not reference_time:
+            reference_time = datetime.now(timezone.utc)
+        hours_diff = np.maximum(0.0, (reference_time.timestamp() - created_at) / 3600.0)
+        return np.where(np.isnan(created_at), 0.5, np.exp(-self.decay_rate * hours_diff))
@@ -0,0 +1,299 @@
+import asyncio
+import heapq
+import math
+import re
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+
+from src.config.environment import settings
+from src.models.memory_result import MemoryResult
+from src.models.nodes import Entity, Experience
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+class _Partition:
+    """Inverted index over one agent's Experience contents and mentioned Entity names."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.doc_lengths: List[int] = []
+        self.docs: List[Dict[str, Any]] = []
+        self.doc_ids: Dict[str, int] = {}
+        self.total_length = 0
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, doc_id: str, text: str, payload: Dict[str, Any]):
+        if doc_id in self.doc_ids:
+            return
+        tokens = tokenize(text)
+        index = len(self.docs)
+        self.doc_ids[doc_id] = index
+        self.docs.append(payload)
+        self.doc_lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        for term, frequency in Counter(tokens).items():
+            self.postings[term][index] = frequency
+
+    def search(self, terms: List[str], top_k: int, k1: float, b: float) -> List[tuple]:
+        count = len(self.docs)
+        if not count:
+            return []
+        avg_length = self.total_length / count or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for index, frequency in postings.items():
+                norm = k1 * (1 - b + b * self.doc_lengths[index] / avg_length)
+                scores[index] += idf * frequency * (k1 + 1) / (frequency + norm)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+class BM25Index:
+    """
+    In-process BM25 keyword index, partitioned by agent.
+
+    Partitions are built in the background, page by page, the first time an
+    agent is searched and rebuilt after `ttl` seconds (picking up writes made
+    by other workers); searches never wait for a build. Until an agent's
+    partition is ready `search` returns None and callers fall back to
+    full-text search, and a stale partition keeps serving while its
+    replacement is built. Between rebuilds the ingest path adds new
+    experiences and entities incrementally.
+
+    Agents with more than `max_documents` documents are not indexed and stay
+    on full-text search. Least recently used partitions are evicted beyond
+    `max_agents`.
+
+    Raw BM25 scores are unbounded, so results carry
+    `score / (score + score_saturation)`: a value in [0, 1) that depends on
+    the match alone, not on the other hits of the same query.
+    """
+
+    def __init__(
+        self,
+        adapter: AsyncGraphDBAdapter,
+        ttl: Optional[float] = None,
+        max_agents: Optional[int] = None,
+        max_documents: Optional[int] = None,
+        page_size: Optional[int] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        score_saturation: Optional[float] = None
+    ):
+        self.adapter = adapter
+        self.ttl = ttl or settings.BM25_INDEX_TTL_SECONDS
+        self.max_agents = max_agents or settings.BM25_INDEX_MAX_AGENTS
+        self.max_documents = max_documents or settings.BM25_INDEX_MAX_DOCUMENTS
+        self.page_size = page_size or settings.BM25_INDEX_PAGE_SIZE
+        self.k1 = k1
+        self.b = b
+        self.score_saturation = score_saturation or settings.BM25_SCORE_SATURATION
+        self._partitions: "OrderedDict[str, _Partition]" = OrderedDict()
+        self._builds: Dict[str, asyncio.Task] = {}
+        # Rows written while a build is running, applied to its result
+        self._pending: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        # Agents found too large to index -> when that was last checked
+        self._oversized: Dict[str, float] = {}
+        self.builds = 0
+        self.fallbacks = 0
+
+    def _partition(self, agent_id: str) -> Optional[_Partition]:
+        """The agent's partition if it is ready, scheduling a build when it is missing or stale."""
+        partition = self._partitions.get(agent_id)
+        now = time.monotonic()
+        if partition is None or now - partition.loaded_at >= self.ttl:
+            checked = self._oversized.get(agent_id)
+            if checked is None or now - checked >= self.ttl:
+                self._schedule_build(agent_id)
+        if partition is not None:
+            self._partitions.move_to_end(agent_id)
+        return partition
+
+    def _schedule_build(self, agent_id: str):
+        if agent_id in self._builds:
+            return
+        self._pending[agent_id] = []
+        task = asyncio.create_task(self._build(agent_id))
+        self._builds[agent_id] = task
+        task.add_done_callback(lambda _: self._builds.pop(agent_id, None))
+
+    async def _build(self, agent_id: str):
+        start = time.perf_counter()
+        try:
+            partition = await self._load(agent_id)
+        except asyncio.CancelledError:
+            self._pending.pop(agent_id, None)
+            raise
+        except Exception as e:
+            self._pending.pop(agent_id, None)
+            logger.error(f"BM25 index build failed for agent {agent_id}: {e}")
+            return
+
+        pending = self._pending.pop(agent_id, [])
+        if partition is None:
+            self._oversized[agent_id] = time.monotonic()
+            self._partitions.pop(agent_id, None)
+            logger.info(
+                f"BM25 index skipped agent {agent_id}: more than {self.max_documents} documents, "
+                "keyword search stays on full-text search"
+            )
+            return
+        for kind, row in pending:
+            self._add_row(partition, kind, row)
+
+        self._oversized.pop(agent_id, None)
+        self._partitions[agent_id] = partition
+        self._partitions.move_to_end(agent_id)
+        while len(self._partitions) > self.max_agents:
+            self._partitions.popitem(last=False)
+        self.builds += 1
+        logger.debug(
+            f"BM25 index built {len(partition)} documents for agent {agent_id} "
+            f"in {(time.perf_counter() - start) * 1000:.2f}ms"
+        )
+
+    async def _load(self, agent_id: str) -> Optional[_Partition]:
+        """Read the agent's corpus in pages keyed by id; None once it exceeds max_documents."""
+        partition = _Partition()
+        queries = [
+            ("experience",
+             "MATCH (e:Experience {agent_id: $agent_id}) WHERE e.id > $after "
+             "RETURN e.id AS id, e.content AS content, e.memory_type AS memory_type, "
+             "e.confidence AS confidence, e.session_id AS session_id, e.created_at AS created_at "
+             "ORDER BY e.id LIMIT $page"),
+            ("entity",
+             "MATCH (:Experience {agent_id: $agent_id})-[:MENTIONS]->(n:Entity) "
+             "WITH DISTINCT n WHERE n.id > $after "
+             "RETURN n.id AS id, n.name AS name, n.type AS type, n.importance_score AS importance_score "
+             "ORDER BY n.id LIMIT $page"),
+        ]
+        for kind, cypher in queries:
+            after = ""
+            while True:
+                rows = await self.adapter.run_query(
+                    cypher, {"agent_id": agent_id, "after": after, "page": self.page_size}
+                )
+                for row in rows:
+                    self._add_row(partition, kind, row)
+                if len(partition) > self.max_documents:
+                    return None
+                if len(rows) < self.page_size:
+                    break
+                after = rows[-1]["id"]
+        return partition
+
+    def _add_row(self, partition: _Partition, kind: str, row: Dict[str, Any]):
+        if kind == "experience":
+            self._add_experience_row(partition, row)
+        else:
+            self._add_entity_row(partition, row)
+
+    @staticmethod
+    def _add_experience_row(partition: _Partition, row: Dict[str, Any]):
+        created_at = row.get("created_at")
+        if hasattr(created_at, "to_native"):
+            created_at = created_at.to_native()
+        partition.add(row["id"], row.get("content") or "", {
+            "id": row["id"],
+            "content": row.get("content") or "",
+            "layer": row.get("memory_type") or "episodic",
+            "confidence": float(row.get("confidence") or 0.0),
+            "provenance": row.get("session_id") or "unknown",
+            "created_at": created_at
+        })
+
+    @staticmethod
+    def _add_entity_row(partition: _Partition, row: Dict[str, Any]):
+        name = row.get("name") or ""
+        doc_id = str(row.get("id") or name or "unknown")
+        partition.add(f"entity:{doc_id}", name, {
+            "id": doc_id,
+            "content": f"Entity: {name} (Type: {row.get('type') or 'Unknown'})",
+            "layer": "semantic",
+            "confidence": float(row.get("importance_score") or 0.5),
+            "provenance": "graph_entity"
+        })
+
+    def _apply(self, agent_id: str, rows: List[Tuple[str, Dict[str, Any]]]):
+        """Add rows to the agent's partition and to any build in progress."""
+        if agent_id in self._pending:
+            self._pending[agent_id].extend(rows)
+        partition = self._partitions.get(agent_id)
+        if partition is None:
+            return
+        for kind, row in rows:
+            self._add_row(partition, kind, row)
+        if len(partition) > self.max_documents:
+            # Grew past the bound; serve this agent from full-text search again
+            self._partitions.pop(agent_id, None)
+            self._oversized[agent_id] = time.monotonic()
+
+    def add_experience(self, experience: Experience, entities: Iterable[Entity] = ()):
+        """
+        Index a committed experience and the entities it mentions.
+        Only partitions in memory or being built are updated; others are built on first search.
+        """
+        rows = [("experience", {
+            "id": experience.id,
+            "content": experience.content,
+            "memory_type": experience.memory_type.value if hasattr(experience.memory_type, "value") else experience.memory_type,
+            "confidence": experience.confidence,
+            "session_id": experience.session_id,
+            "created_at": experience.created_at
+        })]
+        rows += [("entity", entity.model_dump()) for entity in entities]
+        self._apply(experience.agent_id, rows)
+
+    def add_entities(self, agent_id: str, entities: Iterable[Entity]):
+        """Index entities newly mentioned by one of the agent's experiences."""
+        self._apply(agent_id, [("entity", entity.model_dump()) for entity in entities])
+
+    async def search(self, query: str, agent_id: str, top_k: int = 5) -> Optional[List[MemoryResult]]:
+        """
+        Return the agent's `top_k` best BM25 matches for `query`, or None when
+        the agent's partition is not ready and the caller should use
+        full-text search.
+        """
+        terms = tokenize(query)
+        if not terms or top_k <= 0:
+            return []
+        partition = self._partition(agent_id)
+        if partition is None:
+            self.fallbacks += 1
+            return None
+        hits = partition.search(terms, top_k, self.k1, self.b)
+        return [
+            MemoryResult(score=score / (score + self.score_saturation), paths_found=[], **partition.docs[index])
+            for index, score in hits
+        ]
+
+    async def close(self):
+        """Cancel builds in progress."""
+        for task in list(self._builds.values()):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "agents": len(self._partitions),
+            "documents": sum(len(partition) for partition in self._partitions.values()),
+            "building": len(self._builds),
+            "oversized_agents": len(self._oversized),
+            "builds": self.builds,
+            "fallbacks": self.fallbacks
+        }
@@ -1,26 +1,48 @@
 from typing import List, Optional
 from loguru import logger
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 from src.models.memory_result import MemoryResult
 from src.retrieval.utils import format_memory_result
+from src.retrieval.bm25_index import BM25Index
+from src.retrieval.projections import ENTITY_PROPERTIES, memory_return, projection
 
 class ContextRetriever:
     """
-    Retriever for performing keyword-based full-text search (FTS) against Memgraph.
+    Retriever for keyword-based search over experience content and entity names.
+    Agent-scoped searches are served by the in-process BM25 index when one is
+    configured and the agent's partition is built; otherwise Memgraph
+    full-text search (FTS) is used. FTS queries return only the properties
+    results are built from.
     """
     
-    def __init__(self, adapter: GraphDBAdapter):
+    def __init__(
+        self,
+        adapter: AsyncGraphDBAdapter,
+        keyword_index: Optional[BM25Index] = None,
+        include_embedding: bool = False
+    ):
         self.adapter = adapter
+        self.keyword_index = keyword_index
+        self.include_embedding = include_embedding
 
-    def search(
+    async def search(
         self, 
         keyword: str, 
         top_k: int = 5,
         agent_id: Optional[str] = None
     ) -> List[MemoryResult]:
         """
-        Perform a full-text search for keywords in experience content and entity names.
+        Perform a keyword search in experience content and entity names.
         """
+        if self.keyword_index and agent_id:
+            try:
+                results = await self.keyword_index.search(keyword, agent_id, top_k)
+                # None while the agent's partition is still being built
+                if results is not None:
+                    return results
+            except Exception as e:
+                logger.error(f"Error in BM25 search, falling back to FTS: {e}")
+        
         memory_results = []
         exp_index = "idx_Experience_content"
         ent_index = "idx_Entity_name"
@@ -39,10 +61,10 @@ class ContextRetriever:
             experience_cypher += "WHERE node.agent_id = $agent_id "
             exp_params["agent_id"] = agent_id
             
-        experience_cypher += "RETURN node"
+        experience_cypher += f"RETURN {memory_return('node', self.include_embedding)}"
         
         try:
-            exp_results = self.adapter.run_query(experience_cypher, exp_params)
+            exp_results = await self.adapter.run_query(experience_cypher, exp_params)
             for res in exp_results:
                 memory_results.append(
                     format_memory_result(
@@ -58,11 +80,11 @@ class ContextRetriever:
         entity_cypher = (
             f"CALL text_search.search_all('{ent_index}', $keyword) "
             "YIELD node "
-            "RETURN node"
+            f"RETURN {projection('node', ENTITY_PROPERTIES)} AS node"
         )
         
         try:
-            ent_results = self.adapter.run_query(entity_cypher, {"keyword": keyword})
+            ent_results = await self.adapter.run_query(entity_cypher, {"keyword": keyword})
             for res in ent_results:
                 node = res["node"]
                 # Convert entity to a memory-like result
@@ -1,9 +1,12 @@
 from loguru import logger
 from typing import List, Optional
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 from src.core.graph_engine import GraphEngine
+from src.performance.adjacency_cache import AdjacencyCache
+from src.config.environment import settings
 from src.models.memory_result import MemoryResult
 from src.retrieval.utils import format_memory_result
+from src.retrieval.projections import MEMORY_PROPERTIES, EMBEDDING_PROPERTY
 
 class GraphRetriever:
     """
@@ -11,11 +14,17 @@ class GraphRetriever:
     linked to entities mentioned in a query.
     """
     
-    def __init__(self, adapter: GraphDBAdapter):
+    def __init__(
+        self,
+        adapter: AsyncGraphDBAdapter,
+        adjacency_cache: Optional[AdjacencyCache] = None,
+        include_embedding: bool = False
+    ):
         self.adapter = adapter
-        self.graph_engine = GraphEngine(adapter)
+        self.graph_engine = GraphEngine(adapter, adjacency_cache=adjacency_cache)
+        self.properties = MEMORY_PROPERTIES + ((EMBEDDING_PROPERTY,) if include_embedding else ())
 
-    def retrieve_by_entities(
+    async def retrieve_by_entities(
         self, 
         entity_names: List[str], 
         k: int = 2, 
@@ -39,8 +48,8 @@ class GraphRetriever:
             return []
 
         # 1. Find the internal IDs for these entities
-        entity_query = "MATCH (e:Entity) WHERE e.name IN $names RETURN e.id as id"
-        entity_results = self.adapter.run_query(entity_query, {"names": entity_names})
+        entity_query = "MATCH (e:Entity) WHERE e.name IN $names RETURN e.id as id, id(e) AS nid"
+        entity_results = await self.adapter.run_query(entity_query, {"names": entity_names})
         start_node_ids = [res["id"] for res in entity_results]
 
         if not start_node_ids:
@@ -48,51 +57,42 @@ class GraphRetriever:
             return []
 
         # 2. Perform AKHLT traversal
-        traversal_results = self.graph_engine.adaptive_k_hop_traversal(
+        traversal_results = await self.graph_engine.adaptive_k_hop_traversal(
             start_node_ids=start_node_ids,
             k=k,
-            fan_out_limit=fan_out_limit
+            fan_out_limit=fan_out_limit,
+            target_count=settings.DEFAULT_RECALL_BREADTH,
+            target_properties={"agent_id": agent_id} if agent_id else None,
+            start_internal_ids=[res["nid"] for res in entity_results],
+            # Only the agent's Experiences are hydrated, and only the
+            # properties a MemoryResult needs
+            targets_only=True,
+            properties=self.properties
         )
 
-        # 3. Filter for Experience nodes and format into MemoryResult
+        # 3. Format the reached memories into MemoryResult
         memory_results = []
         seen_ids = set()
 
         for res in traversal_results:
             node = res["neighbor"]
-            # We only want to return memories (Experiences), not other entities
-            # unless specifically requested. Usually, graph traversal finds 
-            # related experiences.
+            node_id = node.get("id")
+            if node_id in seen_ids:
+                continue
             
-            # Check labels - Neo4j/Memgraph driver might return labels in different ways 
-            # depending on how the query was structured. If we used MATCH (n), 
-            # 'neighbor' might be a Node object with .labels property.
+            seen_ids.add(node_id)
             
-            # Since run_query returns record.data(), 'neighbor' is a dict of properties.
-            # We might need to adjust the query to return labels if they aren't implicit.
+            # Format path information
+            # res["r"] is the list of relationships in the path
+            path_desc = " -> ".join([rel.get("rel_type", "RELATED") for rel in res.get("r", [])])
             
-            # For now, we assume if it has 'content' and 'agent_id', it's an Experience.
-            if "content" in node and "agent_id" in node:
-                if agent_id and node["agent_id"] != agent_id:
-                    continue
-                
-                node_id = node.get("id")
-                if node_id in seen_ids:
-                    continue
-                
-                seen_ids.add(node_id)
-                
-                # Format path information
-                # res["r"] is the list of relationships in the path
-                path_desc = " -> ".join([rel.get("rel_type", "RELATED") for rel in res.get("r", [])])
-                
-                mem_res = format_memory_result(
-                    record={"n": node},
-                    score=res.get("path_strength", 0.5),
-                    layer="graph"
-                )
-                mem_res.paths_found = [path_desc]
-                memory_results.append(mem_res)
+            mem_res = format_memory_result(
+                record={"n": node},
+                score=res.get("path_strength", 0.5),
+                layer="graph"
+            )
+            mem_res.paths_found = [path_desc]
+            memory_results.append(mem_res)
 
         return memory_results
 
@@ -0,0 +1,151 @@
+from loguru import logger
+from typing import List, Optional
+import numpy as np
+
+from src.config.environment import settings
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.core.graph_engine import GraphEngine
+from src.models.memory_result import MemoryResult
+from src.retrieval.utils import format_memory_result
+from src.retrieval.projections import MEMORY_PROPERTIES
+
+def personalized_pagerank(
+    num_nodes: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    seeds: List[int],
+    alpha: float = 0.15,
+    max_iterations: int = 50,
+    tolerance: float = 1e-6
+) -> np.ndarray:
+    """
+    Random walk with restart over an undirected weighted edge list.
+
+    The walk moves to a neighbor with probability proportional to the edge
+    weight and jumps back to a uniformly chosen seed with probability
+    `alpha` (and from nodes without edges). Each power-iteration step is a
+    sparse matrix-vector product computed with np.bincount.
+
+    Edges with a non-positive weight cannot be walked; a node whose edges
+    all have weight 0 is treated as dangling.
+
+    Returns the stationary probability of every node.
+    """
+    restart = np.zeros(num_nodes, dtype=np.float64)
+    restart[seeds] = 1.0 / len(seeds)
+    walkable = np.asarray(weights, dtype=np.float64) > 0
+    sources = np.asarray(sources)[walkable]
+    targets = np.asarray(targets)[walkable]
+    weights = np.asarray(weights, dtype=np.float64)[walkable]
+    if not len(sources):
+        return restart
+
+    # Each undirected edge can be walked both ways
+    walk_from = np.concatenate([sources, targets])
+    walk_to = np.concatenate([targets, sources])
+    walk_weights = np.concatenate([weights, weights])
+    out_weight = np.bincount(walk_from, weights=walk_weights, minlength=num_nodes)
+    transition = walk_weights / out_weight[walk_from]
+    dangling = out_weight == 0
+
+    probability = restart.copy()
+    for _ in range(max_iterations):
+        spread = np.bincount(walk_to, weights=transition * probability[walk_from], minlength=num_nodes)
+        spread += probability[dangling].sum() * restart
+        updated = alpha * restart + (1.0 - alpha) * spread
+        converged = np.abs(updated - probability).sum() < tolerance
+        probability = updated
+        if converged:
+            break
+    return probability
+
+class PPRRetriever:
+    """
+    Retriever that ranks memories by personalized PageRank from the entities
+    mentioned in a query.
+
+    Unlike path-product traversal, an experience connected to the query
+    entities by many paths accumulates probability from all of them. The walk
+    runs over a bounded neighborhood (PPR_MAX_DEPTH hops, PPR_NODE_BUDGET
+    nodes) extracted through the GraphEngine's adjacency cache, so its cost is
+    bounded regardless of the graph's size.
+    """
+
+    def __init__(self, adapter: AsyncGraphDBAdapter, graph_engine: Optional[GraphEngine] = None):
+        self.adapter = adapter
+        self.graph_engine = graph_engine or GraphEngine(adapter)
+
+    async def retrieve_by_entities(
+        self,
+        entity_names: List[str],
+        limit: int = 10,
+        agent_id: Optional[str] = None
+    ) -> List[MemoryResult]:
+        """
+        Retrieves the `limit` Experience nodes with the highest stationary
+        probability of a random walk restarting at the given entities.
+
+        Scores are normalized by the best returned memory so they fall in [0, 1].
+        """
+        if not entity_names:
+            return []
+
+        entity_results = await self.adapter.run_query(
+            "MATCH (e:Entity) WHERE e.name IN $names RETURN id(e) AS nid", {"names": entity_names}
+        )
+        seeds = [res["nid"] for res in entity_results]
+        if not seeds:
+            logger.debug(f"No entities found for names: {entity_names}")
+            return []
+
+        subgraph = await self.graph_engine.extract_subgraph(
+            start_internal_ids=seeds,
+            depth=settings.PPR_MAX_DEPTH,
+            node_budget=settings.PPR_NODE_BUDGET
+        )
+        num_nodes = len(subgraph["nids"])
+        probability = personalized_pagerank(
+            num_nodes,
+            subgraph["sources"],
+            subgraph["targets"],
+            subgraph["weights"],
+            seeds=list(range(len(set(seeds)))),
+            alpha=settings.PPR_ALPHA,
+            max_iterations=settings.PPR_MAX_ITERATIONS,
+            tolerance=settings.PPR_TOLERANCE
+        )
+
+        candidates = np.array([
+            "Experience" in labels and (agent_id is None or subgraph["agent_ids"][i] == agent_id)
+            for i, labels in enumerate(subgraph["labels"])
+        ], dtype=bool)
+        candidate_positions = np.flatnonzero(candidates & (probability > 0))
+        if not len(candidate_positions):
+            return []
+        if len(candidate_positions) > limit:
+            top = np.argpartition(-probability[candidate_positions], limit - 1)[:limit]
+            candidate_positions = candidate_positions[top]
+        candidate_positions = candidate_positions[np.argsort(-probability[candidate_positions])]
+
+        nids = [subgraph["nids"][i] for i in candidate_positions]
+        nodes = await self.graph_engine.hydrate_nodes(
+            nids, label="Experience", agent_id=agent_id, properties=MEMORY_PROPERTIES
+        )
+        best = float(probability[candidate_positions[0]])
+        logger.debug(
+            f"PPR over {num_nodes} nodes and {len(subgraph['sources'])} edges "
+            f"returned {len(candidate_positions)} memories"
+        )
+
+        memory_results = []
+        for position, nid in zip(candidate_positions.tolist(), nids):
+            node = nodes.get(nid)
+            if node is None:
+                continue
+            memory_results.append(format_memory_result(
+                record={"n": node},
+                score=float(probability[position]) / best,
+                layer="graph"
+            ))
+        return memory_results
@@ -0,0 +1,29 @@
+from typing import Sequence
+
+# Properties a MemoryResult is built from (see format_memory_result)
+MEMORY_PROPERTIES = ("id", "content", "confidence", "created_at", "session_id", "memory_type")
+# Properties an Entity search result is built from
+ENTITY_PROPERTIES = ("id", "name", "type", "importance_score")
+EMBEDDING_PROPERTY = "embedding"
+
+def projection(
+    variable: str = "n",
+    properties: Sequence[str] = MEMORY_PROPERTIES,
+    include_embedding: bool = False
+) -> str:
+    """
+    Cypher map projection of `variable`, e.g. `n {.id, .content}`.
+
+    Returning a projection instead of the whole node keeps the 1536-float
+    embedding (and any other unused property) in the database. Pass
+    `include_embedding` when the caller needs vectors, e.g. for MMR or
+    clustering.
+    """
+    names = list(properties)
+    if include_embedding and EMBEDDING_PROPERTY not in names:
+        names.append(EMBEDDING_PROPERTY)
+    return f"{variable} {{{', '.join('.' + name for name in names)}}}"
+
+def memory_return(variable: str = "n", include_embedding: bool = False) -> str:
+    """`<projection> AS <variable>`, so rows keep the shape `RETURN <variable>` gave them."""
+    return f"{projection(variable, include_embedding=include_embedding)} AS {variable}"
@@ -1,42 +1,77 @@
-from typing import List, Optional
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+import math
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from loguru import logger
+
+from src.config.environment import settings
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 from src.models.memory_result import MemoryResult
 from src.retrieval.utils import format_memory_result
+from src.retrieval.projections import memory_return, projection
+from src.performance.vector_partitions import VectorIndexRouter
 
 class SemanticRetriever:
     """
     Retriever for performing vector-based semantic search against Memgraph.
+
+    The vector index is global, so agent and memory type filters can only be
+    applied to its neighbors. When a filter is selective (e.g. one tenant among
+    many) the requested k is grown adaptively, guided by the selectivity last
+    observed for that agent, until enough matches arrive or
+    SEMANTIC_OVERFETCH_MAX_K is reached. Searches use the vector index of the
+    agent's partition when one exists (see VectorIndexRouter).
+    
+    Rows carry a projection of each node without its embedding unless
+    `include_embedding` is set.
     """
     
-    def __init__(self, adapter: GraphDBAdapter):
+    # Weight of the newest observation in the per-agent selectivity average
+    SELECTIVITY_SMOOTHING = 0.3
+    MAX_TRACKED_AGENTS = 10000
+    
+    def __init__(
+        self,
+        adapter: AsyncGraphDBAdapter,
+        overfetch_factor: Optional[int] = None,
+        max_k: Optional[int] = None,
+        vector_router: Optional[VectorIndexRouter] = None,
+        include_embedding: bool = False
+    ):
         self.adapter = adapter
+        self.include_embedding = include_embedding
+        self.vector_router = vector_router or VectorIndexRouter()
+        self.overfetch_factor = max(2, overfetch_factor or settings.SEMANTIC_OVERFETCH_FACTOR)
+        self.max_k = max_k or settings.SEMANTIC_OVERFETCH_MAX_K
+        self._selectivity: "OrderedDict[str, float]" = OrderedDict()
+        
+        self.searches = 0
+        self.rounds = 0
+        self.capped = 0
+        self.matched_total = 0
+        self.scanned_total = 0
 
-    def search(
-        self, 
-        query_embedding: List[float], 
-        top_k: int = 5, 
-        agent_id: Optional[str] = None,
-        memory_type: Optional[str] = None
-    ) -> List[MemoryResult]:
+    async def _search_round(
+        self,
+        index_name: str,
+        k: int,
+        query_embedding: List[float],
+        agent_id: Optional[str],
+        memory_type: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Perform a semantic search using Memgraph's vector index.
+        Ask the vector index for `k` neighbors and apply the filters in the same query.
+        Returns (matching rows, number of neighbors scanned).
         """
-        index_name = "idx_Experience_embedding"
-        
-        # Base query using Memgraph's vector_search.search
         # CALL vector_search.search(index_name, limit, query_vector) YIELD node, similarity
         cypher = (
             f"CALL vector_search.search('{index_name}', $top_k, $embedding) "
             "YIELD node, similarity "
-            "WITH node, similarity "
         )
-        
         params = {
             "embedding": query_embedding,
-            "top_k": top_k
+            "top_k": k
         }
         
-        # Add filtering logic after the vector search
         filters = []
         if agent_id:
             filters.append("node.agent_id = $agent_id")
@@ -44,16 +79,81 @@ class SemanticRetriever:
         if memory_type:
             filters.append("node.memory_type = $memory_type")
             params["memory_type"] = memory_type
-            
+        
         if filters:
-            cypher += "WHERE " + " AND ".join(filters) + " "
-            
-        cypher += "RETURN node, similarity ORDER BY similarity DESC"
+            # Keep one row per neighbor, without the node unless it matches,
+            # so the number of neighbors scanned is known
+            cypher += (
+                f"RETURN CASE WHEN {' AND '.join(filters)} "
+                f"THEN {projection('node', include_embedding=self.include_embedding)} ELSE null END AS node, "
+                "similarity ORDER BY similarity DESC"
+            )
+        else:
+            cypher += f"RETURN {memory_return('node', self.include_embedding)}, similarity ORDER BY similarity DESC"
+        
+        results = await self.adapter.run_query(cypher, params)
+        return [res for res in results if res.get("node") is not None], len(results)
+
+    def _initial_k(self, top_k: int, agent_id: Optional[str], filtered: bool) -> int:
+        if not filtered:
+            return top_k
+        selectivity = self._selectivity.get(agent_id) if agent_id else None
+        if selectivity is None:
+            return min(self.max_k, top_k * self.overfetch_factor)
+        return min(self.max_k, max(top_k, math.ceil(top_k / max(selectivity, 1e-3) * 1.2)))
+
+    def _observe(self, agent_id: Optional[str], matched: int, scanned: int):
+        self.matched_total += matched
+        self.scanned_total += scanned
+        if not agent_id or not scanned:
+            return
+        observed = matched / scanned
+        previous = self._selectivity.pop(agent_id, None)
+        self._selectivity[agent_id] = observed if previous is None else (
+            self.SELECTIVITY_SMOOTHING * observed + (1 - self.SELECTIVITY_SMOOTHING) * previous
+        )
+        while len(self._selectivity) > self.MAX_TRACKED_AGENTS:
+            self._selectivity.popitem(last=False)
+
+    async def search(
+        self, 
+        query_embedding: List[float], 
+        top_k: int = 5, 
+        agent_id: Optional[str] = None,
+        memory_type: Optional[str] = None
+    ) -> List[MemoryResult]:
+        """
+        Perform a semantic search using Memgraph's vector index, over-fetching
+        until `top_k` results pass the agent and memory type filters.
+        """
+        index_name, _ = self.vector_router.index_for(agent_id)
+        filtered = bool(agent_id or memory_type)
+        k = self._initial_k(top_k, agent_id, filtered)
+        self.searches += 1
+        
+        while True:
+            self.rounds += 1
+            rows, scanned = await self._search_round(index_name, k, query_embedding, agent_id, memory_type)
+            # Fewer neighbors than requested means the whole index was scanned
+            if len(rows) >= top_k or scanned < k or not filtered:
+                break
+            if k >= self.max_k:
+                self.capped += 1
+                logger.warning(
+                    f"Semantic search for agent {agent_id} hit the over-fetch cap "
+                    f"(k={k}) with {len(rows)}/{top_k} matches"
+                )
+                break
+            if rows:
+                # Estimate the k needed from the share of neighbors that matched
+                k = min(self.max_k, max(k * 2, math.ceil(top_k * scanned / len(rows) * 1.2)))
+            else:
+                k = min(self.max_k, k * self.overfetch_factor)
         
-        results = self.adapter.run_query(cypher, params)
+        self._observe(agent_id, len(rows), scanned)
         
         memory_results = []
-        for res in results:
+        for res in rows[:top_k]:
             # res structure: {"node": {...}, "similarity": 0.95}
             memory_results.append(
                 format_memory_result(
@@ -65,3 +165,25 @@ class SemanticRetriever:
             
         return memory_results
 
+    def stats(self) -> Dict[str, Any]:
+        """Over-fetch rounds and the filter selectivity observed so far."""
+        return {
+            "searches": self.searches,
+            "rounds_per_search": self.rounds / self.searches if self.searches else 0.0,
+            "capped": self.capped,
+            "selectivity": self.matched_total / self.scanned_total if self.scanned_total else None,
+            "tracked_agents": len(self._selectivity)
+        }
+
+    async def fetch_embeddings(self, memory_ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Fetch the stored embeddings of many Experience nodes in one query.
+        """
+        if not memory_ids:
+            return {}
+        cypher = (
+            "MATCH (n:Experience) WHERE n.id IN $ids "
+            "RETURN n.id AS id, n.embedding AS embedding"
+        )
+        results = await self.adapter.run_query(cypher, {"ids": list(memory_ids)})
+        return {res["id"]: res["embedding"] for res in results if res.get("embedding")}
@@ -1,18 +1,21 @@
 from typing import List, Optional
 from datetime import datetime, timedelta
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
 from src.models.memory_result import MemoryResult
 from src.retrieval.utils import format_memory_result
+from src.retrieval.projections import memory_return
 
 class TemporalRetriever:
     """
     Retriever for accessing memories based on time and recency.
+    Embeddings are only returned with `include_embedding`.
     """
     
-    def __init__(self, adapter: GraphDBAdapter):
+    def __init__(self, adapter: AsyncGraphDBAdapter, include_embedding: bool = False):
         self.adapter = adapter
+        self.include_embedding = include_embedding
 
-    def get_recent_memories(
+    async def get_recent_memories(
         self, 
         agent_id: str, 
         limit: int = 10,
@@ -46,9 +49,9 @@ class TemporalRetriever:
             cypher += "WHERE n.created_at >= $since "
             params["since"] = since
             
-        cypher += "RETURN n ORDER BY n.created_at DESC LIMIT $limit"
+        cypher += f"RETURN {memory_return('n', self.include_embedding)} ORDER BY n.created_at DESC LIMIT $limit"
         
-        results = self.adapter.run_query(cypher, params)
+        results = await self.adapter.run_query(cypher, params)
         
         memory_results = []
         for res in results:
@@ -63,7 +66,7 @@ class TemporalRetriever:
             
         return memory_results
 
-    def get_memories_in_range(
+    async def get_memories_in_range(
         self,
         agent_id: str,
         start_date: datetime,
@@ -76,7 +79,7 @@ class TemporalRetriever:
         cypher = (
             "MATCH (n:Experience {agent_id: $agent_id}) "
             "WHERE n.created_at >= $start_date AND n.created_at <= $end_date "
-            "RETURN n ORDER BY n.created_at DESC LIMIT $limit"
+            f"RETURN {memory_return('n', self.include_embedding)} ORDER BY n.created_at DESC LIMIT $limit"
         )
         
         params = {
@@ -86,7 +89,7 @@ class TemporalRetriever:
             "limit": limit
         }
         
-        results = self.adapter.run_query(cypher, params)
+        results = await self.adapter.run_query(cypher, params)
         
         return [format_memory_result(res, score=1.0) for res in results]
 
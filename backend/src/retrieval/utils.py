@@ -28,6 +28,11 @@ def format_memory_result(record: Dict[str, Any], score: float = 0.0, layer: str
     # Default layer to memory_type if available in the node
     final_layer = node.get("memory_type", layer)
     
+    # The driver returns neo4j.time.DateTime for stored datetimes
+    created_at = node.get("created_at")
+    if hasattr(created_at, "to_native"):
+        created_at = created_at.to_native()
+    
     return MemoryResult(
         id=str(node_id),
         content=content,
@@ -35,6 +40,7 @@ def format_memory_result(record: Dict[str, Any], score: float = 0.0, layer: str
         layer=str(final_layer),
         paths_found=[], # Can be populated by path-based retrieval later
         confidence=float(confidence),
-        provenance=str(provenance)
+        provenance=str(provenance),
+        created_at=created_at
     )
 
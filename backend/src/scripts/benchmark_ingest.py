@@ -0,0 +1,138 @@
+import asyncio
+import os
+import sys
+import time
+import uuid
+import random
+from loguru import logger
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.config.environment import settings
+from src.models.nodes import Experience, Entity, Principle, Context, MemoryType
+from src.models.edges import Edge, RelationshipType
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.unit_of_work import GraphUnitOfWork
+
+BENCH_AGENT_ID = "benchmark-ingest-agent"
+ENTITIES_PER_EXPERIENCE = 8
+PRINCIPLES_PER_EXPERIENCE = 3
+
+def _build_ingest(run: int, i: int):
+    """Builds one synthetic experience with its derived entities, principles and context."""
+    experience = Experience(
+        id=str(uuid.uuid4()),
+        agent_id=BENCH_AGENT_ID,
+        session_id=f"bench-session-{run}",
+        memory_type=MemoryType.EPISODIC,
+        content=f"Benchmark experience {run}-{i}",
+        embedding=[random.random() for _ in range(1536)],
+        confidence=1.0
+    )
+    entities = [
+        Entity(id=f"bench_ent_{run}_{i}_{j}", name=f"bench_ent_{run}_{i}_{j}", type="Concept", importance_score=0.5)
+        for j in range(ENTITIES_PER_EXPERIENCE)
+    ]
+    principles = [
+        Principle(id=f"bench_princ_{run}_{i}_{j}", content=f"Benchmark principle {run}-{i}-{j}", confidence=0.7, evidence_count=1)
+        for j in range(PRINCIPLES_PER_EXPERIENCE)
+    ]
+    context = Context(id=f"bench_ctx_{run}_{i}", name=f"Benchmark context {run}-{i}", importance_score=0.5)
+    return experience, entities, principles, context
+
+def _edges_for(experience, entities, principles, context):
+    targets = (
+        [(entity.id, "Entity", RelationshipType.MENTIONS) for entity in entities]
+        + [(principle.id, "Principle", RelationshipType.SUPPORTS) for principle in principles]
+        + [(context.id, "Context", RelationshipType.BELONGS_TO)]
+    )
+    for target_id, target_label, rel_type in targets:
+        edge = Edge(
+            id=f"{experience.id}_{rel_type.value}_{target_id}",
+            source_id=experience.id,
+            target_id=target_id,
+            rel_type=rel_type,
+            weight=1.0
+        )
+        yield dict(
+            source_id=experience.id,
+            target_id=target_id,
+            edge_type=rel_type.value,
+            properties=edge.model_dump(),
+            source_label="Experience",
+            target_label=target_label,
+            id_property="id"
+        )
+
+async def ingest_per_statement(adapter: AsyncGraphDBAdapter, experience, entities, principles, context):
+    """The previous write pattern: one autocommit round trip per node and edge."""
+    await adapter.create_node("Experience", experience.model_dump())
+    for entity in entities:
+        await adapter.create_node("Entity", entity.model_dump())
+    for principle in principles:
+        await adapter.create_node("Principle", principle.model_dump())
+    await adapter.create_node("Context", context.model_dump())
+    for edge in _edges_for(experience, entities, principles, context):
+        await adapter.create_edge(**edge)
+
+async def ingest_unit_of_work(adapter: AsyncGraphDBAdapter, experience, entities, principles, context):
+    """The unit-of-work write pattern: everything staged and committed in one transaction."""
+    uow = GraphUnitOfWork(adapter)
+    uow.create_node("Experience", experience.model_dump())
+    uow.merge_nodes("Entity", [entity.model_dump() for entity in entities], merge_key="name")
+    uow.merge_nodes("Principle", [principle.model_dump() for principle in principles])
+    uow.create_node("Context", context.model_dump())
+    for edge in _edges_for(experience, entities, principles, context):
+        uow.create_edge(**edge)
+    await uow.flush()
+
+async def run_benchmark(adapter: AsyncGraphDBAdapter, ingest_func, run: int, iterations: int):
+    commits_before = adapter.commit_count
+    durations = []
+    for i in range(iterations):
+        payload = _build_ingest(run, i)
+        start = time.perf_counter()
+        await ingest_func(adapter, *payload)
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    return {
+        "commits_per_ingest": (adapter.commit_count - commits_before) / iterations,
+        "avg_ms": sum(durations) / len(durations) * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95)] * 1000
+    }
+
+async def cleanup(adapter: AsyncGraphDBAdapter):
+    await adapter.run_query(f"MATCH (n:Experience {{agent_id: '{BENCH_AGENT_ID}'}}) DETACH DELETE n")
+    await adapter.run_query("MATCH (n) WHERE n.id STARTS WITH 'bench_' DETACH DELETE n")
+
+async def main(iterations: int = 50):
+    """
+    Compares commit count and latency of ingesting one experience with
+    8 entities, 3 principles and a context, per-statement vs. unit of work.
+    """
+    adapter = AsyncGraphDBAdapter(
+        uri=f"bolt://{settings.MEMGRAPH_HOST}:{settings.MEMGRAPH_PORT}",
+        user=settings.MEMGRAPH_USERNAME,
+        password=settings.MEMGRAPH_PASSWORD
+    )
+    try:
+        await adapter.connect()
+        for run, (name, func) in enumerate([
+            ("per-statement", ingest_per_statement),
+            ("unit-of-work", ingest_unit_of_work)
+        ]):
+            stats = await run_benchmark(adapter, func, run, iterations)
+            logger.info(
+                f"BENCH_INGEST | {name} | "
+                f"Commits/ingest: {stats['commits_per_ingest']:.1f} | "
+                f"Avg: {stats['avg_ms']:.2f}ms | "
+                f"p95: {stats['p95_ms']:.2f}ms"
+            )
+    finally:
+        await cleanup(adapter)
+        await adapter.disconnect()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
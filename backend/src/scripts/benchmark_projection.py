@@ -0,0 +1,95 @@
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+import random
+from loguru import logger
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.config.environment import settings
+from src.models.nodes import Experience, MemoryType
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.unit_of_work import GraphUnitOfWork
+from src.retrieval.projections import memory_return
+from src.retrieval.utils import format_memory_result
+
+BENCH_AGENT_ID = "benchmark-projection-agent"
+
+QUERIES = {
+    "whole node": "MATCH (n:Experience {agent_id: $agent_id}) RETURN n ORDER BY n.created_at DESC LIMIT $limit",
+    "projection": (
+        "MATCH (n:Experience {agent_id: $agent_id}) "
+        f"RETURN {memory_return('n')} ORDER BY n.created_at DESC LIMIT $limit"
+    ),
+}
+
+async def seed(adapter: AsyncGraphDBAdapter, count: int):
+    """Writes `count` experiences with 1536-dim embeddings for the benchmark agent."""
+    uow = GraphUnitOfWork(adapter)
+    for i in range(count):
+        experience = Experience(
+            id=str(uuid.uuid4()),
+            agent_id=BENCH_AGENT_ID,
+            session_id="bench-session",
+            memory_type=MemoryType.EPISODIC,
+            content=f"Benchmark experience {i}: " + " ".join(random.choices(["user", "prefers", "dark", "mode", "python", "tea"], k=30)),
+            embedding=[random.random() for _ in range(settings.VECTOR_INDEX_DIMENSION)],
+            confidence=1.0
+        )
+        uow.create_node("Experience", experience.model_dump())
+    await uow.flush()
+
+async def run_benchmark(adapter: AsyncGraphDBAdapter, cypher: str, limit: int, iterations: int):
+    params = {"agent_id": BENCH_AGENT_ID, "limit": limit}
+    durations = []
+    rows = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        # run_query includes Bolt transfer, PackStream decoding and record.data()
+        rows = await adapter.run_query(cypher, params)
+        [format_memory_result(row) for row in rows]
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    return {
+        # JSON size of the decoded rows, a proxy for the bytes on the wire
+        "payload_bytes": len(json.dumps(rows, default=str).encode()),
+        "avg_ms": sum(durations) / len(durations) * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95)] * 1000
+    }
+
+async def cleanup(adapter: AsyncGraphDBAdapter):
+    await adapter.run_query(f"MATCH (n:Experience {{agent_id: '{BENCH_AGENT_ID}'}}) DETACH DELETE n")
+
+async def main(iterations: int = 200, limit: int = 20):
+    """
+    Compares payload size and fetch + decode latency of a recall-sized
+    result list returned as whole Experience nodes versus the embedding-free
+    projection used by the retrievers.
+    """
+    adapter = AsyncGraphDBAdapter(
+        uri=f"bolt://{settings.MEMGRAPH_HOST}:{settings.MEMGRAPH_PORT}",
+        user=settings.MEMGRAPH_USERNAME,
+        password=settings.MEMGRAPH_PASSWORD
+    )
+    try:
+        await adapter.connect()
+        await seed(adapter, limit)
+        for name, cypher in QUERIES.items():
+            stats = await run_benchmark(adapter, cypher, limit, iterations)
+            logger.info(
+                f"BENCH_PROJECTION | {name} | "
+                f"Payload: {stats['payload_bytes']} bytes | "
+                f"Avg: {stats['avg_ms']:.2f}ms | "
+                f"p95: {stats['p95_ms']:.2f}ms"
+            )
+    finally:
+        await cleanup(adapter)
+        await adapter.disconnect()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
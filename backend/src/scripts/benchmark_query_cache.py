@@ -0,0 +1,86 @@
+import json
+import os
+import sys
+import time
+import random
+from datetime import datetime
+from loguru import logger
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.models.memory_result import MemoryResult
+from src.performance.result_codec import encode_results, decode_results
+from src.storage.adapters.cache_adapter import CacheAdapter
+
+BENCH_KEY = "bench_query_cache"
+
+def _build_results(count: int):
+    """Builds a ranked result list shaped like a typical recall response."""
+    return [
+        MemoryResult(
+            id=f"bench_{i}",
+            content=f"Benchmark memory {i}: " + " ".join(random.choices(["user", "prefers", "dark", "mode", "python", "tea"], k=40)),
+            score=random.random(),
+            layer=random.choice(["episodic", "semantic"]),
+            paths_found=random.sample(["semantic", "temporal", "context", "graph"], k=2),
+            confidence=random.random(),
+            provenance=f"session-{i % 5}",
+            created_at=datetime.now()
+        )
+        for i in range(count)
+    ]
+
+def encode_json(results):
+    """The previous format: model_dump + JSON."""
+    return json.dumps([res.model_dump(mode="json") for res in results]).encode()
+
+def decode_json(data):
+    """The previous hit path: json.loads + full pydantic validation."""
+    return [MemoryResult(**res) for res in json.loads(data)]
+
+def decode_columnar(data):
+    return decode_results(data)[0]
+
+def run_benchmark(fetch, decode, iterations: int):
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        decode(fetch())
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    return {
+        "avg_ms": sum(durations) / len(durations) * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95)] * 1000
+    }
+
+def main(iterations: int = 1000, result_count: int = 20):
+    """
+    Compares cache-hit latency (fetch + decode) of a recall result list
+    stored as JSON versus the columnar binary codec. Uses Redis when it is
+    reachable and measures decoding alone otherwise.
+    """
+    results = _build_results(result_count)
+    cache = CacheAdapter()
+    for name, encode, decode in [
+        ("json+validate", encode_json, decode_json),
+        ("columnar+construct", encode_results, decode_columnar)
+    ]:
+        payload = encode(results)
+        if cache.binary_client:
+            cache.set_bytes(BENCH_KEY, payload, ttl=60)
+            fetch = lambda: cache.get_bytes(BENCH_KEY)
+        else:
+            fetch = lambda: payload
+        stats = run_benchmark(fetch, decode, iterations)
+        logger.info(
+            f"BENCH_QUERY_CACHE | {name} | "
+            f"Size: {len(payload)} bytes | "
+            f"Avg: {stats['avg_ms']:.3f}ms | "
+            f"p95: {stats['p95_ms']:.3f}ms"
+        )
+    cache.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
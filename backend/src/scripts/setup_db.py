@@ -30,8 +30,13 @@ def setup_database():
         # 3. Create Indexes using PerformanceIndexManager
         index_manager = PerformanceIndexManager(db_adapter)
         
-        logger.info("Creating HNSW (Vector) index for Experience nodes...")
-        index_manager.tune_hnsw_index(label="Experience", property_name="embedding")
+        if not index_manager.serves_later_version("Experience"):
+            logger.info("Creating HNSW (Vector) index for Experience nodes...")
+            index_manager.tune_hnsw_index(label="Experience", property_name="embedding")
+        
+        if settings.VECTOR_INDEX_SHARDS > 1:
+            logger.info(f"Creating {settings.VECTOR_INDEX_SHARDS} partitioned HNSW indexes for Experience nodes...")
+            index_manager.create_vector_partitions(property_name="embedding")
         
         logger.info("Creating Full-Text Search (FTS) index for Experience nodes...")
         index_manager.optimize_fts_index(label="Experience", properties=["content"])
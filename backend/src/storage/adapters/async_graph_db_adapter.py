@@ -0,0 +1,212 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from neo4j import AsyncGraphDatabase, AsyncDriver
+from loguru import logger
+from src.storage.adapters.graph_db_adapter import (
+    sanitize_props,
+    build_create_nodes_query,
+    build_merge_nodes_query,
+    build_create_edges_query,
+    group_edge_rows,
+)
+
+class AsyncGraphDBAdapter:
+    """
+    Asyncio adapter for Graph Databases (Memgraph/Neo4j) using the Neo4j async driver.
+    Mirrors the GraphDBAdapter surface with awaitable methods, so queries never
+    block the event loop or occupy a worker thread.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        max_connection_pool_size: Optional[int] = None,
+        connection_acquisition_timeout: Optional[float] = None
+    ):
+        self.uri = uri
+        self.user = user
+        self.password = password
+        # Driver pool tuning; None keeps the neo4j driver defaults
+        self.driver_config = {
+            key: value for key, value in {
+                "max_connection_pool_size": max_connection_pool_size,
+                "connection_acquisition_timeout": connection_acquisition_timeout
+            }.items() if value is not None
+        }
+        self.driver: Optional[AsyncDriver] = None
+        # Every run_query call is an autocommit transaction; counted for benchmarking
+        self.commit_count = 0
+        self._connect_lock = asyncio.Lock()
+
+    async def connect(self):
+        """Establish a connection to the graph database with retry logic."""
+        async with self._connect_lock:
+            if self.driver:
+                return
+            auth = (self.user, self.password) if self.user and self.password else None
+            max_retries = 5
+            logger.info(f"Attempting to connect to Graph DB at {self.uri}")
+            for attempt in range(max_retries):
+                driver = AsyncGraphDatabase.driver(self.uri, auth=auth, **self.driver_config)
+                try:
+                    await driver.verify_connectivity()
+                    self.driver = driver
+                    logger.success(f"Successfully connected to Graph DB at {self.uri}")
+                    break
+                except Exception as e:
+                    await driver.close()
+                    if attempt == max_retries - 1:
+                        logger.error(f"CRITICAL: Failed to connect to Graph DB at {self.uri} after {max_retries} attempts.")
+                        logger.error(f"Error details: {e}")
+                        logger.info("Check if Docker containers are running and the port is correct.")
+                        raise
+                    wait_time = 2 ** attempt
+                    logger.warning(f"Connection attempt {attempt + 1} failed for {self.uri}. Retrying in {wait_time}s... Error: {e}")
+                    await asyncio.sleep(wait_time)
+
+    async def warm_up(self, connections: int = 1):
+        """
+        Connect and open `connections` pooled Bolt connections up front by running
+        trivial queries concurrently, so the first requests don't pay the handshake.
+        """
+        if not self.driver:
+            await self.connect()
+        await asyncio.gather(*(self.run_query("RETURN 1 AS ok") for _ in range(max(1, connections))))
+        logger.info(f"Warmed {max(1, connections)} Graph DB connection(s)")
+
+    async def disconnect(self):
+        """Close the connection to the graph database."""
+        if self.driver:
+            await self.driver.close()
+            self.driver = None
+            logger.info("Disconnected from Graph DB")
+
+    async def initialize_database(self):
+        """Initialize the database by loading modules and ensuring basic setup."""
+        logger.info("Initializing Graph DB (loading modules)...")
+        try:
+            await self.run_query("CALL mg.load_all();")
+            logger.success("Graph DB modules loaded successfully.")
+        except Exception as e:
+            logger.error(f"Failed to load Graph DB modules: {e}")
+
+    async def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a Cypher query and return the results.
+        Queries are parameterized to prevent injection.
+        """
+        if not self.driver:
+            await self.connect()
+
+        start_time = time.time()
+        try:
+            async with self.driver.session() as session:
+                result = await session.run(query, parameters or {})
+                data = await result.data()
+                self.commit_count += 1
+
+                duration = time.time() - start_time
+                logger.debug(f"Query executed in {duration:.4f}s: {query}")
+                return data
+        except Exception as e:
+            logger.error(f"Error executing Cypher query: {e}\nQuery: {query}\nParams: {parameters}")
+            raise
+
+    async def create_node(self, label: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a node with the given label and properties."""
+        query = f"CREATE (n:{label} $props) RETURN n"
+        result = await self.run_query(query, {"props": sanitize_props(properties)})
+        return result[0]["n"] if result else {}
+
+    async def get_node(self, node_id: str, label: Optional[str] = None, id_property: str = "id") -> Optional[Dict[str, Any]]:
+        """Retrieve a node by its ID and optionally its label."""
+        label_str = f":{label}" if label else ""
+        query = f"MATCH (n{label_str} {{{id_property}: $node_id}}) RETURN n"
+        result = await self.run_query(query, {"node_id": node_id})
+        return result[0]["n"] if result else None
+
+    async def create_edge(self, source_id: str, target_id: str, edge_type: str,
+                          properties: Optional[Dict[str, Any]] = None,
+                          source_label: Optional[str] = None,
+                          target_label: Optional[str] = None,
+                          id_property: str = "id") -> Dict[str, Any]:
+        """
+        Create a directed edge between two nodes.
+        Uses parameterized source/target IDs and properties.
+        """
+        s_label = f":{source_label}" if source_label else ""
+        t_label = f":{target_label}" if target_label else ""
+
+        # Ensure edge_type is a string if it's an Enum
+        if hasattr(edge_type, "value"):
+            edge_type = edge_type.value
+
+        query = (
+            f"MATCH (a{s_label} {{{id_property}: $source_id}}), "
+            f"(b{t_label} {{{id_property}: $target_id}}) "
+            f"CREATE (a)-[r:{edge_type} $props]->(b) "
+            f"RETURN r"
+        )
+        result = await self.run_query(query, {
+            "source_id": source_id,
+            "target_id": target_id,
+            "props": sanitize_props(properties or {})
+        })
+        return result[0]["r"] if result else {}
+
+    async def create_nodes_bulk(self, nodes: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Create many nodes given as (label, properties) pairs.
+        Rows are grouped by label and each group is sent as a single UNWIND query.
+        Returns the number of nodes created.
+        """
+        groups = defaultdict(list)
+        for label, properties in nodes:
+            groups[label].append(sanitize_props(properties))
+
+        created = 0
+        for label, rows in groups.items():
+            result = await self.run_query(build_create_nodes_query(label), {"rows": rows})
+            created += result[0]["created"] if result else 0
+        return created
+
+    async def merge_nodes_bulk(self, label: str, rows: List[Dict[str, Any]],
+                               merge_key: str = "id", on_match: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Create-or-update many `label` nodes keyed by `merge_key` in a single UNWIND query.
+        `on_match` is an optional SET expression applied to nodes that already exist
+        (`n` is the node, `row` the incoming properties).
+        Returns the merged nodes in row order.
+        """
+        if not rows:
+            return []
+        query = build_merge_nodes_query(label, merge_key, on_match)
+        result = await self.run_query(query, {"rows": [sanitize_props(row) for row in rows]})
+        return [record["n"] for record in result]
+
+    async def create_edges_bulk(self, edges: List[Dict[str, Any]]) -> int:
+        """
+        Create many edges, each given as the keyword arguments of `create_edge`.
+        Rows are grouped by edge type and endpoint labels and each group is sent
+        as a single UNWIND query. Returns the number of edges created.
+        """
+        created = 0
+        for key, rows in group_edge_rows(edges).items():
+            query = build_create_edges_query(*key)
+            result = await self.run_query(query, {"rows": rows})
+            created += result[0]["created"] if result else 0
+        return created
+
+    async def execute_transaction(self, tx_func, *args, **kwargs):
+        """Execute an async function within a write transaction."""
+        if not self.driver:
+            await self.connect()
+
+        async with self.driver.session() as session:
+            result = await session.execute_write(tx_func, *args, **kwargs)
+            self.commit_count += 1
+            return result
@@ -1,54 +1,194 @@
 import json
+import struct
 import hashlib
-from typing import Optional, List, Any
+import uuid
+from typing import Optional, List, Any, Dict, Union
+import numpy as np
 import redis
 from src.config.environment import settings
+from src.storage.adapters.local_cache import LocalLRUCache
 from loguru import logger
 
+# Embeddings are stored as a one-byte encoding tag followed by little-endian
+# vector data. Entries written before the binary format are JSON arrays,
+# which can never start with one of these tags.
+EMBEDDING_ENCODINGS = {
+    "float32": b"f",
+    "float16": b"h",
+    "int8": b"q",
+}
+_INT8_SCALE = struct.Struct("<f")
+
+# Delete a lock only if it still holds the caller's token
+_RELEASE_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+_EXTEND_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('expire', KEYS[1], ARGV[2]) else return 0 end"
+)
+
+def encode_embedding(embedding: Union[List[float], np.ndarray], encoding: str = "float32") -> bytes:
+    """
+    Pack an embedding into its binary cache representation.
+    int8 stores a float32 scale followed by symmetric quantized components.
+    """
+    if encoding not in EMBEDDING_ENCODINGS:
+        raise ValueError(f"Unknown embedding encoding: {encoding}. Must be one of: {list(EMBEDDING_ENCODINGS)}")
+
+    vector = np.asarray(embedding, dtype=np.float32)
+    tag = EMBEDDING_ENCODINGS[encoding]
+    if encoding == "float32":
+        return tag + vector.astype("<f4").tobytes()
+    if encoding == "float16":
+        return tag + vector.astype("<f2").tobytes()
+
+    max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+    return tag + _INT8_SCALE.pack(scale) + quantized.tobytes()
+
+def decode_embedding(data: bytes) -> np.ndarray:
+    """Unpack a cached embedding (binary or legacy JSON) into a float32 array."""
+    tag, payload = data[:1], data[1:]
+    if tag == EMBEDDING_ENCODINGS["float32"]:
+        return np.frombuffer(payload, dtype="<f4")
+    if tag == EMBEDDING_ENCODINGS["float16"]:
+        return np.frombuffer(payload, dtype="<f2").astype(np.float32)
+    if tag == EMBEDDING_ENCODINGS["int8"]:
+        (scale,) = _INT8_SCALE.unpack_from(payload)
+        return np.frombuffer(payload, dtype=np.int8, offset=_INT8_SCALE.size).astype(np.float32) * np.float32(scale)
+    return np.asarray(json.loads(data), dtype=np.float32)
+
 class CacheAdapter:
-    def __init__(self, redis_url: str = None):
+    def __init__(
+        self,
+        redis_url: str = None,
+        max_connections: Optional[int] = None,
+        connect: bool = True,
+        embedding_encoding: Optional[str] = None
+    ):
         self.redis_url = redis_url or settings.REDIS_URL
+        self.max_connections = max_connections or settings.REDIS_MAX_CONNECTIONS
+        self.embedding_encoding = embedding_encoding or settings.EMBEDDING_CACHE_ENCODING
+        if self.embedding_encoding not in EMBEDDING_ENCODINGS:
+            raise ValueError(f"Unknown embedding encoding: {self.embedding_encoding}. Must be one of: {list(EMBEDDING_ENCODINGS)}")
+        self.client = None
+        # Raw-bytes connection for binary payloads such as embeddings
+        self.binary_client = None
+        # In-process tier in front of Redis for hot embeddings
+        self.local_embeddings = LocalLRUCache(
+            max_items=settings.LOCAL_EMBEDDING_CACHE_MAX_ITEMS,
+            max_bytes=settings.LOCAL_EMBEDDING_CACHE_MAX_BYTES
+        )
+        self.redis_embedding_hits = 0
+        # Counter fallback while Redis is unavailable
+        self._local_counters: Dict[str, int] = {}
+        # With connect=False caching stays disabled until connect() succeeds,
+        # which lets callers verify Redis off the startup path.
+        if connect:
+            self.connect()
+
+    def connect(self) -> bool:
+        """Connect to Redis and verify it with a ping. Returns False and disables caching on failure."""
         try:
-            self.client = redis.from_url(self.redis_url, decode_responses=True)
-            self.client.ping()
+            client = redis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                max_connections=self.max_connections
+            )
+            client.ping()
+            self.client = client
+            self.binary_client = redis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                max_connections=self.max_connections
+            )
             logger.info(f"Connected to Redis at {self.redis_url}")
+            return True
         except Exception as e:
             logger.warning(f"Failed to connect to Redis at {self.redis_url}: {e}. Caching will be disabled.")
             self.client = None
+            self.binary_client = None
+            return False
+
+    def close(self):
+        """Release the pooled Redis connections."""
+        for client in (self.client, self.binary_client):
+            if client:
+                client.close()
+        self.client = None
+        self.binary_client = None
 
     def _generate_key(self, content: str, prefix: str = "emb") -> str:
         """Generate a unique key based on content hash."""
         hash_val = hashlib.sha256(content.encode()).hexdigest()
         return f"{prefix}:{hash_val}"
 
-    def get_embedding(self, text: str) -> Optional[List[float]]:
-        """Retrieve embedding from cache if it exists."""
-        if not self.client:
+    def get_embedding(self, text: str, prefix: str = "emb", local: bool = True) -> Optional[np.ndarray]:
+        """
+        Retrieve embedding from cache if it exists, decoded into a read-only float32 array.
+        The in-process tier is checked first and Redis hits are promoted into it,
+        unless `local` is False (for callers that keep their own local tier).
+        """
+        key = self._generate_key(text, prefix)
+        if local:
+            embedding = self.local_embeddings.get(key)
+            if embedding is not None:
+                return embedding
+
+        if not self.binary_client:
             return None
         
-        key = self._generate_key(text)
         try:
-            cached = self.client.get(key)
+            cached = self.binary_client.get(key)
             if cached:
                 logger.debug(f"Cache hit for embedding: {key}")
-                return json.loads(cached)
+                embedding = decode_embedding(cached)
+                embedding.flags.writeable = False
+                self.redis_embedding_hits += 1
+                if local:
+                    self.local_embeddings.set(key, embedding)
+                return embedding
         except Exception as e:
             logger.error(f"Error reading from Redis: {e}")
         
         return None
 
-    def set_embedding(self, text: str, embedding: List[float], ttl: int = 3600 * 24):
-        """Store embedding in cache with an optional TTL (default 24h)."""
-        if not self.client:
+    def set_embedding(
+        self,
+        text: str,
+        embedding: Union[List[float], np.ndarray],
+        ttl: int = 3600 * 24,
+        prefix: str = "emb",
+        local: bool = True
+    ):
+        """Store embedding in cache with an optional TTL (default 24h), packed per `embedding_encoding`."""
+        key = self._generate_key(text, prefix)
+        data = encode_embedding(embedding, self.embedding_encoding)
+        if local:
+            # Keep the round-tripped vector locally so both tiers return identical values
+            vector = decode_embedding(data)
+            vector.flags.writeable = False
+            self.local_embeddings.set(key, vector)
+
+        if not self.binary_client:
             return
         
-        key = self._generate_key(text)
         try:
-            self.client.set(key, json.dumps(embedding), ex=ttl)
+            self.binary_client.set(key, data, ex=ttl)
             logger.debug(f"Cached embedding: {key}")
         except Exception as e:
             logger.error(f"Error writing to Redis: {e}")
 
+    def get_metrics(self) -> dict:
+        """Hit, miss and eviction counters of the embedding cache tiers."""
+        return {
+            "local_embeddings": self.local_embeddings.stats(),
+            "redis_embedding_hits": self.redis_embedding_hits
+        }
+
     def get(self, key: str) -> Optional[Any]:
         """Generic get."""
         if not self.client:
@@ -68,3 +208,78 @@ class CacheAdapter:
         except Exception as e:
             logger.error(f"Error writing to Redis: {e}")
 
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Raw binary get."""
+        if not self.binary_client:
+            return None
+        try:
+            return self.binary_client.get(key)
+        except Exception as e:
+            logger.error(f"Error reading from Redis: {e}")
+            return None
+
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[int] = None):
+        """Raw binary set."""
+        if not self.binary_client:
+            return
+        try:
+            self.binary_client.set(key, value, ex=ttl)
+        except Exception as e:
+            logger.error(f"Error writing to Redis: {e}")
+
+    def incr(self, key: str) -> int:
+        """
+        Atomically increment an integer counter. Without Redis the counter is
+        kept in-process, so invalidation still works within this worker.
+        """
+        if self.client:
+            try:
+                return self.client.incr(key)
+            except Exception as e:
+                logger.error(f"Error incrementing Redis counter: {e}")
+        self._local_counters[key] = self._local_counters.get(key, 0) + 1
+        return self._local_counters[key]
+
+    def get_counter(self, key: str) -> int:
+        """Read a counter maintained by incr (0 if it was never incremented)."""
+        if self.client:
+            try:
+                value = self.client.get(key)
+                return int(value) if value else 0
+            except Exception as e:
+                logger.error(f"Error reading Redis counter: {e}")
+        return self._local_counters.get(key, 0)
+
+    def acquire_lock(self, key: str, ttl: int) -> Optional[str]:
+        """
+        Take a cross-worker lock for `ttl` seconds. Returns a token to release
+        it with, or None if another worker holds it. Without Redis no lock can
+        be taken (other workers are invisible), so None is returned as well.
+        """
+        token = uuid.uuid4().hex
+        if not self.client:
+            return None
+        try:
+            return token if self.client.set(key, token, nx=True, ex=ttl) else None
+        except Exception as e:
+            logger.error(f"Error acquiring Redis lock {key}: {e}")
+            return None
+
+    def extend_lock(self, key: str, token: str, ttl: int) -> bool:
+        """Reset a held lock's expiry to `ttl` seconds. False if it was lost to expiry."""
+        if not self.client:
+            return False
+        try:
+            return bool(self.client.eval(_EXTEND_LOCK_SCRIPT, 1, key, token, ttl))
+        except Exception as e:
+            logger.error(f"Error extending Redis lock {key}: {e}")
+            return False
+
+    def release_lock(self, key: str, token: str):
+        """Release a lock taken with acquire_lock, unless it has since expired and been re-taken."""
+        if not self.client:
+            return
+        try:
+            self.client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token)
+        except Exception as e:
+            logger.error(f"Error releasing Redis lock {key}: {e}")
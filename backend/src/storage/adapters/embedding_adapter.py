@@ -2,6 +2,7 @@ from typing import List, Optional
 from src.config.environment import settings
 from loguru import logger
 from openai import OpenAI
+from src.storage.adapters.embedding_coalescer import EmbeddingCoalescer
 
 class EmbeddingAdapter:
     def __init__(self, model_name: str = None, use_openai: Optional[bool] = None):
@@ -13,6 +14,8 @@ class EmbeddingAdapter:
 
         logger.info(f"Initializing EmbeddingAdapter with OpenAI model: {self.model_name}")
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Concurrent aembed_text calls are micro-batched into embed_batch requests
+        self.coalescer = EmbeddingCoalescer(self.embed_batch)
 
     def embed_text(self, text: str) -> List[float]:
         """Generate an embedding for a single string."""
@@ -24,6 +27,10 @@ class EmbeddingAdapter:
         )
         return response.data[0].embedding
 
+    async def aembed_text(self, text: str) -> List[float]:
+        """Generate an embedding for a single string, batched with concurrent callers."""
+        return await self.coalescer.embed(text)
+
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a batch of strings."""
         logger.debug(f"Embedding batch of {len(texts)} texts")
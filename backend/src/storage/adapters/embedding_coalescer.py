@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from loguru import logger
+from src.config.environment import settings
+from src.performance.profiler import RecallProfiler
+
+class EmbeddingCoalescer:
+    """
+    Micro-batches concurrent single-text embedding requests.
+
+    Requests arriving within `window_ms` of the first pending one (or until
+    `max_batch` texts are queued) are deduplicated and sent as one `batch_func`
+    call; the resulting vectors are fanned back out to each waiter. The batch
+    call runs in a worker thread so the provider round trip never blocks the
+    event loop, and several batches may be in flight at once. When a batch
+    call fails, its texts are retried one by one so a single bad input only
+    fails its own requests.
+    """
+
+    def __init__(
+        self,
+        batch_func: Callable[[List[str]], List[List[float]]],
+        window_ms: Optional[float] = None,
+        max_batch: Optional[int] = None
+    ):
+        self.batch_func = batch_func
+        self.window = (window_ms if window_ms is not None else settings.EMBEDDING_BATCH_WINDOW_MS) / 1000
+        self.max_batch = max(1, max_batch or settings.EMBEDDING_MAX_BATCH)
+
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+
+        # Metrics
+        self.profiler = RecallProfiler()
+        self.batch_size_histogram: Dict[int, int] = {}
+        self.requests = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    async def embed(self, text: str) -> List[float]:
+        """Queue a text for the next batch and wait for its vector."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Hand the pending requests to a batch call."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        dispatched_at = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.profiler.record_operation("embedding_queue_wait", dispatched_at - enqueued_at)
+
+        # Identical texts in one window share a single input slot
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        self._record_batch_size(len(texts))
+
+        errors: Dict[str, Exception] = {}
+        try:
+            by_text = dict(zip(texts, await self._call(texts)))
+        except Exception as e:
+            self.failed_batches += 1
+            logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+            by_text = {}
+            if len(texts) == 1:
+                errors[texts[0]] = e
+            else:
+                # One bad text must not fail every request coalesced with it
+                results = await asyncio.gather(*(self._call([text]) for text in texts), return_exceptions=True)
+                for text, result in zip(texts, results):
+                    if isinstance(result, Exception):
+                        errors[text] = result
+                    else:
+                        by_text[text] = result[0]
+                logger.info(f"Retried {len(texts)} texts individually, {len(errors)} failed")
+        finally:
+            self.profiler.record_operation("embedding_batch_call", time.perf_counter() - dispatched_at, {"size": len(texts)})
+
+        for text, future, _ in batch:
+            # The waiter may have been cancelled (e.g. a recall deadline)
+            if future.done():
+                continue
+            if text in by_text:
+                future.set_result(by_text[text])
+            else:
+                future.set_exception(errors[text])
+        logger.debug(f"Embedded {len(batch)} requests in one batch of {len(texts)} texts")
+
+    async def _call(self, texts: List[str]) -> List[List[float]]:
+        """One provider call in a worker thread, checked to return a vector per text."""
+        vectors = await asyncio.to_thread(self.batch_func, texts)
+        if len(vectors) != len(texts):
+            raise ValueError(f"Embedding provider returned {len(vectors)} vectors for {len(texts)} texts")
+        return vectors
+
+    def _record_batch_size(self, size: int):
+        self.batches += 1
+        # Power-of-two buckets: 1, 2, 4, 8, ...
+        bucket = 1 << (size - 1).bit_length()
+        self.batch_size_histogram[bucket] = self.batch_size_histogram.get(bucket, 0) + 1
+
+    def get_metrics(self) -> dict:
+        """Batch size distribution, queue wait and provider call latency."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "avg_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+            "batch_size_histogram": {f"<={k}": v for k, v in sorted(self.batch_size_histogram.items())},
+            "queue_wait": self.profiler.get_stats("embedding_queue_wait"),
+            "batch_call": self.profiler.get_stats("embedding_batch_call")
+        }
@@ -1,8 +1,85 @@
-from typing import Any, Dict, List, Optional, Union
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union
 from neo4j import GraphDatabase, Driver, Session
 from loguru import logger
 import time
 
+def sanitize_props(obj):
+    """Recursively convert Enums in properties to their values."""
+    if isinstance(obj, dict):
+        return {k: sanitize_props(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [sanitize_props(i) for i in obj]
+    elif hasattr(obj, "value"):
+        return obj.value
+    return obj
+
+def build_create_nodes_query(label: str) -> str:
+    """UNWIND query creating one `label` node per row of $rows."""
+    return (
+        f"UNWIND $rows AS row "
+        f"CREATE (n:{label}) SET n = row "
+        f"RETURN count(n) AS created"
+    )
+
+def build_merge_nodes_query(label: str, merge_key: str = "id", on_match: Optional[str] = None) -> str:
+    """
+    UNWIND query merging one `label` node per row of $rows on `merge_key`.
+    New nodes get all row properties; `on_match` is an optional SET expression
+    for existing nodes, where `n` is the node and `row` the incoming properties.
+    """
+    query = (
+        f"UNWIND $rows AS row "
+        f"MERGE (n:{label} {{{merge_key}: row.{merge_key}}}) "
+        f"ON CREATE SET n = row "
+    )
+    if on_match:
+        query += f"ON MATCH SET {on_match} "
+    return query + "RETURN n"
+
+def build_create_edges_query(edge_type: str, source_label: Optional[str] = None,
+                             target_label: Optional[str] = None, id_property: str = "id",
+                             on_create: Optional[str] = None) -> str:
+    """
+    UNWIND query creating one `edge_type` relationship per row of $rows.
+    `on_create` is an optional SET expression applied after the row properties,
+    where `r` is the relationship and `a`/`b` its endpoints.
+    """
+    s_label = f":{source_label}" if source_label else ""
+    t_label = f":{target_label}" if target_label else ""
+    query = (
+        f"UNWIND $rows AS row "
+        f"MATCH (a{s_label} {{{id_property}: row.source_id}}), "
+        f"(b{t_label} {{{id_property}: row.target_id}}) "
+        f"CREATE (a)-[r:{edge_type}]->(b) SET r = row.props "
+    )
+    if on_create:
+        query += f"SET {on_create} "
+    return query + "RETURN count(r) AS created"
+
+def group_edge_rows(edges: List[Dict[str, Any]]) -> Dict[Tuple[str, Optional[str], Optional[str], str, Optional[str]], List[Dict[str, Any]]]:
+    """
+    Group edge specs (the keyword arguments of `create_edge`, plus an optional
+    `on_create` expression) by edge type, endpoint labels, id property and
+    `on_create`, turning each into an UNWIND row. Keys are the arguments of
+    `build_create_edges_query`.
+    """
+    groups = defaultdict(list)
+    for edge in edges:
+        edge_type = edge["edge_type"]
+        if hasattr(edge_type, "value"):
+            edge_type = edge_type.value
+        key = (
+            edge_type, edge.get("source_label"), edge.get("target_label"),
+            edge.get("id_property", "id"), edge.get("on_create")
+        )
+        groups[key].append({
+            "source_id": edge["source_id"],
+            "target_id": edge["target_id"],
+            "props": sanitize_props(edge.get("properties") or {})
+        })
+    return groups
+
 class GraphDBAdapter:
     """
     Adapter for interacting with Graph Databases (Memgraph/Neo4j) using the Neo4j driver.
@@ -13,6 +90,8 @@ class GraphDBAdapter:
         self.user = user
         self.password = password
         self.driver: Optional[Driver] = None
+        # Every run_query call is an autocommit transaction; counted for benchmarking
+        self.commit_count = 0
 
     def connect(self):
         """Establish a connection to the graph database with retry logic."""
@@ -67,6 +146,7 @@ class GraphDBAdapter:
             with self.driver.session() as session:
                 result = session.run(query, parameters or {})
                 data = [record.data() for record in result]
+                self.commit_count += 1
                 
                 duration = time.time() - start_time
                 logger.debug(f"Query executed in {duration:.4f}s: {query}")
@@ -104,16 +184,6 @@ class GraphDBAdapter:
         if hasattr(edge_type, "value"):
             edge_type = edge_type.value
 
-        # Recursively convert Enums in properties to their values
-        def sanitize_props(obj):
-            if isinstance(obj, dict):
-                return {k: sanitize_props(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [sanitize_props(i) for i in obj]
-            elif hasattr(obj, "value"):
-                return obj.value
-            return obj
-
         sanitized_props = sanitize_props(properties or {})
         
         query = (
@@ -129,11 +199,57 @@ class GraphDBAdapter:
         })
         return result[0]["r"] if result else {}
 
+    def create_nodes_bulk(self, nodes: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Create many nodes given as (label, properties) pairs.
+        Rows are grouped by label and each group is sent as a single UNWIND query.
+        Returns the number of nodes created.
+        """
+        groups = defaultdict(list)
+        for label, properties in nodes:
+            groups[label].append(sanitize_props(properties))
+
+        created = 0
+        for label, rows in groups.items():
+            result = self.run_query(build_create_nodes_query(label), {"rows": rows})
+            created += result[0]["created"] if result else 0
+        return created
+
+    def merge_nodes_bulk(self, label: str, rows: List[Dict[str, Any]],
+                         merge_key: str = "id", on_match: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Create-or-update many `label` nodes keyed by `merge_key` in a single UNWIND query.
+        `on_match` is an optional SET expression applied to nodes that already exist
+        (`n` is the node, `row` the incoming properties).
+        Returns the merged nodes in row order.
+        """
+        if not rows:
+            return []
+        query = build_merge_nodes_query(label, merge_key, on_match)
+        result = self.run_query(query, {"rows": [sanitize_props(row) for row in rows]})
+        return [record["n"] for record in result]
+
+    def create_edges_bulk(self, edges: List[Dict[str, Any]]) -> int:
+        """
+        Create many edges, each given as the keyword arguments of `create_edge`
+        (source_id, target_id, edge_type, properties, source_label, target_label, id_property).
+        Rows are grouped by edge type and endpoint labels and each group is sent
+        as a single UNWIND query. Returns the number of edges created.
+        """
+        created = 0
+        for key, rows in group_edge_rows(edges).items():
+            query = build_create_edges_query(*key)
+            result = self.run_query(query, {"rows": rows})
+            created += result[0]["created"] if result else 0
+        return created
+
     def execute_transaction(self, tx_func, *args, **kwargs):
         """Execute a function within a write transaction."""
         if not self.driver:
             self.connect()
             
         with self.driver.session() as session:
-            return session.execute_write(tx_func, *args, **kwargs)
+            result = session.execute_write(tx_func, *args, **kwargs)
+            self.commit_count += 1
+            return result
 
@@ -0,0 +1,162 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from loguru import logger
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.adapters.graph_db_adapter import (
+    sanitize_props,
+    build_create_nodes_query,
+    build_merge_nodes_query,
+    build_create_edges_query,
+    group_edge_rows,
+)
+
+class MergedNodes:
+    """
+    Handle for the nodes of one `merge_nodes` call. Filled with their stored
+    state, in row order, once the unit commits; callbacks registered with
+    `on_commit` then run with those nodes.
+    """
+
+    def __init__(self):
+        self.nodes: Optional[List[Dict[str, Any]]] = None
+        self._callbacks: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+    @property
+    def committed(self) -> bool:
+        return self.nodes is not None
+
+    def on_commit(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        self._callbacks.append(callback)
+
+    def _resolve(self, nodes: List[Dict[str, Any]]):
+        self.nodes = nodes
+        for callback in self._callbacks:
+            callback(nodes)
+
+class GraphUnitOfWork:
+    """
+    Collects the node and edge mutations of one ingest and flushes them
+    in a single explicit write transaction.
+
+    Mutations are grouped into UNWIND statements (one per label, merge
+    signature and edge type) and applied in dependency order: created nodes,
+    merged nodes, then edges, so edges can match nodes staged in the same unit.
+    Merges return a MergedNodes handle that receives the post-merge node
+    state on commit.
+    """
+
+    def __init__(self, adapter: AsyncGraphDBAdapter):
+        self.adapter = adapter
+        self._nodes: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._merges: Dict[Tuple[str, str, Optional[str]], List[Dict[str, Any]]] = defaultdict(list)
+        # Per merge statement: (handle, first row, row count) of each merge_nodes call
+        self._merge_handles: Dict[Tuple[str, str, Optional[str]], List[Tuple[MergedNodes, int, int]]] = defaultdict(list)
+        self._edges: List[Dict[str, Any]] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of staged node and edge mutations."""
+        return (
+            sum(len(rows) for rows in self._nodes.values())
+            + sum(len(rows) for rows in self._merges.values())
+            + len(self._edges)
+        )
+
+    def create_node(self, label: str, properties: Dict[str, Any]):
+        """Stage the creation of a node."""
+        self._nodes[label].append(sanitize_props(properties))
+
+    def merge_nodes(self, label: str, rows: List[Dict[str, Any]],
+                    merge_key: str = "id", on_match: Optional[str] = None) -> MergedNodes:
+        """
+        Stage a create-or-update of `label` nodes keyed by `merge_key` (see
+        AsyncGraphDBAdapter.merge_nodes_bulk). The returned handle holds the
+        merged nodes once the unit is flushed.
+        """
+        handle = MergedNodes()
+        if not rows:
+            handle._resolve([])
+            return handle
+        key = (label, merge_key, on_match)
+        self._merge_handles[key].append((handle, len(self._merges[key]), len(rows)))
+        self._merges[key].extend(sanitize_props(row) for row in rows)
+        return handle
+
+    def create_edge(self, source_id: str, target_id: str, edge_type: str,
+                    properties: Optional[Dict[str, Any]] = None,
+                    source_label: Optional[str] = None,
+                    target_label: Optional[str] = None,
+                    id_property: str = "id",
+                    on_create: Optional[str] = None):
+        """
+        Stage the creation of a directed edge (same arguments as
+        AsyncGraphDBAdapter.create_edge). `on_create` is an optional SET
+        expression over the relationship `r` and its endpoints `a` and `b`,
+        e.g. to copy a property of a node merged in this unit.
+        """
+        self._edges.append({
+            "source_id": source_id,
+            "target_id": target_id,
+            "edge_type": edge_type,
+            "properties": properties,
+            "source_label": source_label,
+            "target_label": target_label,
+            "id_property": id_property,
+            "on_create": on_create
+        })
+
+    def edge_endpoints(self) -> Set[str]:
+        """Ids of the nodes gaining a staged edge (for invalidating adjacency caches)."""
+        return {node_id for edge in self._edges for node_id in (edge["source_id"], edge["target_id"])}
+
+    def _build_statements(self) -> List[Tuple[str, Dict[str, Any], Optional[Tuple[str, str, Optional[str]]]]]:
+        """(query, params, merge key or None) in execution order."""
+        statements = []
+        for label, rows in self._nodes.items():
+            statements.append((build_create_nodes_query(label), {"rows": rows}, None))
+        for key, rows in self._merges.items():
+            statements.append((build_merge_nodes_query(*key), {"rows": rows}, key))
+        for key, rows in group_edge_rows(self._edges).items():
+            statements.append((build_create_edges_query(*key), {"rows": rows}, None))
+        return statements
+
+    @staticmethod
+    async def _apply(tx, statements) -> Dict[Tuple[str, str, Optional[str]], List[Dict[str, Any]]]:
+        """Run the statements, returning the merged nodes of each merge statement."""
+        merged = {}
+        for query, params, merge_key in statements:
+            result = await tx.run(query, params)
+            if merge_key is None:
+                await result.consume()
+            else:
+                merged[merge_key] = [record["n"] for record in await result.data()]
+        return merged
+
+    async def flush(self) -> int:
+        """
+        Write every staged mutation in one transaction and clear the unit.
+        If the transaction fails nothing is written and the mutations stay staged.
+        Returns the number of statements executed.
+        """
+        if not self.pending:
+            return 0
+
+        statements = self._build_statements()
+        merged = await self.adapter.execute_transaction(self._apply, statements)
+        logger.debug(f"Unit of work committed {self.pending} mutations in {len(statements)} statements")
+        handles = [
+            (handle, (merged or {}).get(key, [])[start:start + count])
+            for key, entries in self._merge_handles.items()
+            for handle, start, count in entries
+        ]
+        self.clear()
+        for handle, nodes in handles:
+            handle._resolve(nodes)
+        return len(statements)
+
+    def clear(self):
+        """Discard all staged mutations."""
+        self._nodes.clear()
+        self._merges.clear()
+        self._merge_handles.clear()
+        self._edges.clear()
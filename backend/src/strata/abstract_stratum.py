@@ -5,7 +5,8 @@ import hashlib
 from typing import List, Optional, Any
 from src.models.nodes import Experience, Principle
 from src.models.edges import Edge, RelationshipType
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.unit_of_work import GraphUnitOfWork
 
 class AbstractStratum:
     """
@@ -13,16 +14,26 @@ class AbstractStratum:
     Extracts high-level principles and causal relationships.
     """
 
-    def __init__(self, db_adapter: GraphDBAdapter, llm_adapter: Optional[Any] = None):
+    def __init__(self, db_adapter: AsyncGraphDBAdapter, llm_adapter: Optional[Any] = None):
         self.db = db_adapter
         self.llm = llm_adapter
 
-    async def process(self, experience: Experience, provided_principles: Optional[List[dict]] = None) -> List[Principle]:
+    async def process(
+        self,
+        experience: Experience,
+        provided_principles: Optional[List[dict]] = None,
+        uow: Optional[GraphUnitOfWork] = None
+    ) -> List[Principle]:
         """
         Processes an experience for abstract reasoning:
         1. Derives principles or patterns from the experience using LLM (or uses provided ones).
         2. Links principles to the experience.
         3. Detects causal links between this and other experiences/principles.
+        
+        Writes are staged on `uow` and committed by its owner; without one
+        the stratum commits its own writes in a single transaction. The
+        returned principles are replaced by their stored state (evidence
+        count and confidence of existing principles) when the writes commit.
         """
         logger.info(f"Processing experience {experience.id} in Abstract Stratum")
         
@@ -33,6 +44,8 @@ class AbstractStratum:
         else:
             derived_principles = await self._derive_principles(experience.content)
         
+        unit = uow or GraphUnitOfWork(self.db)
+        
         processed_principles = []
         for principle_data in derived_principles:
             content = principle_data.get("content")
@@ -40,27 +53,27 @@ class AbstractStratum:
                 continue
                 
             # Use hash of content as a stable ID for principles
-            principle_id = f"princ_{hashlib.md5(content.encode()).hexdigest()[:12]}"
-            existing_node = self.db.get_node(principle_id, label="Principle")
-            
-            if existing_node:
-                principle = Principle(**existing_node)
-                principle.evidence_count += 1
-                # Update existing principle node
-                self.db.run_query(
-                    "MATCH (p:Principle {id: $id}) SET p.evidence_count = $count",
-                    {"id": principle.id, "count": principle.evidence_count}
-                )
-            else:
-                principle = Principle(
-                    id=principle_id,
-                    content=content,
-                    confidence=principle_data.get("confidence", 0.7),
-                    evidence_count=1
-                )
-                self.db.create_node("Principle", principle.model_dump())
-            
-            # 2. Link Principle to Experience
+            principle = Principle(
+                id=f"princ_{hashlib.md5(content.encode()).hexdigest()[:12]}",
+                content=content,
+                confidence=principle_data.get("confidence", 0.7),
+                evidence_count=1
+            )
+            processed_principles.append(principle)
+        
+        # Create new principles or bump the evidence count of existing ones
+        merged = unit.merge_nodes(
+            "Principle",
+            [principle.model_dump() for principle in processed_principles],
+            merge_key="id",
+            on_match="n.evidence_count = n.evidence_count + 1"
+        )
+        merged.on_commit(
+            lambda nodes: processed_principles.__setitem__(slice(None), [Principle(**node) for node in nodes])
+        )
+        
+        # 2. Link Principles to Experience
+        for principle in processed_principles:
             edge = Edge(
                 id=f"{experience.id}_SUPPORTS_{principle.id}",
                 source_id=experience.id,
@@ -68,16 +81,20 @@ class AbstractStratum:
                 rel_type=RelationshipType.SUPPORTS,
                 weight=principle.confidence
             )
-            self.db.create_edge(
+            unit.create_edge(
                 source_id=experience.id,
                 target_id=principle.id,
                 edge_type=RelationshipType.SUPPORTS.value,
                 properties=edge.model_dump(),
                 source_label="Experience",
                 target_label="Principle",
-                id_property="id"
+                id_property="id",
+                # Weighted by the stored principle's confidence, not the incoming one
+                on_create="r.weight = coalesce(b.confidence, r.weight)"
             )
-            processed_principles.append(principle)
+        
+        if uow is None:
+            await unit.flush()
             
         # 3. Causal Detection (Placeholder for future implementation)
         await self._detect_causal_links(experience)
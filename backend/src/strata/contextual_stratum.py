@@ -2,7 +2,9 @@ from loguru import logger
 from typing import List, Optional, Any
 from src.models.nodes import Experience, Context
 from src.models.edges import Edge, RelationshipType
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.unit_of_work import GraphUnitOfWork
+from src.performance.vector_partitions import VectorIndexRouter
 
 class ContextualStratum:
     """
@@ -10,21 +12,31 @@ class ContextualStratum:
     Clusters experiences into contexts based on semantic similarity.
     """
 
-    def __init__(self, db_adapter: GraphDBAdapter, embedding_adapter: Optional[Any] = None):
+    def __init__(
+        self,
+        db_adapter: AsyncGraphDBAdapter,
+        embedding_adapter: Optional[Any] = None,
+        vector_router: Optional[VectorIndexRouter] = None
+    ):
         self.db = db_adapter
         self.embedding_adapter = embedding_adapter
+        self.vector_router = vector_router or VectorIndexRouter()
 
-    async def process(self, experience: Experience) -> Optional[Context]:
+    async def process(self, experience: Experience, uow: Optional[GraphUnitOfWork] = None) -> Optional[Context]:
         """
         Processes an experience for contextual clustering:
         1. Searches for existing similar experiences or contexts.
         2. Assigns the experience to an existing context or creates a new one.
         3. Creates a BELONGS_TO relationship.
+        
+        Writes are staged on `uow` and committed by its owner; without one
+        the stratum commits its own writes in a single transaction.
         """
         logger.info(f"Processing experience {experience.id} in Contextual Stratum")
+        unit = uow or GraphUnitOfWork(self.db)
         
         # 1. Find similar context using vector search
-        similar_context = await self._find_similar_context(experience.embedding)
+        similar_context = await self._find_similar_context(experience.embedding, agent_id=experience.agent_id)
         
         if similar_context:
             context = similar_context
@@ -36,7 +48,7 @@ class ContextualStratum:
                 name=f"Context for Experience {experience.id[:8]}",
                 importance_score=0.5
             )
-            self.db.create_node("Context", context.model_dump())
+            unit.create_node("Context", context.model_dump())
         
         # 2. Create BELONGS_TO relationship
         edge = Edge(
@@ -46,7 +58,7 @@ class ContextualStratum:
             rel_type=RelationshipType.BELONGS_TO,
             weight=1.0
         )
-        self.db.create_edge(
+        unit.create_edge(
             source_id=experience.id,
             target_id=context.id,
             edge_type=RelationshipType.BELONGS_TO.value,
@@ -56,12 +68,21 @@ class ContextualStratum:
             id_property="id"
         )
         
+        if uow is None:
+            await unit.flush()
+        
         return context
 
-    async def _find_similar_context(self, embedding: List[float], threshold: float = 0.8) -> Optional[Context]:
+    async def _find_similar_context(
+        self,
+        embedding: List[float],
+        threshold: float = 0.8,
+        agent_id: Optional[str] = None
+    ) -> Optional[Context]:
         """
         Finds an existing context that is semantically similar to the experience
-        using Memgraph's vector search capabilities.
+        using Memgraph's vector search capabilities. When the agent's partition
+        has its own vector index, only that agent's experiences are considered.
         """
         if not embedding:
             return None
@@ -70,15 +91,18 @@ class ContextualStratum:
             # Memgraph vector search query
             # We search for the most similar experience and return its context
             # Using the correct Memgraph v3.7 procedure
-            query = """
-            CALL vector_search.search('idx_Experience_embedding', 5, $embedding) YIELD node, similarity
+            index_name, partitioned = self.vector_router.index_for(agent_id)
+            agent_filter = "WHERE node.agent_id = $agent_id" if partitioned else ""
+            query = f"""
+            CALL vector_search.search('{index_name}', 5, $embedding) YIELD node, similarity
             WITH node, similarity
+            {agent_filter}
             MATCH (node)-[:BELONGS_TO]->(c:Context)
             RETURN c, similarity
             ORDER BY similarity DESC
             LIMIT 1
             """
-            results = self.db.run_query(query, {"embedding": embedding})
+            results = await self.db.run_query(query, {"embedding": embedding, "agent_id": agent_id})
             
             if results and results[0]["similarity"] >= threshold:
                 context_data = results[0]["c"]
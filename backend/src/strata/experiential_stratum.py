@@ -4,7 +4,8 @@ import re
 from typing import List, Optional, Any
 from src.models.nodes import Experience, Entity
 from src.models.edges import Edge, RelationshipType
-from src.storage.adapters.graph_db_adapter import GraphDBAdapter
+from src.storage.adapters.async_graph_db_adapter import AsyncGraphDBAdapter
+from src.storage.unit_of_work import GraphUnitOfWork
 
 class ExperientialStratum:
     """
@@ -12,16 +13,26 @@ class ExperientialStratum:
     Extracts entities from raw experiences and links them.
     """
 
-    def __init__(self, db_adapter: GraphDBAdapter, llm_adapter: Optional[Any] = None):
+    def __init__(self, db_adapter: AsyncGraphDBAdapter, llm_adapter: Optional[Any] = None):
         self.db = db_adapter
         self.llm = llm_adapter
 
-    async def process(self, experience: Experience, provided_entities: Optional[List[dict]] = None) -> List[Entity]:
+    async def process(
+        self,
+        experience: Experience,
+        provided_entities: Optional[List[dict]] = None,
+        uow: Optional[GraphUnitOfWork] = None
+    ) -> List[Entity]:
         """
         Processes a raw experience:
         1. Extracts entities from the content (or uses provided entities).
         2. Checks for existing entities in the graph.
         3. Creates/updates entities and links them to the experience.
+        
+        Writes are staged on `uow` and committed by its owner; without one
+        the stratum commits its own writes in a single transaction. The
+        returned entities are replaced by their stored state (type and
+        averaged importance of existing entities) when the writes commit.
         """
         logger.info(f"Processing experience {experience.id} in Experiential Stratum")
         
@@ -32,35 +43,35 @@ class ExperientialStratum:
         else:
             extracted_entities = await self._extract_entities(experience.content)
         
+        unit = uow or GraphUnitOfWork(self.db)
+        
+        # 2. Create new entities or update existing ones
         processed_entities = []
         for entity_data in extracted_entities:
-            # 2. Check for existing entity
             name = entity_data.get("name")
             if not name:
                 continue
-                
-            existing_node = self.db.get_node(name, label="Entity", id_property="name")
-            
-            if existing_node:
-                entity = Entity(**existing_node)
-                # Update importance: simple average for now
-                new_importance = (entity.importance_score + entity_data.get("importance", 0.5)) / 2
-                self.db.run_query(
-                    "MATCH (e:Entity {name: $name}) SET e.importance_score = $importance",
-                    {"name": name, "importance": new_importance}
-                )
-                entity.importance_score = new_importance
-            else:
-                # Create new entity
-                entity = Entity(
-                    id=name, # Using name as ID for simplicity
-                    name=name,
-                    type=entity_data.get("type", "Unknown"),
-                    importance_score=entity_data.get("importance", 0.5)
-                )
-                self.db.create_node("Entity", entity.model_dump())
-            
-            # 3. Create MENTIONS relationship
+            entity = Entity(
+                id=name, # Using name as ID for simplicity
+                name=name,
+                type=entity_data.get("type", "Unknown"),
+                importance_score=entity_data.get("importance", 0.5)
+            )
+            processed_entities.append(entity)
+        
+        # Existing entities keep their type; importance is a simple average for now
+        merged = unit.merge_nodes(
+            "Entity",
+            [entity.model_dump() for entity in processed_entities],
+            merge_key="name",
+            on_match="n.importance_score = (n.importance_score + row.importance_score) / 2"
+        )
+        merged.on_commit(
+            lambda nodes: processed_entities.__setitem__(slice(None), [Entity(**node) for node in nodes])
+        )
+        
+        # 3. Create MENTIONS relationships
+        for entity in processed_entities:
             edge = Edge(
                 id=f"{experience.id}_MENTIONS_{entity.id}",
                 source_id=experience.id,
@@ -68,7 +79,7 @@ class ExperientialStratum:
                 rel_type=RelationshipType.MENTIONS,
                 weight=1.0
             )
-            self.db.create_edge(
+            unit.create_edge(
                 source_id=experience.id, 
                 target_id=entity.id, 
                 edge_type=RelationshipType.MENTIONS.value,
@@ -77,7 +88,9 @@ class ExperientialStratum:
                 target_label="Entity",
                 id_property="id"
             )
-            processed_entities.append(entity)
+        
+        if uow is None:
+            await unit.flush()
             
         return processed_entities
 
@@ -0,0 +1,129 @@
+import asyncio
+import math
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.models.nodes import Experience, MemoryType
+from src.retrieval.bm25_index import BM25Index, _Partition
+
+class FakeAdapter:
+    """Serves experience rows in id-keyed pages; optionally blocks until released."""
+
+    def __init__(self, contents, gate=None):
+        self.rows = sorted(
+            ({"id": doc_id, "content": content, "memory_type": "episodic", "confidence": 1.0, "session_id": "s"}
+             for doc_id, content in contents.items()),
+            key=lambda row: row["id"]
+        )
+        self.gate = gate
+        self.queries = 0
+
+    async def run_query(self, query, params=None):
+        self.queries += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if "MENTIONS" in query:
+            return []
+        rows = [row for row in self.rows if row["id"] > params["after"]]
+        return rows[:params["page"]]
+
+def _experience(doc_id, content):
+    return Experience(
+        id=doc_id, agent_id="agent-1", session_id="s", memory_type=MemoryType.EPISODIC,
+        content=content, embedding=[0.1], confidence=1.0
+    )
+
+async def _built(index, agent_id="agent-1"):
+    """Search once to schedule the build, then wait for it."""
+    first = await index.search("anything", agent_id)
+    for task in list(index._builds.values()):
+        await task
+    return first
+
+def test_partition_search_matches_bm25_formula():
+    partition = _Partition()
+    partition.add("a", "graph graph memory", {"id": "a"})
+    partition.add("b", "graph recall", {"id": "b"})
+    partition.add("c", "vector search engine", {"id": "c"})
+    k1, b = 1.2, 0.75
+
+    hits = partition.search(["graph"], top_k=5, k1=k1, b=b)
+
+    avg_length = 8 / 3
+    idf = math.log(1 + (3 - 2 + 0.5) / (2 + 0.5))
+    expected_a = idf * 2 * (k1 + 1) / (2 + k1 * (1 - b + b * 3 / avg_length))
+    expected_b = idf * 1 * (k1 + 1) / (1 + k1 * (1 - b + b * 2 / avg_length))
+    assert [index for index, _ in hits] == [0, 1]
+    assert math.isclose(hits[0][1], expected_a) and math.isclose(hits[1][1], expected_b)
+    assert partition.search(["missing"], top_k=5, k1=k1, b=b) == []
+    assert len(partition.search(["graph"], top_k=1, k1=k1, b=b)) == 1
+
+def test_search_returns_none_until_the_build_finishes():
+    async def run():
+        adapter = FakeAdapter({"e1": "python memory graph", "e2": "tea preferences"})
+        index = BM25Index(adapter, ttl=600, max_agents=5, max_documents=100, page_size=1)
+        first = await _built(index)
+        results = await index.search("python graph", "agent-1")
+        return first, results, index
+
+    first, results, index = asyncio.run(run())
+
+    assert first is None
+    assert [result.id for result in results] == ["e1"]
+    assert index.stats()["builds"] == 1
+    assert index.fallbacks == 1
+
+def test_scores_are_bounded_and_independent_of_other_hits():
+    async def run():
+        adapter = FakeAdapter({"e1": "python python python", "e2": "python", "e3": "tea"})
+        index = BM25Index(adapter, ttl=600, max_agents=5, max_documents=100, page_size=10, score_saturation=2.0)
+        await _built(index)
+        return await index.search("python", "agent-1"), await index.search("python tea", "agent-1")
+
+    python_only, python_or_tea = asyncio.run(run())
+
+    assert all(0.0 < result.score < 1.0 for result in python_only)
+    assert python_only[0].score > python_only[1].score
+    # A document's score does not change with the best hit of the query
+    e2_alone = next(result.score for result in python_only if result.id == "e2")
+    e2_mixed = next(result.score for result in python_or_tea if result.id == "e2")
+    assert math.isclose(e2_alone, e2_mixed)
+
+def test_writes_during_a_build_are_applied_to_its_result():
+    async def run():
+        gate = asyncio.Event()
+        adapter = FakeAdapter({"e1": "python memory"}, gate=gate)
+        index = BM25Index(adapter, ttl=600, max_agents=5, max_documents=100, page_size=10)
+        assert await index.search("python", "agent-1") is None
+        await asyncio.sleep(0)
+        # Committed after the build read its page, so only _pending carries it
+        index.add_experience(_experience("e2", "python tea"))
+        gate.set()
+        for task in list(index._builds.values()):
+            await task
+        return await index.search("tea", "agent-1"), index
+
+    results, index = asyncio.run(run())
+
+    assert [result.id for result in results] == ["e2"]
+    assert index._pending == {}
+
+def test_agents_over_max_documents_stay_on_full_text_search():
+    async def run():
+        adapter = FakeAdapter({f"e{i}": "python" for i in range(5)})
+        index = BM25Index(adapter, ttl=600, max_agents=5, max_documents=3, page_size=2)
+        await _built(index)
+        queries = adapter.queries
+        again = await index.search("python", "agent-1")
+        return again, index, adapter.queries - queries
+
+    again, index, new_queries = asyncio.run(run())
+
+    assert again is None
+    assert index.stats()["oversized_agents"] == 1
+    assert index.stats()["agents"] == 0
+    # Not rebuilt until the ttl passes
+    assert new_queries == 0 and not index._builds
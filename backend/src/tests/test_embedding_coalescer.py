@@ -0,0 +1,68 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.storage.adapters.embedding_coalescer import EmbeddingCoalescer
+
+class FakeProvider:
+    """Records every batch call; fails any call containing a text in `bad`."""
+
+    def __init__(self, bad=()):
+        self.bad = set(bad)
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.bad & set(texts):
+            raise RuntimeError("provider rejected input")
+        return [[float(len(text))] for text in texts]
+
+async def _embed_all(coalescer, texts):
+    return await asyncio.gather(*(coalescer.embed(text) for text in texts), return_exceptions=True)
+
+def test_identical_texts_share_one_input_slot():
+    provider = FakeProvider()
+    coalescer = EmbeddingCoalescer(provider, window_ms=5, max_batch=10)
+
+    results = asyncio.run(_embed_all(coalescer, ["a", "bb", "a", "a"]))
+
+    assert results == [[1.0], [2.0], [1.0], [1.0]]
+    assert provider.calls == [["a", "bb"]]
+    assert coalescer.requests == 4
+    assert coalescer.batches == 1
+
+def test_max_batch_splits_requests_into_several_calls():
+    provider = FakeProvider()
+    coalescer = EmbeddingCoalescer(provider, window_ms=1000, max_batch=2)
+
+    results = asyncio.run(_embed_all(coalescer, ["a", "bb", "ccc", "dddd", "eeeee"]))
+
+    assert results == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert sorted(len(call) for call in provider.calls) == [1, 2, 2]
+    assert coalescer.batches == 3
+
+def test_failed_batch_only_fails_the_bad_text():
+    provider = FakeProvider(bad={"bad"})
+    coalescer = EmbeddingCoalescer(provider, window_ms=5, max_batch=10)
+
+    results = asyncio.run(_embed_all(coalescer, ["a", "bad", "bb", "bad"]))
+
+    assert results[0] == [1.0]
+    assert results[2] == [2.0]
+    assert isinstance(results[1], RuntimeError)
+    assert isinstance(results[3], RuntimeError)
+    assert provider.calls[0] == ["a", "bad", "bb"]
+    assert sorted(provider.calls[1:]) == [["a"], ["bad"], ["bb"]]
+    assert coalescer.failed_batches == 1
+
+def test_single_text_failure_is_not_retried():
+    provider = FakeProvider(bad={"bad"})
+    coalescer = EmbeddingCoalescer(provider, window_ms=5, max_batch=10)
+
+    results = asyncio.run(_embed_all(coalescer, ["bad"]))
+
+    assert isinstance(results[0], RuntimeError)
+    assert provider.calls == [["bad"]]
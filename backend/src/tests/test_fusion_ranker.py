@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.models.memory_request import ReasoningType
+from src.models.memory_result import MemoryResult
+from src.ranking.fusion_ranker import FusionRanker
+
+PATHS = ["semantic", "context", "temporal", "graph", "ppr"]
+
+def _memory(memory_id, score, confidence=0.5, paths=("semantic",), created_at=None):
+    return MemoryResult(
+        id=memory_id, content=memory_id, score=score, layer="episodic", paths_found=list(paths),
+        confidence=confidence, provenance="s", created_at=created_at
+    )
+
+def _ranked(results):
+    return [(result.id, result.content, result.score) for result in results]
+
+@pytest.mark.parametrize("k", [1, 3, 5, 8, 50])
+def test_rank_top_k_matches_rank_prefix_with_ties(k):
+    ranker = FusionRanker()
+    # Many identical scores, so the k-th place is shared by several candidates
+    memories = [_memory(f"m{i}", score=[0.2, 0.5, 0.9][i % 3], confidence=0.5) for i in range(12)]
+
+    assert _ranked(ranker.rank_top_k(memories, k)) == _ranked(ranker.rank(memories)[:k])
+
+def test_rank_top_k_matches_rank_with_duplicate_ids_across_paths():
+    ranker = FusionRanker()
+    memories = [
+        _memory("a", 0.8, paths=["semantic"]),
+        _memory("b", 0.7, paths=["context", "graph"]),
+        _memory("a", 0.6, paths=["semantic", "context", "graph"]),
+        _memory("c", 0.7, paths=["temporal"]),
+        _memory("b", 0.7, paths=["ppr"]),
+    ]
+
+    for k in range(1, 7):
+        assert _ranked(ranker.rank_top_k(memories, k)) == _ranked(ranker.rank(memories)[:k])
+
+def test_rank_top_k_matches_rank_on_random_candidates():
+    ranker = FusionRanker()
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    memories = [
+        _memory(
+            f"m{rng.randrange(40)}",
+            score=round(rng.random(), 1),
+            confidence=round(rng.random(), 1),
+            paths=rng.sample(PATHS, rng.randint(0, 3)),
+            created_at=None if rng.random() < 0.3 else now - timedelta(hours=rng.randint(0, 500))
+        )
+        for _ in range(60)
+    ]
+
+    for reasoning_type in ReasoningType:
+        for k in (1, 10, 59, 60, 100):
+            expected = ranker.rank(memories, reasoning_type=reasoning_type)[:k]
+            actual = ranker.rank_top_k(memories, k, reasoning_type=reasoning_type)
+            # Recency is computed against two slightly different "now"s
+            assert [r.score for r in actual] == pytest.approx([r.score for r in expected], abs=1e-6)
+            assert len(actual) == min(k, len(memories))
+
+def test_rank_top_k_handles_empty_input_and_non_positive_k():
+    ranker = FusionRanker()
+    assert ranker.rank_top_k([], 5) == []
+    assert ranker.rank_top_k([_memory("a", 0.5)], 0) == []
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.core.graph_engine import GraphEngine
+from src.performance.adjacency_cache import AdjacencyCache
+
+# nid -> (labels, agent_id)
+NODES = {
+    0: (["Entity"], None),
+    1: (["Experience"], "agent-1"),
+    2: (["Experience"], "agent-1"),
+    3: (["Experience"], "agent-2"),
+    4: (["Entity"], None),
+    5: (["Experience"], "agent-1"),
+    6: (["Experience"], "agent-1"),
+    7: (["Entity"], None),
+    8: (["Entity"], None),
+}
+EDGES = [
+    (0, 1, 0.9), (0, 2, 0.8), (0, 3, 0.7), (0, 4, 0.6), (0, 5, 0.1),
+    (4, 6, 0.5), (1, 7, 0.9),
+    # Unweighted edges are not followed
+    (0, 8, None),
+]
+
+class FakeGraph:
+    """Answers GraphEngine's adjacency and hydration queries from NODES and EDGES."""
+
+    def __init__(self, edges=EDGES):
+        self.edges = list(edges)
+        self.adjacency_requests = []
+        self.hydrations = []
+
+    async def run_query(self, query, params=None):
+        if "neighbors" in query:
+            self.adjacency_requests.append(list(params["nids"]))
+            return [self._adjacency_row(nid, params["top_n"]) for nid in params["nids"]]
+        self.hydrations.append(params)
+        return [
+            {"nid": nid, "node": {"id": f"n{nid}", "agent_id": NODES[nid][1]}}
+            for nid in params["nids"]
+            if (params["label"] is None or params["label"] in NODES[nid][0])
+            and (params["agent_id"] is None or NODES[nid][1] == params["agent_id"])
+        ]
+
+    def _adjacency_row(self, nid, top_n):
+        hits = sorted(
+            ((weight, b if a == nid else a) for a, b, weight in self.edges if nid in (a, b) and weight is not None),
+            reverse=True
+        )[:top_n]
+        return {
+            "source_nid": nid,
+            "source_id": f"n{nid}",
+            "neighbors": [
+                {"nid": other, "labels": NODES[other][0], "agent_id": NODES[other][1], "weight": weight, "rel_type": "MENTIONS"}
+                for weight, other in hits
+            ]
+        }
+
+def _engine(graph):
+    return GraphEngine(graph, AdjacencyCache(top_n=16, max_items=100, max_bytes=10**6, ttl=60))
+
+def _traverse(engine, **kwargs):
+    kwargs.setdefault("k", 2)
+    kwargs.setdefault("fan_out_limit", 10)
+    return asyncio.run(engine.adaptive_k_hop_traversal([], start_internal_ids=[0], **kwargs))
+
+def test_adjacency_query_skips_unweighted_relationships():
+    assert "r.weight IS NOT NULL" in GraphEngine.ADJACENCY_QUERY
+
+def test_frontier_traversal_keeps_strongest_paths_above_min_weight():
+    results = _traverse(_engine(FakeGraph()))
+
+    by_id = {result["neighbor"]["id"]: result for result in results}
+    # n5 is below min_weight and n8 has no weight
+    assert set(by_id) == {"n1", "n2", "n3", "n4", "n6", "n7"}
+    assert by_id["n7"]["hops"] == 2
+    assert by_id["n7"]["path_strength"] == pytest.approx(0.9 * 0.9)
+    assert [edge["weight"] for edge in by_id["n6"]["r"]] == [pytest.approx(0.6), pytest.approx(0.5)]
+    assert [result["path_strength"] for result in results] == sorted(
+        (result["path_strength"] for result in results), reverse=True
+    )
+
+def test_fan_out_limit_caps_neighbors_per_node():
+    results = _traverse(_engine(FakeGraph()), k=1, fan_out_limit=2)
+
+    assert [result["neighbor"]["id"] for result in results] == ["n1", "n2"]
+
+def test_node_budget_keeps_the_strongest_discoveries():
+    graph = FakeGraph()
+    results = _traverse(_engine(graph), node_budget=3)
+
+    assert [result["neighbor"]["id"] for result in results] == ["n1", "n2", "n3"]
+    # The budget was spent at hop 1, so no second hop was expanded
+    assert graph.adjacency_requests == [[0]]
+
+def test_target_count_stops_the_traversal_early():
+    graph = FakeGraph()
+    _traverse(_engine(graph), k=3, target_count=2, target_properties={"agent_id": "agent-1"})
+
+    assert graph.adjacency_requests == [[0]]
+
+def test_targets_only_hydrates_matching_targets_in_the_database():
+    graph = FakeGraph()
+    results = _traverse(_engine(graph), targets_only=True, target_properties={"agent_id": "agent-1"})
+
+    assert [result["neighbor"]["id"] for result in results] == ["n1", "n2", "n6"]
+    hydration = graph.hydrations[-1]
+    assert hydration["label"] == "Experience" and hydration["agent_id"] == "agent-1"
+    assert sorted(hydration["nids"]) == [1, 2, 6]
+
+def test_cached_adjacency_is_reused_until_invalidated():
+    graph = FakeGraph()
+    engine = _engine(graph)
+    first = _traverse(engine)
+    assert graph.adjacency_requests == [[0], [1, 2, 3, 4]]
+
+    graph.adjacency_requests.clear()
+    assert _traverse(engine) == first
+    assert graph.adjacency_requests == []
+
+    # A new strong edge from n0: only its endpoints are re-read
+    graph.edges.append((0, 5, 0.95))
+    engine.adjacency_cache.invalidate(["n0", "n5"])
+    results = _traverse(engine)
+    assert graph.adjacency_requests == [[0], [5]]
+    assert results[0]["neighbor"]["id"] == "n5"
+
+def test_edgeless_node_can_be_invalidated_once_linked():
+    graph = FakeGraph(edges=[])
+    engine = _engine(graph)
+    assert _traverse(engine) == []
+
+    graph.edges.append((0, 1, 0.9))
+    engine.adjacency_cache.invalidate(["n0"])
+
+    assert [result["neighbor"]["id"] for result in _traverse(engine)] == ["n1"]
@@ -0,0 +1,42 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.models.memory_result import MemoryResult
+from src.ranking.mmr_ranker import MMRRanker
+
+def _memory(memory_id, score):
+    return MemoryResult(
+        id=memory_id, content=memory_id, score=score, layer="episodic", confidence=1.0, provenance="s"
+    )
+
+MEMORIES = [_memory("a", 0.95), _memory("a-copy", 0.94), _memory("b", 0.80), _memory("c", 0.60)]
+EMBEDDINGS = {
+    "a": [1.0, 0.0, 0.0],
+    "a-copy": [0.99, 0.01, 0.0],
+    "b": [0.0, 1.0, 0.0],
+    "c": [0.0, 0.0, 1.0],
+}
+
+def test_rerank_drops_a_near_duplicate():
+    selected = MMRRanker(lambda_mult=0.7).rerank(MEMORIES, EMBEDDINGS, k=3)
+
+    assert [memory.id for memory in selected] == ["a", "b", "c"]
+
+def test_lambda_one_reduces_to_relevance_order():
+    shuffled = [MEMORIES[2], MEMORIES[0], MEMORIES[3], MEMORIES[1]]
+
+    selected = MMRRanker().rerank(shuffled, EMBEDDINGS, k=4, lambda_mult=1.0)
+
+    assert [memory.id for memory in selected] == ["a", "a-copy", "b", "c"]
+
+def test_memories_without_embeddings_are_never_penalized():
+    embeddings = {"a": [1.0, 0.0], "b": [1.0, 0.0]}
+    memories = [_memory("a", 0.9), _memory("b", 0.85), _memory("x", 0.5)]
+
+    selected = MMRRanker(lambda_mult=0.5).rerank(memories, embeddings, k=2)
+
+    assert [memory.id for memory in selected] == ["a", "x"]
+    assert MMRRanker().rerank(memories, {}, k=2) == memories[:2]
@@ -0,0 +1,34 @@
+import os
+import sys
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.retrieval.ppr_retriever import personalized_pagerank
+
+def test_zero_weight_edge_is_not_walked():
+    """
+    A node whose only onward edge has weight 0 must act as dangling rather
+    than dividing 0/0 and turning every probability into NaN.
+    """
+    probability = personalized_pagerank(
+        3,
+        np.array([0, 1]),
+        np.array([1, 2]),
+        np.array([1.0, 0.0]),
+        seeds=[0]
+    )
+
+    assert np.all(np.isfinite(probability))
+    assert abs(probability.sum() - 1.0) < 1e-6
+    # Node 2 is only reachable over the zero-weight edge
+    assert probability[2] == 0.0
+    assert probability[1] > 0.0
+
+def test_all_zero_weights_return_restart_distribution():
+    probability = personalized_pagerank(
+        2, np.array([0]), np.array([1]), np.array([0.0]), seeds=[0]
+    )
+
+    assert probability.tolist() == [1.0, 0.0]
@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.models.memory_result import MemoryResult
+from src.performance.result_codec import encode_results, decode_results
+
+def _result(**overrides):
+    fields = dict(
+        id="m1", content="memory", score=0.5, layer="episodic", paths_found=["semantic"],
+        confidence=0.75, provenance="session-1", created_at=None
+    )
+    fields.update(overrides)
+    return MemoryResult(**fields)
+
+def _round_trip(results, fresh_until=0.0):
+    decoded = decode_results(encode_results(results, fresh_until))
+    assert decoded is not None
+    return decoded
+
+def test_round_trip_preserves_every_field():
+    results = [
+        _result(),
+        _result(id="m2", score=1.0, confidence=0.0, paths_found=["semantic", "graph", "ppr"], provenance="")
+    ]
+
+    decoded, fresh_until = _round_trip(results, fresh_until=1234.5)
+
+    assert fresh_until == 1234.5
+    assert [r.model_dump() for r in decoded] == [r.model_dump() for r in results]
+
+def test_empty_path_list_and_single_empty_path_stay_distinct():
+    results = [_result(paths_found=[]), _result(id="m2", paths_found=[""]), _result(id="m3", paths_found=["", ""])]
+
+    decoded, _ = _round_trip(results)
+
+    assert [r.paths_found for r in decoded] == [[], [""], ["", ""]]
+
+def test_non_ascii_content_round_trips():
+    results = [
+        _result(content="Café ☕ — 東京で会いましょう 🚀", provenance="sessión"),
+        _result(id="m2", content="plain")
+    ]
+
+    decoded, _ = _round_trip(results)
+
+    assert [(r.content, r.provenance) for r in decoded] == [(r.content, r.provenance) for r in results]
+
+def test_created_at_keeps_naive_utc_and_missing_apart():
+    naive = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    aware = datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+    results = [_result(created_at=naive), _result(id="m2", created_at=aware), _result(id="m3", created_at=None)]
+
+    decoded, _ = _round_trip(results)
+
+    assert decoded[0].created_at == naive and decoded[0].created_at.tzinfo is None
+    assert decoded[1].created_at == aware and decoded[1].created_at.tzinfo is not None
+    assert decoded[2].created_at is None
+
+def test_empty_result_list_round_trips():
+    decoded, fresh_until = _round_trip([], fresh_until=99.0)
+
+    assert decoded == []
+    assert fresh_until == 99.0
+
+def test_other_formats_decode_to_none():
+    legacy = json.dumps({"results": [_result().model_dump(mode="json")], "fresh_until": 0.0}).encode()
+
+    assert decode_results(legacy) is None
+    assert decode_results(b"") is None
+    assert decode_results(b"MRC1" + encode_results([_result()])[4:]) is None
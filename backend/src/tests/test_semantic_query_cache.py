@@ -0,0 +1,84 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.models.memory_result import MemoryResult
+from src.performance.semantic_query_cache import SemanticQueryCache, _AgentTable
+
+def _results(count):
+    return [
+        MemoryResult(id=f"m{i}", content=f"memory {i}", score=1.0, layer="episodic", confidence=1.0, provenance="s")
+        for i in range(count)
+    ]
+
+def _cache(**kwargs):
+    kwargs.setdefault("threshold", 0.9)
+    kwargs.setdefault("max_entries_per_agent", 64)
+    kwargs.setdefault("max_agents", 10)
+    kwargs.setdefault("ttl", 60)
+    return SemanticQueryCache(**kwargs)
+
+def test_hit_requires_cosine_similarity_above_threshold():
+    cache = _cache()
+    cache.store("agent-1", [1.0, 0.0], 5, _results(5))
+
+    # cos = 0.995 and 0.707
+    assert cache.lookup("agent-1", [10.0, 1.0], 5) is not None
+    assert cache.lookup("agent-1", [1.0, 1.0], 5) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_agents_do_not_see_each_others_entries():
+    cache = _cache()
+    cache.store("agent-1", [1.0, 0.0], 5, _results(5))
+
+    assert cache.lookup("agent-2", [1.0, 0.0], 5) is None
+
+def test_filter_and_diversify_are_part_of_the_key():
+    cache = _cache()
+    cache.store("agent-1", [1.0, 0.0], 5, _results(5), metadata_filter={"topic": "a"})
+
+    assert cache.lookup("agent-1", [1.0, 0.0], 5) is None
+    assert cache.lookup("agent-1", [1.0, 0.0], 5, metadata_filter={"topic": "b"}) is None
+    assert cache.lookup("agent-1", [1.0, 0.0], 5, metadata_filter={"topic": "a"}, diversify=True) is None
+    assert cache.lookup("agent-1", [1.0, 0.0], 5, metadata_filter={"topic": "a"}) is not None
+
+def test_larger_limit_entry_is_sliced_and_smaller_one_is_not_used():
+    cache = _cache()
+    cache.store("agent-1", [1.0, 0.0], 10, _results(10))
+
+    assert [result.id for result in cache.lookup("agent-1", [1.0, 0.0], 3)] == ["m0", "m1", "m2"]
+    assert cache.lookup("agent-1", [1.0, 0.0], 20) is None
+
+def test_newer_generation_drops_the_table():
+    cache = _cache()
+    cache.store("agent-1", [1.0, 0.0], 5, _results(5), generation=1)
+
+    assert cache.lookup("agent-1", [1.0, 0.0], 5, generation=2) is None
+    assert cache.stats()["agents"] == 0
+
+def test_older_generation_misses_without_dropping_the_newer_table():
+    cache = _cache()
+    cache.store("agent-1", [1.0, 0.0], 5, _results(5), generation=2)
+
+    assert cache.lookup("agent-1", [1.0, 0.0], 5, generation=1) is None
+    cache.store("agent-1", [0.0, 1.0], 5, _results(1), generation=1)
+
+    assert cache.stats()["entries"] == 1
+    assert cache.lookup("agent-1", [1.0, 0.0], 5, generation=2) is not None
+    assert cache.lookup("agent-1", [0.0, 1.0], 5, generation=2) is None
+
+def test_table_grows_by_doubling_up_to_capacity_then_wraps():
+    table = _AgentTable(capacity=20, dim=2, generation=0)
+    sizes = []
+    for i in range(25):
+        table.add([float(i), 1.0], {"i": i})
+        sizes.append(len(table.matrix))
+
+    assert len(sizes) == 25 and sizes[0] == _AgentTable.INITIAL_ROWS
+    assert sorted(set(sizes)) == [8, 16, 20]
+    assert table.count == 20
+    # The five oldest rows were overwritten in place
+    assert [entry["i"] for entry in table.entries[:5]] == [20, 21, 22, 23, 24]
+    assert [entry["i"] for entry in table.entries[5:]] == list(range(5, 20))
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.models.nodes import Experience, MemoryType
+from src.storage.unit_of_work import GraphUnitOfWork
+from src.strata.abstract_stratum import AbstractStratum
+from src.strata.experiential_stratum import ExperientialStratum
+from src.core.ingest_engine import IngestEngine
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    async def consume(self):
+        return None
+
+    async def data(self):
+        return self.records
+
+class FakeTx:
+    def __init__(self, adapter):
+        self.adapter = adapter
+
+    async def run(self, query, params):
+        self.adapter.statements.append((query, params))
+        if "MERGE" not in query:
+            return FakeResult([])
+        # Merges return the stored node: existing ones as the database holds them
+        return FakeResult([
+            {"n": self.adapter.stored.get(row["id"], row)} for row in params["rows"]
+        ])
+
+class FakeAdapter:
+    """Records the statements of each write transaction instead of running them."""
+
+    def __init__(self, stored=None):
+        self.stored = stored or {}
+        self.statements = []
+        self.transactions = 0
+        self.queries = []
+
+    async def execute_transaction(self, tx_func, *args, **kwargs):
+        self.transactions += 1
+        return await tx_func(FakeTx(self), *args, **kwargs)
+
+    async def run_query(self, query, params=None):
+        self.queries.append(query)
+        return []
+
+class StubLLM:
+    """Never called: entities are provided and principle derivation is replaced."""
+
+def _experience():
+    return Experience(
+        id="exp-1",
+        agent_id="agent-1",
+        session_id="session-1",
+        memory_type=MemoryType.EPISODIC,
+        content="The user builds memory systems with Python.",
+        embedding=[0.1, 0.2, 0.3],
+        confidence=1.0
+    )
+
+def test_flush_orders_creates_merges_then_edges_in_one_transaction():
+    adapter = FakeAdapter()
+    uow = GraphUnitOfWork(adapter)
+    # Staged out of order on purpose
+    uow.create_edge("exp-1", "Python", "MENTIONS", {"weight": 1.0}, "Experience", "Entity")
+    uow.merge_nodes("Entity", [{"id": "Python", "name": "Python"}], merge_key="name")
+    uow.create_node("Experience", {"id": "exp-1"})
+
+    executed = asyncio.run(uow.flush())
+
+    assert adapter.transactions == 1
+    assert executed == 3
+    kinds = [query.split(" ")[4] for query, _ in adapter.statements]
+    assert kinds == ["CREATE", "MERGE", "MATCH"]
+    assert uow.pending == 0
+
+def test_edges_are_grouped_by_type_and_labels():
+    adapter = FakeAdapter()
+    uow = GraphUnitOfWork(adapter)
+    uow.create_edge("exp-1", "Python", "MENTIONS", {}, "Experience", "Entity")
+    uow.create_edge("exp-1", "Memgraph", "MENTIONS", {}, "Experience", "Entity")
+    uow.create_edge("exp-1", "ctx-1", "BELONGS_TO", {}, "Experience", "Context")
+    uow.create_edge("exp-1", "princ-1", "MENTIONS", {}, "Experience", "Principle")
+
+    asyncio.run(uow.flush())
+
+    edge_statements = [(query, params) for query, params in adapter.statements if "CREATE (a)" in query]
+    assert len(edge_statements) == 3
+    rows_by_shape = {
+        (query.split("[r:")[1].split("]")[0], query.split("(b:")[1].split(" ")[0]): len(params["rows"])
+        for query, params in edge_statements
+    }
+    assert rows_by_shape == {("MENTIONS", "Entity"): 2, ("BELONGS_TO", "Context"): 1, ("MENTIONS", "Principle"): 1}
+
+def test_merge_handles_receive_their_own_stored_rows():
+    adapter = FakeAdapter(stored={"b": {"id": "b", "name": "b", "stored": True}})
+    uow = GraphUnitOfWork(adapter)
+    first = uow.merge_nodes("Entity", [{"id": "a", "name": "a"}])
+    second = uow.merge_nodes("Entity", [{"id": "b", "name": "b"}, {"id": "c", "name": "c"}])
+    seen = []
+    second.on_commit(seen.append)
+
+    assert not first.committed
+    asyncio.run(uow.flush())
+
+    assert len(adapter.statements) == 1
+    assert first.nodes == [{"id": "a", "name": "a"}]
+    assert [node["id"] for node in second.nodes] == ["b", "c"]
+    assert second.nodes[0]["stored"] is True
+    assert seen == [second.nodes]
+
+def test_nothing_is_written_when_a_stratum_raises_before_flush():
+    adapter = FakeAdapter()
+    engine = IngestEngine(adapter, embedding_adapter=None, llm_adapter=StubLLM())
+
+    async def failing_process(*args, **kwargs):
+        raise RuntimeError("principle derivation failed")
+
+    engine.abstract.process = failing_process
+    asyncio.run(engine.enrich(_experience(), entities=[{"name": "Python", "type": "Technology"}]))
+
+    assert adapter.transactions == 0
+    assert adapter.statements == []
+
+def test_experiential_stratum_returns_stored_entity_state():
+    stored = {"Python": {"id": "Python", "name": "Python", "type": "Technology", "importance_score": 0.75}}
+    adapter = FakeAdapter(stored=stored)
+    uow = GraphUnitOfWork(adapter)
+    stratum = ExperientialStratum(adapter)
+
+    entities = asyncio.run(stratum.process(
+        _experience(), provided_entities=[{"name": "Python", "type": "Language", "importance": 0.1}], uow=uow
+    ))
+    assert entities[0].importance_score == 0.1
+    asyncio.run(uow.flush())
+
+    assert entities[0].importance_score == 0.75
+    assert entities[0].type == "Technology"
+
+def test_abstract_stratum_returns_stored_principle_and_weights_edge_from_it():
+    content = "Graph databases suit relational recall."
+    principle_id = f"princ_{hashlib.md5(content.encode()).hexdigest()[:12]}"
+    stored = {principle_id: {"id": principle_id, "content": content, "confidence": 0.9, "evidence_count": 4}}
+    adapter = FakeAdapter(stored=stored)
+    stratum = AbstractStratum(adapter)
+
+    principles = asyncio.run(stratum.process(
+        _experience(), provided_principles=[{"content": content, "confidence": 0.2}]
+    ))
+
+    assert adapter.transactions == 1
+    assert principles[0].evidence_count == 4
+    assert principles[0].confidence == 0.9
+    edge_query = next(query for query, _ in adapter.statements if "SUPPORTS" in query)
+    assert "r.weight = coalesce(b.confidence, r.weight)" in edge_query
@@ -24,8 +24,8 @@ async def test_lite_mode_flow():
     recall_op = RecallOperation()
     
     # Initialize DB (load modules)
-    remember_op.engine.db.connect()
-    remember_op.engine.db.initialize_database()
+    await remember_op.engine.db.connect()
+    await remember_op.engine.db.initialize_database()
     
     agent_id = "test-agent-universal"
     session_id = "test-session-universal"
@@ -47,14 +47,14 @@ async def test_lite_mode_flow():
     # 3. Test Retrieval in Lite Mode
     logger.info("Step 2: Testing Retrieval in Lite Mode")
     # This should skip LLM query preprocessing
-    results = await recall_op.execute(
+    response = await recall_op.execute(
         query="What language does the user use?",
         agent_id=agent_id,
         limit=5
     )
     
-    logger.info(f"Recall successful, found {len(results)} results")
-    for res in results:
+    logger.info(f"Recall successful, found {len(response.results)} results (degraded: {response.degraded})")
+    for res in response.results:
         logger.info(f" - Result: {res.content[:50]}... (Score: {res.score:.2f})")
 
     # 4. Verify that the experience was linked to the injected entity
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import re
+import sys
+import time
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.performance.index_manager import PerformanceIndexManager
+from src.performance.vector_index_maintenance import MaintenanceLockLost, VectorIndexMaintainer
+from src.performance.vector_partitions import VectorIndexRouter
+
+class FakeGraph:
+    """In-memory stand-in for the Cypher the maintainer runs: labelled nodes, vector indexes and state nodes."""
+
+    def __init__(self, nodes=900, capacity=1000):
+        self.nodes = [{"Experience"} for _ in range(nodes)]
+        self.indexes = {"idx_Experience_embedding": ("Experience", capacity)}
+        self.state = {}
+        self.label_batches = 0
+
+    async def run_query(self, query, params=None):
+        params = params or {}
+        if query.startswith("SHOW VECTOR"):
+            return [
+                {"index_name": name, "label": label, "capacity": capacity,
+                 "size": sum(1 for node in self.nodes if label in node)}
+                for name, (label, capacity) in self.indexes.items()
+            ]
+        if query.startswith("MATCH (s:VectorIndexState)"):
+            return [{"s": dict(state)} for state in self.state.values()]
+        if query.startswith("MERGE (s:VectorIndexState"):
+            self.state.setdefault(params["partition"], {"partition": params["partition"]}).update(params["fields"])
+            return []
+        match = re.match(r"MATCH \(e:(\w+)\) WHERE e.embedding IS NOT NULL AND NOT e:(\w+) WITH e LIMIT", query)
+        if match:
+            self.label_batches += 1
+            return [{"labelled": self._relabel(match[1], match[2], params["batch"], add=True)}]
+        match = re.match(r"MATCH \(e:(\w+)\) WHERE e.embedding IS NOT NULL RETURN count", query)
+        if match:
+            return [{"total": sum(1 for node in self.nodes if match[1] in node)}]
+        match = re.match(r"CREATE VECTOR INDEX (\w+) ON :(\w+).*\"capacity\": (\d+)", query)
+        if match:
+            self.indexes[match[1]] = (match[2], int(match[3]))
+            return []
+        match = re.match(r"DROP VECTOR INDEX (\w+)", query)
+        if match:
+            del self.indexes[match[1]]
+            return []
+        match = re.match(r"MATCH \(e:(\w+)\) WITH e LIMIT \$batch REMOVE", query)
+        if match:
+            return [{"removed": self._relabel(match[1], match[1], params["batch"], add=False)}]
+        raise AssertionError(f"Unexpected query: {query}")
+
+    def _relabel(self, having, label, limit, add):
+        changed = 0
+        for node in self.nodes:
+            if changed >= limit:
+                break
+            if having in node and (label not in node if add else True):
+                node.add(label) if add else node.discard(label)
+                changed += 1
+        return changed
+
+class FakeLockCache:
+    """The Redis lock calls of CacheAdapter; `lose_after` renewals the lock is taken by another worker."""
+
+    client = True
+
+    def __init__(self, lose_after=None):
+        self.holder = None
+        self.renewals = 0
+        self.lose_after = lose_after
+
+    def acquire_lock(self, key, ttl):
+        if self.holder:
+            return None
+        self.holder = "token"
+        return self.holder
+
+    def extend_lock(self, key, token, ttl):
+        self.renewals += 1
+        if self.lose_after is not None and self.renewals > self.lose_after:
+            self.holder = "other-worker"
+        return self.holder == token
+
+    def release_lock(self, key, token):
+        if self.holder == token:
+            self.holder = None
+
+def _maintainer(graph, cache, retire_grace=3600):
+    router = VectorIndexRouter(shards=1)
+    return VectorIndexMaintainer(
+        graph, router, cache, interval=1, threshold=0.8, batch_size=200, retire_grace=retire_grace
+    ), router
+
+def test_full_index_is_rebuilt_and_switched_in_one_state_write():
+    graph, cache = FakeGraph(), FakeLockCache()
+    maintainer, router = _maintainer(graph, cache)
+
+    asyncio.run(maintainer.tick())
+
+    state = graph.state["Experience"]
+    assert state["serving"] == "idx_Experience_embedding_v1"
+    assert state["building"] is None
+    assert state["retired"] == "idx_Experience_embedding"
+    assert state["labelled"] == 900
+    assert graph.indexes["idx_Experience_embedding_v1"] == ("ExperienceV1", 2048)
+    assert router.index_for("agent-1") == ("idx_Experience_embedding_v1", False)
+    assert all("ExperienceV1" in node for node in graph.nodes)
+    assert maintainer.rebuilds == 1
+    assert cache.holder is None
+
+def test_retired_index_is_dropped_only_after_the_grace_period():
+    graph, cache = FakeGraph(), FakeLockCache()
+    maintainer, _ = _maintainer(graph, cache)
+    asyncio.run(maintainer.tick())
+
+    asyncio.run(maintainer.tick())
+    assert "idx_Experience_embedding" in graph.indexes
+
+    graph.state["Experience"]["switched_at"] = time.time() - 7200
+    asyncio.run(maintainer.tick())
+    assert sorted(graph.indexes) == ["idx_Experience_embedding_v1"]
+
+def test_interrupted_rebuild_resumes_from_persisted_progress():
+    graph, cache = FakeGraph(), FakeLockCache()
+    graph.indexes["idx_Experience_embedding_v1"] = ("ExperienceV1", 2048)
+    for node in graph.nodes[:400]:
+        node.add("ExperienceV1")
+    graph.state["Experience"] = {
+        "partition": "Experience", "serving": "idx_Experience_embedding",
+        "building": "idx_Experience_embedding_v1", "labelled": 400, "total": 900
+    }
+    maintainer, router = _maintainer(graph, cache)
+
+    asyncio.run(maintainer.tick())
+
+    assert graph.state["Experience"]["labelled"] == 900
+    assert graph.state["Experience"]["serving"] == "idx_Experience_embedding_v1"
+    # 500 remaining vectors in batches of 200, plus the empty batch that ends the loop
+    assert graph.label_batches == 4
+    assert router.index_for("agent-1")[0] == "idx_Experience_embedding_v1"
+
+def test_lost_lock_aborts_the_rebuild_before_the_switch():
+    graph, cache = FakeGraph(), FakeLockCache(lose_after=2)
+    maintainer, router = _maintainer(graph, cache)
+
+    with pytest.raises(MaintenanceLockLost):
+        asyncio.run(maintainer.tick())
+
+    state = graph.state["Experience"]
+    assert state["serving"] == "idx_Experience_embedding"
+    assert state["building"] == "idx_Experience_embedding_v1"
+    assert 0 < state["labelled"] < 900
+    assert router.index_for("agent-1")[0] == "idx_Experience_embedding"
+    # The other worker's lock is left alone
+    assert cache.holder == "other-worker"
+
+class FakeSyncAdapter:
+    def __init__(self, serving):
+        self.serving = serving
+
+    def run_query(self, query, params=None):
+        return [{"serving": self.serving[params["partition"]]}] if params["partition"] in self.serving else []
+
+def test_setup_skips_partitions_served_by_a_rebuilt_index():
+    manager = PerformanceIndexManager(FakeSyncAdapter({
+        "Experience": "idx_Experience_embedding_v2",
+        "ExperienceShard1": "idx_ExperienceShard1_embedding"
+    }))
+
+    assert manager.serves_later_version("Experience")
+    assert not manager.serves_later_version("ExperienceShard1")
+    assert not manager.serves_later_version("ExperienceShard2")